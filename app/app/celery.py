@@ -2,6 +2,7 @@ from __future__ import absolute_import
 import os
 from django.conf import settings
 from celery import Celery
+from celery.schedules import crontab
 
 settings_file = 'settings.py'
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_file)
@@ -34,9 +35,42 @@ CELERY_CONFIG = dict(
     CELERY_RESULT_SERIALIZER='json',
     CELERY_ENABLE_UTC=True,
     CELERY_TIMEZONE='Asia/Baku',
+    # without a worker (development), tasks run in the calling process
+    CELERY_ALWAYS_EAGER=not settings.PROD,
     CELERY_IMPORTS=[
-        "app.tasks",
+        "core.tasks",
+        "news.tasks",
+        "photos.tasks",
+        "public_api.tasks",
     ],
+    CELERYBEAT_SCHEDULE={
+        'flush-view-counters': {
+            'task': 'news.tasks.flush_view_counters',
+            'schedule': 60.0,
+        },
+        # publishing windows start and end on their own
+        'sync-live-posts': {
+            'task': 'news.tasks.sync_live_posts',
+            'schedule': 60.0,
+        },
+        'collect-blobs': {
+            'task': 'core.tasks.collect_blobs',
+            'schedule': crontab(hour=4, minute=30),
+        },
+        'rebuild-related-posts': {
+            'task': 'news.tasks.rebuild_related_posts',
+            'schedule': crontab(hour=4, minute=0),
+        },
+        'rank-trending-posts': {
+            'task': 'news.tasks.rank_trending_posts',
+            'schedule': crontab(minute='*/5'),
+        },
+        # view counts of the home page posts are not signalled
+        'rebuild-home-feed': {
+            'task': 'public_api.tasks.rebuild_home_feed',
+            'schedule': crontab(minute='*/5'),
+        },
+    },
 )
 # if settings.PROD:
 #     CELERY_CONFIG['BROKER_USE_SSL'] = {
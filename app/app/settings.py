@@ -30,6 +30,7 @@ PROJECT_APPS = [
     'news.apps.NewsConfig',
     'photos.apps.PhotosConfig',
     'videos.apps.VideosConfig',
+    'public_api.apps.PublicApiConfig',
     # 'search_indexes.apps.SearchIndexesConfig',
 ]
 
@@ -55,6 +56,7 @@ DJANGO_APPS = [
     'django.contrib.messages',
     'django.contrib.staticfiles',
     'django.contrib.sites',
+    'django.contrib.postgres',
 ]
 
 INSTALLED_APPS = DJANGO_APPS + PROJECT_APPS + THIRD_PARTY_APPS
@@ -150,6 +152,48 @@ DATABASES = {
     }
 }
 
+# Cache
+# https://docs.djangoproject.com/en/3.1/topics/cache/
+
+REDIS_CONNECTION = '{protocol}://{host}:{port}'.format(
+    protocol=os.environ.get('REDIS_PROTOCOL', 'redis'),
+    host=os.environ.get('REDIS_HOST', 'redis'),
+    port=os.environ.get('REDIS_PORT', '6379'),
+)
+
+if PROD:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django_redis.cache.RedisCache',
+            'LOCATION': '{redis}/2'.format(redis=REDIS_CONNECTION),
+            'OPTIONS': {
+                'CLIENT_CLASS': 'django_redis.client.DefaultClient',
+                'PASSWORD': os.environ.get('REDIS_PASSWORD'),
+            },
+        },
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        },
+    }
+
+# Buffer of the view counters without Redis (see `news.counters`):
+# 'database' is shared by the web and the Celery processes, 'local' keeps
+# the hits in the memory of the recording process (tests)
+VIEW_BUFFER = os.environ.get('VIEW_BUFFER', 'database')
+
+# Seconds an anonymous public API response is cached, changes of the data
+# invalidate it earlier (see `public_api.utils.response_cache`).
+# 0 disables the response cache.
+RESPONSE_CACHE_TIMEOUT = int(os.environ.get('RESPONSE_CACHE_TIMEOUT', 60))
+
+# Scheme and host of the public site. Responses built without a request
+# (e.g. the home page snapshot, see `public_api.utils.home`) make their
+# file URLs absolute with it.
+SITE_URL = os.environ.get('SITE_URL', 'http://localhost')
+
 ELASTICSEARCH_DSL = {
     'default': {
         'hosts': 'localhost:9200'
@@ -157,9 +201,17 @@ ELASTICSEARCH_DSL = {
 }
 
 ELASTICSEARCH_INDEX_NAMES = {
-    'app.documents.post': 'posts',
+    'news.documents': 'posts',
 }
 
+# Saved posts are indexed at once where there is a cluster, the whole
+# index is rebuilt with `manage.py reindex_posts` (see `news.indexing`).
+ELASTICSEARCH_DSL_AUTOSYNC = PROD
+
+SEARCH_INDEX_BACKEND = os.environ.get(
+    'SEARCH_INDEX_BACKEND', 'news.indexing.ElasticsearchBackend'
+)
+
 # Password validation
 # https://docs.djangoproject.com/en/2.2/ref/settings/#auth-password-validators
 
@@ -209,6 +261,8 @@ STATIC_ROOT = os.path.join(BASE_DIR, 'static')
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+# uploads are stored once per content, see `core.utils.storage`
+DEFAULT_FILE_STORAGE = 'core.utils.storage.ContentAddressedStorage'
 
 LOG_LEVEL = 'ERROR' if PROD else 'DEBUG'
 LOGGING = {
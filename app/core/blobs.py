@@ -0,0 +1,203 @@
+"""
+Reference counting of the blobs of the content-addressed storage.
+
+A blob (see `core.utils.storage`) may be the file of many rows. Saving or
+deleting a row with a file field of `FILE_FIELDS` adds and releases the
+references of the blobs it points to, in the transaction of the change,
+one upsert per saved row. Blobs stored before the storage was
+content-addressed are not counted and never collected.
+
+`collect_blobs` (run daily by Celery beat) deletes the blobs which have
+been unreferenced for `GRACE_PERIOD`, with the files derived from them.
+The storage touches the row of every blob it is asked to store
+(`touch_blob`), before it looks for the file: the grace period covers
+uploads between the storage write and the save of their row, and an
+upload of a blob being collected waits for the collector to finish, then
+stores the file again.
+"""
+import posixpath
+from collections import Counter
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import connection, transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.db.models.signals import post_delete, post_init, post_save
+from django.db.models.signals import pre_save
+from django.utils import timezone
+
+from .models import Blob
+from .utils.storage import DERIVED_ROOT, is_blob
+
+GRACE_PERIOD = timezone.timedelta(days=1)
+COLLECT_BATCH_SIZE = 500
+
+# model => file field
+FILE_FIELDS = {
+    'photos.photo': 'photo',
+    'news.screenshot': 'screenshot',
+    settings.AUTH_USER_MODEL.lower(): 'avatar',
+    'core.settings': 'logo',
+    'core.socialmedia': 'icon',
+}
+
+ADD_REFERENCES_SQL = """
+INSERT INTO {blob} (name, reference_count, updated_at)
+SELECT name, count, %(now)s
+FROM UNNEST(%(names)s::varchar[], %(counts)s::integer[]) AS added(name, count)
+ON CONFLICT (name) DO UPDATE SET
+    reference_count = {blob}.reference_count + EXCLUDED.reference_count,
+    updated_at = EXCLUDED.updated_at
+"""
+
+
+def _upsert_references(counts):
+    with connection.cursor() as cursor:
+        cursor.execute(ADD_REFERENCES_SQL.format(
+            blob=connection.ops.quote_name(Blob._meta.db_table)
+        ), {
+            'now': timezone.now(),
+            'names': list(counts),
+            'counts': list(counts.values()),
+        })
+
+
+def add_references(names):
+    """ Count a reference to each blob of `names` (repeated names add up) """
+
+    counts = Counter(name for name in names if is_blob(name))
+    if counts:
+        _upsert_references(counts)
+
+
+def touch_blob(name):
+    """
+    Keep the blob from being collected for the grace period, a new blob
+    gets a row without references.
+
+    Waits for a running `collect_blobs` locking the row: the caller
+    checks whether the file is stored after the call.
+    """
+    _upsert_references({name: 0})
+
+
+def release_references(names):
+    """ Remove a reference to each blob of `names` """
+
+    counts = Counter(name for name in names if is_blob(name))
+    by_count = {}
+    for name, count in counts.items():
+        by_count.setdefault(count, []).append(name)
+    for count, names in by_count.items():
+        Blob.objects.filter(name__in=names).update(
+            reference_count=Greatest(F('reference_count') - count, 0),
+            updated_at=timezone.now(),
+        )
+
+
+def _name(value):
+    return getattr(value, 'name', value) or ''
+
+
+def remember_file(sender, instance, **kwargs):
+    """ Name of the file the row was loaded with """
+
+    field_name = FILE_FIELDS[sender._meta.label_lower]
+    # a deferred field is read from the database when the row is saved
+    if field_name in instance.__dict__:
+        instance._stored_file = _name(instance.__dict__[field_name])
+
+
+def read_replaced_file(sender, instance, update_fields=None, **kwargs):
+    """ Name of the file the saved row references in the database """
+
+    field_name = FILE_FIELDS[sender._meta.label_lower]
+    if update_fields is not None and field_name not in update_fields:
+        return
+    if instance._state.adding:
+        instance._stored_file = ''
+    elif not hasattr(instance, '_stored_file'):
+        instance._stored_file = _name(sender._default_manager.filter(
+            pk=instance.pk
+        ).values_list(field_name, flat=True).first())
+
+
+def count_saved_file(sender, instance, update_fields=None, **kwargs):
+    """ A saved row references its new file instead of the replaced one """
+
+    field_name = FILE_FIELDS[sender._meta.label_lower]
+    if update_fields is not None and field_name not in update_fields:
+        return
+    stored = getattr(instance, '_stored_file', '')
+    current = _name(getattr(instance, field_name))
+    if current != stored:
+        add_references([current])
+        release_references([stored])
+        instance._stored_file = current
+
+
+def release_deleted_file(sender, instance, **kwargs):
+    field_name = FILE_FIELDS[sender._meta.label_lower]
+    release_references([_name(getattr(instance, field_name))])
+
+
+for label in FILE_FIELDS:
+    model = apps.get_model(label)
+    post_init.connect(
+        remember_file, sender=model,
+        dispatch_uid='remember_file_{}'.format(label),
+    )
+    pre_save.connect(
+        read_replaced_file, sender=model,
+        dispatch_uid='read_replaced_file_{}'.format(label),
+    )
+    post_save.connect(
+        count_saved_file, sender=model,
+        dispatch_uid='count_saved_file_{}'.format(label),
+    )
+    post_delete.connect(
+        release_deleted_file, sender=model,
+        dispatch_uid='release_deleted_file_{}'.format(label),
+    )
+
+
+def blob_files(storage, name):
+    """ The blob and the files derived from it (e.g. resized copies) """
+
+    directory, filename = posixpath.split(name)
+    derived = posixpath.join(directory, DERIVED_ROOT)
+    prefix = posixpath.splitext(filename)[0] + '-'
+    files = [name]
+    if storage.exists(derived):
+        files.extend(
+            posixpath.join(derived, each)
+            for each in storage.listdir(derived)[1]
+            if each.startswith(prefix)
+        )
+    return files
+
+
+def collect_blobs(now=None, storage=default_storage):
+    """
+    Delete the blobs unreferenced for the grace period
+
+    :return: names of the deleted blobs
+    """
+    cutoff = (now or timezone.now()) - GRACE_PERIOD
+    with transaction.atomic():
+        # references added and uploads of the blobs meanwhile wait for
+        # the rows to be deleted
+        names = list(Blob.objects.select_for_update(
+            skip_locked=True
+        ).filter(
+            reference_count=0, updated_at__lt=cutoff
+        ).order_by('updated_at').values_list(
+            'name', flat=True
+        )[:COLLECT_BATCH_SIZE])
+        Blob.objects.filter(name__in=names).delete()
+        for name in names:
+            for path in blob_files(storage, name):
+                storage.delete(path)
+    return names
@@ -0,0 +1,18 @@
+# Generated by Django 3.1.3 on 2026-10-18 03:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_auto_20200520_2039'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='settings',
+            name='logo_variants',
+            field=models.JSONField(blank=True, editable=False, help_text='Resized copies, see `photos.derivatives`', null=True),
+        ),
+    ]
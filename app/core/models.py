@@ -18,6 +18,12 @@ class Settings(models.Model):
         _('Website Logo'),
         upload_to=user_directory_path,
     )
+    logo_variants = models.JSONField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text=_('Resized copies, see `photos.derivatives`'),
+    )
     footer_text = models.TextField(
         _('Text on footer section'),
         blank=True,
@@ -174,3 +180,39 @@ class OneSignal(models.Model):
     class Meta:
         verbose_name = _('One Signal')
         verbose_name_plural = _('One Signal')
+
+
+class Blob(models.Model):
+    """
+    A file of the content-addressed storage and the number of file fields
+    referencing it (see `core.blobs`)
+    """
+
+    name = models.CharField(
+        _('Name'),
+        max_length=255,
+        primary_key=True,
+    )
+    reference_count = models.PositiveIntegerField(
+        _('Reference count'),
+        default=0,
+    )
+    updated_at = models.DateTimeField(
+        _('Updated at'),
+        default=timezone.now,
+    )
+
+    def __str__(self):
+        return self.name
+
+    class Meta:
+        verbose_name = _('Blob')
+        verbose_name_plural = _('Blobs')
+        indexes = [
+            # unreferenced blobs waiting for the garbage collection
+            models.Index(
+                fields=['updated_at'],
+                name='blob_unreferenced_idx',
+                condition=models.Q(reference_count=0),
+            ),
+        ]
@@ -0,0 +1,179 @@
+"""
+Invalidation of the public API response cache.
+
+Saving or deleting a row bumps the cache versions of the responses which
+show it (see `core.utils.cache` and `public_api.utils.response_cache`).
+"""
+from django.contrib.auth import get_user_model
+from django.db.models.functions import Coalesce
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+
+from core.models import Settings, SocialMedia
+from core.utils.cache import bump_cache_version
+from news.models import Category, Comment, Content, Post, PostIdentifier
+from news.models import Reaction, RelatedPosts
+from photos.models import Photo
+from stories.models import Story, StoryContent
+from videos.models import Video
+
+USER = get_user_model()
+
+# model => versions of the responses showing its rows
+CACHE_GROUPS = {
+    Post: ('posts',),
+    Content: ('posts',),
+    PostIdentifier: ('posts',),
+    Category: ('categories', 'posts'),
+    Photo: ('photos', 'posts'),
+    Video: ('videos',),
+    Story: ('stories',),
+    StoryContent: ('stories',),
+    Settings: ('settings',),
+    SocialMedia: ('settings',),
+}
+
+
+def invalidate_post(post_id):
+    """ Invalidate the detail response of a post """
+
+    if post_id is not None:
+        bump_cache_version('post:{}'.format(post_id))
+
+
+def invalidate_comment(comment):
+    """ Invalidate the detail response of the post showing the comment """
+
+    post_id = comment.post_id
+    if post_id is None and comment.replied_comment_id is not None:
+        post_id = Comment.objects.filter(
+            id=comment.replied_comment_id
+        ).values_list('post_id', flat=True).first()
+    invalidate_post(post_id)
+
+
+def invalidate_reaction_target(target):
+    """
+    Invalidate the responses showing the counters of a Post or a Comment.
+    Called by `news.reactions.set_reaction`, which writes with raw SQL
+    and sends no signals.
+    """
+    if isinstance(target, Comment):
+        invalidate_comment(target)
+    else:
+        invalidate_post(target.pk)
+
+
+def invalidate_groups(sender, **kwargs):
+    bump_cache_version(*CACHE_GROUPS[sender])
+
+
+for model in CACHE_GROUPS:
+    post_save.connect(
+        invalidate_groups, sender=model,
+        dispatch_uid='invalidate_cache_on_save_{}'.format(model._meta.label),
+    )
+    post_delete.connect(
+        invalidate_groups, sender=model,
+        dispatch_uid='invalidate_cache_on_delete_{}'.format(model._meta.label),
+    )
+
+
+@receiver(m2m_changed, sender=Post.category.through,
+          dispatch_uid='invalidate_cache_on_recategorize')
+def invalidate_posts_on_recategorize(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        bump_cache_version('posts')
+
+
+@receiver(m2m_changed, sender=USER.saved_news.through,
+          dispatch_uid='invalidate_user_on_saved_news')
+@receiver(m2m_changed, sender=USER.preferred_categories.through,
+          dispatch_uid='invalidate_user_on_preferred_categories')
+@receiver(m2m_changed, sender=USER.favorite_category.through,
+          dispatch_uid='invalidate_user_on_favorite_category')
+def invalidate_user_feed(sender, instance, action, reverse, pk_set, **kwargs):
+    """ The feed of a user depends on their saved posts and categories """
+
+    if not reverse:
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            bump_cache_version('user:{}'.format(instance.pk))
+        return
+
+    # a post or a category was added to / removed from several users
+    if action in ('post_add', 'post_remove'):
+        user_ids = pk_set
+    elif action == 'pre_clear':
+        columns = {
+            field.related_model: field.attname
+            for field in sender._meta.fields if field.is_relation
+        }
+        user_ids = sender.objects.filter(
+            **{columns[type(instance)]: instance.pk}
+        ).values_list(columns[USER], flat=True)
+    else:
+        return
+    bump_cache_version(*('user:{}'.format(pk) for pk in user_ids))
+
+
+# fields of a user shown by the posts (author) and comments (commenter)
+SHOWN_USER_FIELDS = {
+    'user_type',
+    'profession',
+    'first_name',
+    'last_name',
+    'avatar',
+    'avatar_variants',
+}
+
+
+@receiver(post_save, sender=USER, dispatch_uid='invalidate_cache_on_author')
+def invalidate_posts_on_author_change(sender, instance, created,
+                                      update_fields, **kwargs):
+    """
+    Posts show their author, post details their commenters. Saves of the
+    other users (registrations, logins, password changes, ...) keep the
+    cached posts.
+    """
+    if created:
+        return
+    if update_fields is not None and \
+            not SHOWN_USER_FIELDS & set(update_fields):
+        return
+    if instance.post_author.exists():
+        bump_cache_version('posts')
+        return
+    # replies are shown in the post of the replied comment
+    post_ids = Comment.objects.filter(commented_by=instance).annotate(
+        shown_in=Coalesce('post_id', 'replied_comment__post_id'),
+    ).values_list('shown_in', flat=True).distinct()
+    bump_cache_version(*(
+        'post:{}'.format(post_id) for post_id in post_ids if post_id
+    ))
+
+
+@receiver(post_save, sender=Comment,
+          dispatch_uid='invalidate_cache_on_comment')
+@receiver(post_delete, sender=Comment,
+          dispatch_uid='invalidate_cache_on_comment_delete')
+def invalidate_post_on_comment(sender, instance, **kwargs):
+    """ Comments are shown in the detail of their post """
+
+    invalidate_comment(instance)
+
+
+@receiver(post_save, sender=Reaction,
+          dispatch_uid='invalidate_cache_on_reaction')
+@receiver(post_delete, sender=Reaction,
+          dispatch_uid='invalidate_cache_on_reaction_delete')
+def invalidate_post_on_reaction(sender, instance, **kwargs):
+    if instance.comment_id is not None:
+        invalidate_comment(instance.comment)
+    else:
+        invalidate_post(instance.post_id)
+
+
+@receiver(post_save, sender=RelatedPosts,
+          dispatch_uid='invalidate_cache_on_related_posts')
+def invalidate_post_on_related_posts(sender, instance, **kwargs):
+    invalidate_post(instance.post_id)
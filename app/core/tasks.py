@@ -0,0 +1,10 @@
+from celery import shared_task
+
+from . import blobs
+
+
+@shared_task
+def collect_blobs():
+    """ Delete the stored files no row has referenced for a while """
+
+    blobs.collect_blobs()
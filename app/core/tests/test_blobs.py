@@ -0,0 +1,140 @@
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+from unittest import mock
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+
+from core.blobs import GRACE_PERIOD, blob_files, collect_blobs
+from core.models import Blob
+from photos.models import Photo
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+CONTENT = b'press photo'
+DIGEST = hashlib.sha256(CONTENT).hexdigest()
+NAME = 'blobs/{}/{}/{}.jpg'.format(DIGEST[:2], DIGEST[2:4], DIGEST)
+
+
+def tearDownModule():
+    shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class ContentAddressedStorageTests(TestCase):
+    """ Uploads stored once per content and reference counted """
+
+    def create_photo(self, filename='press.JPG', content=CONTENT):
+        return Photo.objects.create(
+            title='Photo', photo=SimpleUploadedFile(filename, content),
+        )
+
+    def references(self, name=NAME):
+        return Blob.objects.get(name=name).reference_count
+
+    def test_same_content_is_stored_once(self):
+        first = self.create_photo()
+        second = self.create_photo('copy.jpg')
+
+        self.assertEqual(first.photo.name, NAME)
+        self.assertEqual(second.photo.name, NAME)
+        self.assertEqual(
+            os.listdir(os.path.dirname(default_storage.path(NAME))),
+            [os.path.basename(NAME)],
+        )
+        with default_storage.open(NAME) as file:
+            self.assertEqual(file.read(), CONTENT)
+        self.assertEqual(self.references(), 2)
+
+    def test_replaced_and_deleted_files_are_released(self):
+        first = self.create_photo()
+        second = self.create_photo()
+
+        first.photo = SimpleUploadedFile('other.jpg', b'other photo')
+        first.save()
+        self.assertEqual(self.references(), 1)
+        self.assertEqual(self.references(first.photo.name), 1)
+
+        # saving other fields does not count the file again
+        Photo.objects.get(id=second.id).save()
+        self.assertEqual(self.references(), 1)
+
+        second.delete()
+        self.assertEqual(self.references(), 0)
+
+    def test_unreferenced_blobs_are_collected_after_the_grace_period(self):
+        photo = self.create_photo()
+        kept = self.create_photo('kept.jpg', b'kept photo')
+        derived = NAME.replace(DIGEST, 'variants/{}-480w'.format(DIGEST))
+        default_storage.save(derived, ContentFile(b'resized'))
+        photo.delete()
+
+        self.assertEqual(collect_blobs(), [])
+
+        later = timezone.now() + GRACE_PERIOD * 2
+        self.assertEqual(collect_blobs(now=later), [NAME])
+        self.assertFalse(default_storage.exists(NAME))
+        self.assertFalse(default_storage.exists(derived))
+        self.assertFalse(Blob.objects.filter(name=NAME).exists())
+        self.assertTrue(default_storage.exists(kept.photo.name))
+
+    def test_blob_uploaded_again_is_not_collected(self):
+        self.create_photo().delete()
+        Blob.objects.update(
+            updated_at=timezone.now() - GRACE_PERIOD * 2
+        )
+        # stored again by an upload whose row is not saved yet
+        default_storage.save('again.jpg', ContentFile(CONTENT))
+
+        self.assertEqual(collect_blobs(), [])
+        self.assertTrue(default_storage.exists(NAME))
+        self.assertEqual(self.references(), 0)
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class BlobCollectionRaceTests(TransactionTestCase):
+    """ Uploads running while the collector deletes the blob """
+
+    def test_upload_waits_for_the_collector(self):
+        Photo.objects.create(
+            title='Photo', photo=SimpleUploadedFile('press.jpg', CONTENT),
+        ).delete()
+        Blob.objects.update(updated_at=timezone.now() - GRACE_PERIOD * 2)
+        locked, deleting = threading.Event(), threading.Event()
+
+        def paused_blob_files(storage, name):
+            # the row is locked and deleted, the files are not yet
+            locked.set()
+            deleting.wait(5)
+            return blob_files(storage, name)
+
+        def run(target):
+            try:
+                target()
+            finally:
+                connection.close()
+
+        with mock.patch('core.blobs.blob_files', paused_blob_files):
+            collector = threading.Thread(target=run, args=(collect_blobs,))
+            collector.start()
+            locked.wait(5)
+            upload = threading.Thread(target=run, args=(lambda: (
+                default_storage.save('again.jpg', ContentFile(CONTENT))
+            ),))
+            upload.start()
+            # the upload blocks on the row of the blob
+            upload.join(0.5)
+            self.assertTrue(upload.is_alive())
+            deleting.set()
+            collector.join()
+            upload.join()
+
+        self.assertTrue(default_storage.exists(NAME))
+        self.assertEqual(Blob.objects.get(name=NAME).reference_count, 0)
@@ -0,0 +1,108 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from core.utils.optimizer import get_query_plan
+from news.models import Category, Content, Post, PostIdentifier
+from photos.models import Photo
+from public_api.serializers.news import (
+    PublicPostListModelSerializer,
+    PublicPostDetailModelSerializer,
+)
+
+USER = get_user_model()
+
+
+class QueryPlanTests(TestCase):
+    """ Query plans built from serializer fields """
+
+    def test_nested_fields_are_selected_and_prefetched(self):
+        plan = get_query_plan(PublicPostListModelSerializer)
+
+        self.assertEqual(plan.select, {'author', 'keyword'})
+        self.assertEqual(set(plan.prefetch), {'category', 'post_content'})
+
+        # categories are serialized as primary keys
+        _, category_plan = plan.prefetch['category']
+        self.assertEqual(category_plan.only(), ['id'])
+
+        # contents come with their photo and the column of their post,
+        # the lead blocks only
+        _, content_plan = plan.prefetch['post_content']
+        self.assertEqual(content_plan.select, {'photo'})
+        self.assertIn('post', content_plan.only())
+        self.assertIsNotNone(content_plan.restrict)
+
+        only = plan.only()
+        self.assertIn('author__first_name', only)
+        self.assertIn('keyword__title', only)
+        self.assertNotIn('seo_meta_keywords', only)
+
+    def test_method_fields_keep_all_columns(self):
+        plan = get_query_plan(PublicPostDetailModelSerializer)
+
+        self.assertEqual(plan.only(), [])
+        self.assertEqual(plan.select, {'author', 'keyword'})
+
+
+class OptimizedEndpointTests(APITestCase):
+    """
+    Post endpoints run a fixed number of queries, no matter how many posts
+    and nested objects they return
+    """
+
+    def setUp(self):
+        self.author = USER.objects.create_user(
+            email='author@user.com', is_staff=True
+        )
+        self.reader = USER.objects.create_user(email='reader@user.com')
+
+    def add_posts(self, count):
+        for i in range(count):
+            post = Post.objects.create(
+                title='Post {}'.format(i),
+                author=self.author,
+                keyword=PostIdentifier.objects.create(title='LIVE'),
+                is_approved=True,
+            )
+            post.category.add(Category.objects.create(title='Category'))
+            Content.objects.create(
+                post=post,
+                content_type='Main Text',
+                ordering=1,
+                photo=Photo.objects.create(title='Photo', photo='photo.jpg'),
+            )
+            self.reader.saved_news.add(post)
+
+    def assertConstantQueries(self, url):
+        self.add_posts(1)
+        with CaptureQueriesContext(connection) as few_posts:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+
+        self.add_posts(3)
+        with CaptureQueriesContext(connection) as many_posts:
+            self.client.get(url)
+
+        self.assertEqual(len(few_posts), len(many_posts))
+
+    def test_public_post_list(self):
+        self.assertConstantQueries(reverse('public_api:public-post-list'))
+
+    def test_author_posts(self):
+        self.assertConstantQueries(
+            reverse('public_api:author-posts', kwargs={'pk': self.author.id})
+        )
+
+    def test_author_profile(self):
+        self.assertConstantQueries(
+            reverse('public_api:author-profile-retrieve',
+                    kwargs={'pk': self.author.id})
+        )
+
+    def test_saved_posts(self):
+        self.client.force_authenticate(user=self.reader)
+        self.assertConstantQueries(reverse('public_api:saved-posts'))
@@ -0,0 +1,72 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import m2m_changed
+from django.test import TestCase
+
+from core.utils.tools import sync_m2m
+from news.models import Category, Post
+
+USER = get_user_model()
+
+
+class SyncM2MTests(TestCase):
+    """ Diff-based many-to-many updates """
+
+    def setUp(self):
+        self.user = USER.objects.create_user(email='user@user.com')
+        self.posts = [
+            Post.objects.create(title='Post {}'.format(i), author=self.user)
+            for i in range(5)
+        ]
+        self.user.saved_news.add(*self.posts[:3])
+
+    def saved_ids(self):
+        return set(self.user.saved_news.values_list('id', flat=True))
+
+    def test_only_the_difference_is_written(self):
+        # a select, a delete (its rows are collected first, the delete
+        # signals have receivers) and an insert, however many objects
+        with self.assertNumQueries(4):
+            added, removed = sync_m2m(
+                self.user, 'saved_news', self.posts[2:]
+            )
+
+        self.assertEqual(added, {self.posts[3].id, self.posts[4].id})
+        self.assertEqual(removed, {self.posts[0].id, self.posts[1].id})
+        self.assertEqual(self.saved_ids(), {p.id for p in self.posts[2:]})
+
+    def test_unchanged_relation_is_not_written(self):
+        with self.assertNumQueries(1):
+            sync_m2m(self.user, 'saved_news', [p.id for p in self.posts[:3]])
+
+    def test_signals(self):
+        actions = []
+
+        def receiver(sender, action, pk_set, **kwargs):
+            actions.append((action, pk_set))
+
+        m2m_changed.connect(receiver, sender=Post.category.through)
+        self.addCleanup(
+            m2m_changed.disconnect, receiver, sender=Post.category.through
+        )
+        first = Category.objects.create(title='First')
+        second = Category.objects.create(title='Second')
+        post = self.posts[0]
+        post.category.add(first)
+        actions.clear()
+
+        sync_m2m(post, 'category', [second])
+
+        self.assertEqual(actions, [
+            ('pre_remove', {first.id}),
+            ('post_remove', {first.id}),
+            ('pre_add', {second.id}),
+            ('post_add', {second.id}),
+        ])
+
+    def test_prefetched_objects_are_refreshed(self):
+        user = USER.objects.prefetch_related('saved_news').get(id=self.user.id)
+        self.assertEqual(len(user.saved_news.all()), 3)
+
+        sync_m2m(user, 'saved_news', [])
+
+        self.assertEqual(list(user.saved_news.all()), [])
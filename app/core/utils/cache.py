@@ -0,0 +1,67 @@
+"""
+Cache helpers shared by the apps.
+
+In production the default cache is Redis (`django-redis`), locally and in
+tests it is the local-memory cache. Code which needs raw Redis structures
+(hashes, sorted sets) asks for a connection with `get_redis_connection`
+and falls back to an in-process implementation when it returns None.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+
+def get_redis_connection():
+    """
+    Return the raw Redis client behind the default cache,
+    or None if the default cache is not Redis backed.
+    """
+    backend = settings.CACHES['default']['BACKEND']
+    if not backend.startswith('django_redis'):
+        return None
+
+    from django_redis import get_redis_connection as redis_connection
+    return redis_connection('default')
+
+
+# --------------------------- Cache versions ---------------------------------
+#
+# Cached data depending on some rows is stored under a key containing the
+# versions of the data it was built from (e.g. `posts`, `post:12`).
+# Changing the rows bumps the version, so the stale entries are never read
+# again and expire by themselves.
+
+VERSION_KEY = 'version:{name}'
+
+
+def _initial_version():
+    # a version lost with the cache entry must not repeat an old one
+    return int(time.time() * 1000)
+
+
+def get_cache_versions(names):
+    """
+    Current versions of the given names, fetched with one cache call
+
+    :param names: list of names, e.g. ['posts', 'post:12']
+    :return: list of versions in the same order
+    """
+    keys = [VERSION_KEY.format(name=name) for name in names]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, _initial_version(), timeout=None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def bump_cache_version(*names):
+    """ Invalidate everything cached with the versions of the given names """
+
+    for name in names:
+        key = VERSION_KEY.format(name=name)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, _initial_version(), timeout=None)
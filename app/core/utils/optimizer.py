@@ -0,0 +1,237 @@
+"""
+Queryset optimization derived from serializers.
+
+`optimize_queryset` walks the fields of a serializer (nested serializers,
+relation fields and their sources) and applies the matching
+`select_related`, `prefetch_related` and `only` to a queryset:
+
+    - forward foreign keys and one-to-one fields serialized by a nested
+      serializer are selected with a join,
+    - reverse foreign keys and many-to-many fields are prefetched with a
+      queryset optimized for the nested serializer,
+    - primary key related fields read the key column only,
+    - the columns of a model are restricted with `only` when every field
+      serialized from it is a model field. A `SerializerMethodField`, a
+      property or any other unknown source keeps all columns loaded,
+    - a list serializer with a `restrict_queryset(queryset)` method
+      prefetches the objects of that queryset only.
+
+Views get it with `OptimizedQuerysetMixin`, so a nested field added to a
+serializer is loaded with its parent instead of one query per object.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+_plans = {}
+
+
+class QueryPlan:
+    """
+    Relations and columns a serializer reads from its model.
+
+    `select` and `fields` are lookups relative to the planned model,
+    `prefetch` maps lookups to the (model, QueryPlan) of the prefetched
+    objects. A model path found in `incomplete` reads something that is
+    not a model field, so its columns are not restricted. `restrict`
+    filters the queryset of prefetched objects.
+    """
+
+    def __init__(self):
+        self.select = set()
+        self.prefetch = {}
+        self.fields = {}
+        self.incomplete = set()
+        self.restrict = None
+
+    def add_field(self, path, name):
+        self.fields.setdefault(path, set()).add(name)
+
+    def only(self):
+        """ Lookups for `only()`, empty when the columns can't be limited """
+
+        if '' in self.incomplete:
+            return []
+        return sorted(
+            _join(path, name)
+            for path, names in self.fields.items()
+            if not any(_is_within(path, incomplete)
+                       for incomplete in self.incomplete)
+            for name in names
+        )
+
+    def apply(self, queryset):
+        if self.select:
+            queryset = queryset.select_related(*sorted(self.select))
+        for lookup, (model, plan) in sorted(self.prefetch.items()):
+            related = model._default_manager.all()
+            if plan.restrict is not None:
+                related = plan.restrict(related)
+            queryset = queryset.prefetch_related(Prefetch(
+                lookup, queryset=plan.apply(related)
+            ))
+        only = self.only()
+        if only:
+            queryset = queryset.only(*only)
+        return queryset
+
+
+def _join(*parts):
+    return '__'.join(part for part in parts if part)
+
+
+def _is_within(path, parent):
+    return parent == '' or path == parent or path.startswith(parent + '__')
+
+
+def _get_model_field(model, name):
+    if name == 'pk':
+        return model._meta.pk
+    try:
+        return model._meta.get_field(name)
+    except FieldDoesNotExist:
+        return None
+
+
+def _nested(field):
+    """ Nested serializer of a field and whether it is a list of objects """
+
+    if isinstance(field, serializers.ListSerializer):
+        return field.child, True
+    if isinstance(field, serializers.BaseSerializer):
+        return field, False
+    if isinstance(field, serializers.ManyRelatedField):
+        return field.child_relation, True
+    return field, False
+
+
+def _related_column(field, model):
+    """
+    The only column a relation field reads from the related model,
+    None if it is unknown
+    """
+    if isinstance(field, serializers.PrimaryKeyRelatedField):
+        return model._meta.pk.name
+    if isinstance(field, serializers.SlugRelatedField):
+        return field.slug_field
+    return None
+
+
+def _walk(serializer, model, plan, path=''):
+    for field in serializer.fields.values():
+        if field.write_only:
+            continue
+
+        if field.source == '*':
+            if isinstance(field, serializers.BaseSerializer):
+                _walk(field, model, plan, path)
+            else:
+                plan.incomplete.add(path)
+            continue
+
+        _walk_source(field, model, plan, path)
+
+
+def _walk_source(field, model, plan, path):
+    current_model, current_path = model, path
+    attrs = field.source_attrs
+
+    # leading attributes of a dotted source (`author.first_name`)
+    # are followed through forward relations
+    for attr in attrs[:-1]:
+        model_field = _get_model_field(current_model, attr)
+        if (model_field is None or not model_field.is_relation or
+                model_field.many_to_many or model_field.one_to_many):
+            plan.incomplete.add(current_path)
+            return
+        plan.add_field(current_path, attr)
+        current_path = _join(current_path, attr)
+        current_model = model_field.related_model
+        plan.select.add(current_path)
+
+    model_field = _get_model_field(current_model, attrs[-1])
+    if model_field is None:
+        plan.incomplete.add(current_path)
+        return
+
+    if not model_field.is_relation:
+        plan.add_field(current_path, model_field.name)
+        return
+
+    nested, many = _nested(field)
+    related_model = model_field.related_model
+    lookup = _join(current_path, model_field.name)
+
+    if model_field.many_to_many or model_field.one_to_many:
+        child_plan = QueryPlan()
+        child_plan.restrict = getattr(field, 'restrict_queryset', None)
+        _plan_related(nested, related_model, child_plan)
+        if model_field.one_to_many:
+            # prefetched objects are matched to their parent by this column
+            child_plan.add_field('', model_field.field.name)
+        plan.prefetch[lookup] = (related_model, child_plan)
+        return
+
+    if model_field.concrete:
+        plan.add_field(current_path, model_field.name)
+        if isinstance(nested, serializers.PrimaryKeyRelatedField):
+            # the key column is read from the row itself
+            return
+    plan.select.add(lookup)
+    if not model_field.concrete:
+        # a reverse one-to-one is selected with all its columns
+        plan.incomplete.add(lookup)
+        return
+    _plan_related(nested, related_model, plan, lookup)
+
+
+def _plan_related(nested, model, plan, path=''):
+    if isinstance(nested, serializers.BaseSerializer):
+        _walk(nested, model, plan, path)
+        return
+    column = _related_column(nested, model)
+    if column is None:
+        plan.incomplete.add(path)
+    else:
+        plan.add_field(path, column)
+
+
+def get_query_plan(serializer_class):
+    """ Query plan of a serializer class, built once per class """
+
+    if serializer_class not in _plans:
+        plan = QueryPlan()
+        _walk(serializer_class(), serializer_class.Meta.model, plan)
+        _plans[serializer_class] = plan
+    return _plans[serializer_class]
+
+
+def optimize_queryset(queryset, serializer_class):
+    """
+    Select, prefetch and limit the columns of the queryset for
+    serializing its objects with the serializer class
+
+    :param queryset: queryset of the serializer's model
+    :param serializer_class: ModelSerializer class
+    :return: optimized queryset
+    """
+    if not hasattr(getattr(serializer_class, 'Meta', None), 'model'):
+        return queryset
+    return get_query_plan(serializer_class).apply(queryset)
+
+
+class OptimizedQuerysetMixin:
+    """
+    Optimize the queryset of a view for its serializer class.
+
+    Only read requests are optimized, objects loaded for updates keep
+    all their columns.
+    """
+
+    def get_queryset(self):
+        queryset = super(OptimizedQuerysetMixin, self).get_queryset()
+        request = getattr(self, 'request', None)
+        if request is None or request.method not in SAFE_METHODS:
+            return queryset
+        return optimize_queryset(queryset, self.get_serializer_class())
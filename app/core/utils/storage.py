@@ -0,0 +1,84 @@
+"""
+Content-addressed file storage.
+
+An upload is streamed through a SHA-256 hasher into a temporary file and
+stored once under its digest, in a directory layout sharded by the first
+bytes of the digest:
+
+    blobs/3a/7b/3a7bd3e2360a3d29eea436fcfb7e44c735d117c42d1c1835420b6b9942dd4f1b.jpg
+
+The same photo uploaded by several reporters is stored once, the name the
+upload was given (see `core.options.tools.user_directory_path`) only lends
+its extension. A stored blob never changes, so its URL can be cached for
+ever. Blobs are shared by several rows, deleting a row must not delete the
+file: the references are counted by `core.blobs`, which deletes the
+unreferenced blobs. Storing a blob touches its row first, so a blob being
+deleted is stored again.
+
+Names inside the blob tree which are not digests, the files derived from
+a blob (e.g. its resized copies, see `photos.derivatives`), are stored as
+given, replacing the file. They are kept next to the blob as
+`<shard>/variants/<digest>-<name>` and deleted with it.
+"""
+import hashlib
+import os
+import posixpath
+import tempfile
+
+from django.core.files.storage import FileSystemStorage
+
+BLOB_ROOT = 'blobs'
+TMP_ROOT = 'tmp'
+DERIVED_ROOT = 'variants'
+SHARDS = 2
+
+
+def is_blob(name):
+    return bool(name) and name.startswith(BLOB_ROOT + '/')
+
+
+def blob_name(digest, extension):
+    """
+    :return: `blobs/3a/7b/3a7b...4f1b.jpg`
+    """
+    shards = [digest[2 * i:2 * i + 2] for i in range(SHARDS)]
+    return posixpath.join(BLOB_ROOT, *shards, digest + extension.lower())
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """ File system storage naming the stored files after their content """
+
+    def get_available_name(self, name, max_length=None):
+        # the name depends on the content, nothing to find here
+        return name
+
+    def _save(self, name, content):
+        directory = self.path(TMP_ROOT)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory)
+        try:
+            digest = hashlib.sha256()
+            with os.fdopen(fd, 'wb') as file:
+                for chunk in content.chunks():
+                    digest.update(chunk)
+                    file.write(chunk)
+            if not is_blob(name):
+                name = blob_name(
+                    digest.hexdigest(), posixpath.splitext(name)[1]
+                )
+                # the app registry is ready when files are stored
+                from core.blobs import touch_blob
+                # waits for the collector deleting the blob, if any
+                touch_blob(name)
+                if os.path.exists(self.path(name)):
+                    return name
+            path = self.path(name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            if self.file_permissions_mode is not None:
+                os.chmod(tmp_path, self.file_permissions_mode)
+            # readers see the whole file or none of it
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        return name
@@ -13,6 +13,10 @@ NOTE: Do not import in `__init__.py` like:
 
 from decimal import Decimal
 
+from django.db import router, transaction
+from django.db.models import Model
+from django.db.models.signals import m2m_changed
+
 
 def convert_to_decimal(x, r):
     return round(Decimal(str(x)), r)
@@ -46,3 +50,53 @@ def get_dotted_field(obj, dotted_field):
         return getattr(obj, fields[0], None)
 
     return None
+
+
+def sync_m2m(instance, field_name, objects):
+    """
+    Make a many-to-many field of the instance hold exactly the given
+    objects, by the difference with its current rows: one select, one
+    delete of the removed rows and one `bulk_create` of the added rows
+    on the through model, instead of `clear()` and an `add()` per object.
+    `m2m_changed` is sent as by `remove()` and `add()`.
+
+    :param instance: saved model instance
+    :param field_name: name of the many-to-many field, e.g. `category`
+    :param objects: iterable of model instances or primary keys
+    :return: (set of added pks, set of removed pks)
+    """
+    manager = getattr(instance, field_name)
+    through = manager.through
+    source = through._meta.get_field(manager.source_field_name).attname
+    target = through._meta.get_field(manager.target_field_name).attname
+    db = router.db_for_write(through, instance=instance)
+
+    pks = {obj.pk if isinstance(obj, Model) else obj for obj in objects}
+    rows = through._default_manager.using(db).filter(**{source: instance.pk})
+
+    def send(action, pk_set):
+        m2m_changed.send(
+            sender=through, action=action, instance=instance,
+            reverse=manager.reverse, model=manager.model, pk_set=pk_set,
+            using=db,
+        )
+
+    with transaction.atomic(using=db, savepoint=False):
+        current = set(rows.values_list(target, flat=True))
+        removed, added = current - pks, pks - current
+        if removed:
+            send('pre_remove', removed)
+            rows.filter(**{target + '__in': removed}).delete()
+            send('post_remove', removed)
+        if added:
+            send('pre_add', added)
+            through._default_manager.using(db).bulk_create([
+                through(**{source: instance.pk, target: pk}) for pk in added
+            ], ignore_conflicts=True)
+            send('post_add', added)
+
+    # drop the stale `prefetch_related` result
+    getattr(instance, '_prefetched_objects_cache', {}).pop(
+        manager.prefetch_cache_name, None
+    )
+    return added, removed
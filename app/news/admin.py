@@ -6,10 +6,7 @@ from .models import (
     Category,
     Comment,
     Feedback,
-    PostLike,
-    PostDislike,
-    CommentLike,
-    CommentDislike,
+    Reaction,
     HomePageSectionsSettings,
     ScreenShot
 )
@@ -86,6 +83,18 @@ class FeedbackAdmin(admin.ModelAdmin):
     )
 
 
+class ReactionAdmin(admin.ModelAdmin):
+    model = Reaction
+    list_display = (
+        'user',
+        'value',
+        'post',
+        'comment',
+        'created_at',
+    )
+    raw_id_fields = ('post', 'comment', 'user')
+
+
 admin.site.register(Post, PostAdmin)
 admin.site.register(Content, PostContentAdmin)
 admin.site.register(PostIdentifier)
@@ -95,8 +104,5 @@ admin.site.register(HomePageSectionsSettings, HomePageSectionsSettingsAdmin)
 
 admin.site.register(Comment, CommentAdmin)
 admin.site.register(Feedback, FeedbackAdmin)
-admin.site.register(PostLike)
-admin.site.register(PostDislike)
-admin.site.register(CommentLike)
-admin.site.register(CommentDislike)
+admin.site.register(Reaction, ReactionAdmin)
 admin.site.register(ScreenShot)
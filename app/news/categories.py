@@ -0,0 +1,102 @@
+"""
+Category tree.
+
+All categories are loaded with one query and nested in memory by
+`parent_category`, at any depth. The serialized tree is cached under the
+`categories` cache version, which `core.signals` bumps on every Category
+change, so the menu, the category APIs and the category filters of the
+feeds read it without touching the database.
+
+Node:
+    {
+        "id": 1,
+        "title": "Sport",
+        "ordering": 1,
+        "url": "/sport/",
+        "child_category": [<nodes>]
+    }
+"""
+from django.core.cache import cache
+
+from core.utils.cache import get_cache_versions
+from .models import Category, Post
+
+TREE_KEY = 'category-tree:{version}'
+TREE_TIMEOUT = 60 * 60 * 24
+
+NODE_FIELDS = ('id', 'title', 'ordering', 'url')
+
+
+def build_category_tree():
+    """ Nested categories, read from the database """
+
+    rows = Category.objects.order_by('ordering', 'title').values_list(
+        'parent_category_id', *NODE_FIELDS
+    )
+    nodes, parents = {}, {}
+    for parent_id, *values in rows:
+        node = dict(zip(NODE_FIELDS, values))
+        node['child_category'] = []
+        nodes[node['id']] = node
+        parents[node['id']] = parent_id
+
+    roots = []
+    for node in nodes.values():
+        parent = nodes.get(parents[node['id']])
+        if parent is None:
+            roots.append(node)
+        else:
+            parent['child_category'].append(node)
+    return roots
+
+
+def get_category_tree():
+    """ Nested categories, from the cache when they did not change """
+
+    version, = get_cache_versions(['categories'])
+    key = TREE_KEY.format(version=version)
+    tree = cache.get(key)
+    if tree is None:
+        tree = build_category_tree()
+        cache.set(key, tree, TREE_TIMEOUT)
+    return tree
+
+
+def iter_categories(nodes, parent_id=None):
+    """
+    (parent id, node) of the nodes of the tree,
+    each node followed by its descendants
+    """
+    for node in nodes:
+        yield parent_id, node
+        yield from iter_categories(node['child_category'], node['id'])
+
+
+def get_category(category_id):
+    """ Node of the category, None if it does not exist """
+
+    for _, node in iter_categories(get_category_tree()):
+        if node['id'] == category_id:
+            return node
+    return None
+
+
+def get_descendant_ids(category_id):
+    """
+    :return: ids of the category and of all its descendants,
+        empty if the category does not exist
+    """
+    node = get_category(category_id)
+    if node is None:
+        return []
+    return [descendant['id'] for _, descendant in iter_categories([node])]
+
+
+def filter_by_category(queryset, category_id):
+    """
+    Posts of the queryset in the category or in any of its descendants,
+    each post once
+    """
+    return queryset.filter(id__in=Post.category.through.objects.filter(
+        category_id__in=get_descendant_ids(category_id),
+    ).values('post_id'))
@@ -0,0 +1,95 @@
+"""
+Bulk writes of the content blocks of a post.
+
+An article is saved as a whole: the blocks are created, updated, reordered
+and deleted with a few statements in one transaction, instead of one
+request and one `Content.save` (which also touches the post) per block.
+"""
+from django.db import transaction
+from django.utils.translation import ugettext_lazy as _
+from rest_framework.exceptions import ValidationError
+
+from core.signals import invalidate_groups
+from .models import Content, Post
+from .options.tools import MAIN_TEXT, truncate_sentence
+from .search import update_search_vectors
+from .signals import posts_changed
+
+# fields of a block written by `save_post_contents`
+CONTENT_FIELDS = (
+    'content_type',
+    'ordering',
+    'title',
+    'text',
+    'photo',
+    'video',
+)
+
+
+def save_post_contents(post, blocks):
+    """
+    Replace the content blocks of the post with the given blocks.
+
+    Blocks with an `id` update the existing block of the post, the others
+    are created, existing blocks which are not given are deleted. The
+    short description of the post is filled from the first `Main Text`
+    block, if it is empty.
+
+    :param post: Post object
+    :param blocks: list of dicts of `CONTENT_FIELDS` and an optional `id`
+        of a block of the post
+    :return: list of the Content objects of the post, in order
+    :raise ValidationError: a block of the given ids is not a block of the
+        post, e.g. it was deleted by a concurrent save
+    """
+    with transaction.atomic():
+        # concurrent saves of the same article are applied one by one
+        existing = {
+            content.id: content
+            for content in Content.objects.select_for_update().filter(
+                post=post
+            )
+        }
+        # validated before the lock, the blocks may have been deleted since
+        if any(block['id'] not in existing
+               for block in blocks if block.get('id') is not None):
+            raise ValidationError(_('Content blocks must belong to the post'))
+
+        created, updated = [], []
+        for block in blocks:
+            if block.get('id') is None:
+                content = Content(post=post)
+                created.append(content)
+            else:
+                content = existing.pop(block['id'])
+                updated.append(content)
+            for field in CONTENT_FIELDS:
+                if field in block:
+                    setattr(content, field, block[field])
+
+        if existing:
+            Content.objects.filter(id__in=list(existing)).delete()
+        Content.objects.bulk_create(created)
+        if updated:
+            Content.objects.bulk_update(updated, CONTENT_FIELDS)
+
+        contents = sorted(
+            created + updated,
+            key=lambda content: (content.ordering, content.title),
+        )
+        if not post.short_description:
+            main_text = next((
+                content for content in contents
+                if content.content_type == MAIN_TEXT
+            ), None)
+            if main_text is not None:
+                post.short_description = truncate_sentence(main_text.text)
+                Post.objects.filter(pk=post.pk).update(
+                    short_description=post.short_description
+                )
+        update_search_vectors([post.id])
+
+    # bulk writes send no signals
+    invalidate_groups(Content)
+    posts_changed.send(sender=Content)
+    return contents
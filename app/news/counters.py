@@ -0,0 +1,186 @@
+"""
+Buffered view counters.
+
+Reading a post or a story must not write to its row. Every hit is recorded
+in a buffer and `news.tasks.flush_view_counters` periodically applies the
+aggregated increments with `F()` updates.
+
+The buffer is a Redis hash in production. Without Redis it is the
+`CounterBuffer` table, shared by the web processes and the Celery worker
+running the flush. `settings.VIEW_BUFFER = 'local'` keeps the hits in
+process memory instead, they are only flushed by the process recording
+them (the test runner), views recorded by the web processes of a
+development server are then never counted.
+"""
+import threading
+from collections import Counter, defaultdict
+
+from django.apps import apps
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F
+
+from core.utils.cache import get_redis_connection
+from .models import CounterBuffer
+
+COUNTED_MODELS = (
+    'news.post',
+    'stories.story',
+)
+
+BUFFER_KEY = 'views:{model}'
+
+
+class LocalBuffer:
+    """ Process-local buffer, used in development and tests """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._hits = defaultdict(Counter)
+
+    def incr(self, model, pk, amount=1):
+        with self._lock:
+            self._hits[model][pk] += amount
+
+    def flush(self, model, apply):
+        with self._lock:
+            hits = self._hits.pop(model, Counter())
+        try:
+            apply(dict(hits))
+        except Exception:
+            # put the hits back, they will be applied on the next flush
+            with self._lock:
+                self._hits[model].update(hits)
+            raise
+
+
+class DatabaseBuffer:
+    """
+    Buffer stored in the `CounterBuffer` table, one row per object:
+    (`news.post`, pk) => hits
+    """
+
+    INCR_SQL = """
+    INSERT INTO {table} (key, object_id, hits) VALUES (%s, %s, %s)
+    ON CONFLICT (key, object_id) DO UPDATE
+    SET hits = {table}.hits + EXCLUDED.hits
+    """
+    FLUSH_SQL = """
+    DELETE FROM {table} WHERE key = %s RETURNING object_id, hits
+    """
+
+    def _execute(self, sql, params):
+        with connection.cursor() as cursor:
+            cursor.execute(sql.format(
+                table=connection.ops.quote_name(CounterBuffer._meta.db_table)
+            ), params)
+            return cursor.fetchall() if cursor.description else None
+
+    def incr(self, model, pk, amount=1):
+        self._execute(self.INCR_SQL, [model, pk, amount])
+
+    def flush(self, model, apply):
+        # the deleted rows come back if the hits can't be applied
+        with transaction.atomic():
+            hits = self._execute(self.FLUSH_SQL, [model])
+            if hits:
+                apply(dict(hits))
+
+
+class RedisBuffer:
+    """
+    Buffer stored in a Redis hash per model: `views:news.post` => {pk: hits}
+    """
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def incr(self, model, pk, amount=1):
+        self.connection.hincrby(BUFFER_KEY.format(model=model), pk, amount)
+
+    def flush(self, model, apply):
+        key = BUFFER_KEY.format(model=model)
+        flushing = key + ':flushing'
+
+        # The live hash is renamed, so the hits recorded during the flush
+        # go to a new hash. A hash left over by a flush stopped before it
+        # read it is applied first.
+        if self.connection.exists(key):
+            self.connection.renamenx(key, flushing)
+        # read and deleted at once: a flush stopped after this point
+        # loses its hits, it never applies them twice
+        pipeline = self.connection.pipeline()
+        pipeline.hgetall(flushing)
+        pipeline.delete(flushing)
+        hits = {
+            int(pk): int(count)
+            for pk, count in pipeline.execute()[0].items()
+        }
+        if not hits:
+            return
+        try:
+            apply(hits)
+        except Exception:
+            # put the hits back, they will be applied on the next flush
+            pipeline = self.connection.pipeline()
+            for pk, count in hits.items():
+                pipeline.hincrby(key, pk, count)
+            pipeline.execute()
+            raise
+
+
+_local_buffer = LocalBuffer()
+_database_buffer = DatabaseBuffer()
+
+
+def get_buffer():
+    redis = get_redis_connection()
+    if redis is not None:
+        return RedisBuffer(redis)
+    if settings.VIEW_BUFFER == 'local':
+        return _local_buffer
+    return _database_buffer
+
+
+def record_view(instance):
+    """ Count one view of a Post or a Story without touching its row """
+
+    record_view_of(instance._meta.label_lower, instance.pk)
+
+
+def record_view_of(model, pk):
+    """
+    Count one view of an object not loaded from the database,
+    e.g. served from the response cache
+
+    :param model: label of the model, e.g. `news.post`
+    :param pk: primary key of the object
+    """
+    get_buffer().incr(model, int(pk))
+
+
+def flush_views(model, on_flush=None):
+    """
+    Apply buffered views of the given model (e.g. `news.post`) to its
+    `views` column. Objects with the same number of new views are updated
+    with one statement.
+
+    :param on_flush: called with the dict of {pk: new views} in the same
+        transaction
+    """
+    klass = apps.get_model(model)
+
+    def apply(hits):
+        by_amount = defaultdict(list)
+        for pk, amount in hits.items():
+            by_amount[amount].append(pk)
+
+        with transaction.atomic():
+            for amount, ids in by_amount.items():
+                klass.objects.filter(pk__in=sorted(ids)).update(
+                    views=F('views') + amount
+                )
+            if on_flush is not None:
+                on_flush(hits)
+
+    get_buffer().flush(model, apply)
@@ -0,0 +1,63 @@
+"""
+Elasticsearch document of posts.
+
+`settings.ELASTICSEARCH_INDEX_NAMES[__name__]` is the name the index is
+searched with. `news.indexing.reindex_posts` builds a new index and swaps
+this name, an alias, to it.
+"""
+from django.conf import settings
+from django_elasticsearch_dsl import Document, Index, fields
+
+from .models import Category, Content, Post
+
+INDEX = Index(settings.ELASTICSEARCH_INDEX_NAMES[__name__])
+INDEX.settings(
+    number_of_shards=1,
+    number_of_replicas=1,
+)
+
+
+@INDEX.document
+class PostDocument(Document):
+    author = fields.TextField(attr='author_indexing')
+    category = fields.KeywordField(attr='category_indexing', multi=True)
+    content = fields.ObjectField(
+        attr='content_indexing',
+        multi=True,
+        properties={
+            'id': fields.IntegerField(),
+            'title': fields.TextField(),
+            'text': fields.TextField(),
+        },
+    )
+
+    class Django:
+        model = Post
+        fields = [
+            'id',
+            'title',
+            'slug',
+            'short_description',
+            'status',
+            'is_approved',
+            'publish_date',
+            'views',
+        ]
+        related_models = [Category, Content]
+
+    def get_queryset(self):
+        """ Posts with everything the `*_indexing` properties read """
+
+        return super(PostDocument, self).get_queryset().select_related(
+            'author'
+        ).prefetch_related('category', 'post_content')
+
+    def get_instances_from_related(self, related_instance):
+        if isinstance(related_instance, Content):
+            return related_instance.post
+        return related_instance.post_set.all()
+
+    def prepare_content(self, instance):
+        """ The contents are plain dicts already """
+
+        return instance.content_indexing
@@ -0,0 +1,132 @@
+"""
+Personalized feeds merged from per-category recency lists.
+
+Every category has a cached list of its latest live posts,
+`(publish_date, id)` newest first, at most `CATEGORY_FEED_SIZE` long. The
+lists are cached under the `posts` cache version, so a change of any post
+rebuilds them lazily, one indexed query per category.
+
+A feed of several categories is a k-way merge of their lists, read after
+a keyset cursor `(publish_date, id)`. A list cut at `CATEGORY_FEED_SIZE`
+may miss posts older than its last entry, so a page reaching past the
+oldest entry of a full list is read from the database instead.
+"""
+import heapq
+
+from django.core.cache import cache
+
+from core.utils.cache import get_cache_versions
+from .categories import get_descendant_ids
+from .models import Post
+from .related import published_posts
+
+CATEGORY_FEED_KEY = 'category-feed:{category}:{version}'
+CATEGORY_FEED_SIZE = 200
+CATEGORY_FEED_TIMEOUT = 60 * 60 * 24
+
+
+def build_category_feed(category_id):
+    """ (publish_date, id) of the latest posts of the category """
+
+    return list(published_posts().filter(category=category_id).order_by(
+        '-publish_date', '-id'
+    ).values_list('publish_date', 'id')[:CATEGORY_FEED_SIZE])
+
+
+def get_category_feeds(category_ids):
+    """
+    Recency lists of the categories, read with one cache call,
+    the missing ones are built and cached
+
+    :return: list of lists of (publish_date, id), newest first
+    """
+    version, = get_cache_versions(['posts'])
+    keys = {
+        CATEGORY_FEED_KEY.format(category=pk, version=version): pk
+        for pk in category_ids
+    }
+    feeds = cache.get_many(list(keys))
+    missing = {
+        key: build_category_feed(pk)
+        for key, pk in keys.items() if key not in feeds
+    }
+    if missing:
+        cache.set_many(missing, CATEGORY_FEED_TIMEOUT)
+        feeds.update(missing)
+    return list(feeds.values())
+
+
+def expand_categories(category_ids):
+    """ The categories with all their descendants """
+
+    expanded = set()
+    for pk in category_ids:
+        expanded.update(get_descendant_ids(pk))
+    return expanded
+
+
+def merge_feeds(feeds, size, after=None, exclude=()):
+    """
+    K-way merge of recency lists
+
+    :param feeds: lists of (publish_date, id), newest first
+    :param size: number of entries to return
+    :param after: (publish_date, id) of the cursor, only older entries
+        are returned
+    :param exclude: ids of posts to skip
+    :return: list of (publish_date, id), each post once, or None when the
+        lists cannot tell which posts follow
+    """
+    # entries older than the oldest entry of a full list may be missing
+    horizon = max((
+        feed[-1] for feed in feeds if len(feed) >= CATEGORY_FEED_SIZE
+    ), default=None)
+
+    page, previous = [], None
+    for entry in heapq.merge(*feeds, reverse=True):
+        # a post of several categories comes once from each list, in a row
+        if entry == previous or (after is not None and entry >= after):
+            continue
+        previous = entry
+        if horizon is not None and entry < horizon:
+            return None
+        if entry[1] in exclude:
+            continue
+        page.append(entry)
+        if len(page) == size:
+            break
+    return page
+
+
+def query_feed(category_ids, size, after=None, exclude=()):
+    """ The same page as `merge_feeds`, read from the database """
+
+    queryset = published_posts().filter(
+        id__in=Post.category.through.objects.filter(
+            category_id__in=category_ids
+        ).values('post_id')
+    ).exclude(id__in=exclude)
+    if after is not None:
+        publish_date, pk = after
+        queryset = queryset.filter(publish_date__lte=publish_date).exclude(
+            publish_date=publish_date, id__gte=pk
+        )
+    return list(queryset.order_by('-publish_date', '-id').values_list(
+        'publish_date', 'id'
+    )[:size])
+
+
+def feed_page(category_ids, size, after=None, exclude=()):
+    """
+    Latest posts of the categories and their descendants,
+    from the recency lists when they reach deep enough
+
+    :return: list of (publish_date, id), newest first
+    """
+    category_ids = expand_categories(category_ids)
+    if not category_ids:
+        return []
+    page = merge_feeds(get_category_feeds(category_ids), size, after, exclude)
+    if page is None:
+        page = query_feed(category_ids, size, after, exclude)
+    return page
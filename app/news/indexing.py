@@ -0,0 +1,309 @@
+"""
+Bulk reindexing of posts into Elasticsearch.
+
+`reindex_posts` rebuilds the index without downtime:
+
+1. a new index `<alias>-<timestamp>` is created with the mapping of
+   `PostDocument`;
+2. posts are streamed from a server-side cursor in batches, the categories
+   and contents of a batch are prefetched with one query each, and the
+   documents are sent with the bulk API by a pool of workers. At most
+   `max_pending` batches wait for a worker, so reading the database never
+   runs far ahead of the cluster;
+3. the alias is moved to the new index with one atomic request and the
+   previous indices are deleted;
+4. posts saved while the index was built are indexed again, and the
+   documents of the posts deleted meanwhile (deleted from the previous
+   index only) are deleted.
+
+The cluster is reached through the backend of
+`settings.SEARCH_INDEX_BACKEND`: `ElasticsearchBackend`, or
+`MemoryBackend`, which keeps the indices in the process, for tests and
+development without a cluster.
+"""
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import islice
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import prefetch_related_objects
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from elasticsearch import NotFoundError, helpers
+from elasticsearch_dsl.connections import connections
+
+from .documents import INDEX, PostDocument
+
+# posts read, prepared and sent with one bulk request
+BATCH_SIZE = 500
+# concurrent bulk requests
+WORKERS = 4
+
+REINDEX_LOCK_KEY = 'reindex-posts:lock'
+# seconds after which the lock of a crashed reindex expires
+REINDEX_LOCK_TIMEOUT = 60 * 60
+
+
+class IndexingError(Exception):
+    """ The new index is incomplete, the alias was not moved """
+
+    def __init__(self, message, errors=()):
+        super(IndexingError, self).__init__(message)
+        self.errors = list(errors)
+
+
+class ElasticsearchBackend:
+    """ The cluster of `settings.ELASTICSEARCH_DSL` """
+
+    def __init__(self, using='default'):
+        self.client = connections.get_connection(using)
+
+    def create_index(self, name, body):
+        self.client.indices.create(index=name, body=body)
+
+    def bulk(self, index, documents):
+        """
+        Index the documents, safe to call from several threads
+
+        :return: list of the errors of the rejected documents
+        """
+        _, errors = helpers.bulk(
+            self.client,
+            (
+                {'_index': index, '_id': document['id'], '_source': document}
+                for document in documents
+            ),
+            raise_on_error=False,
+            raise_on_exception=False,
+        )
+        return errors
+
+    def delete_documents(self, index, ids):
+        """ Delete the documents of the ids, missing ones are skipped """
+
+        helpers.bulk(
+            self.client,
+            ({'_op_type': 'delete', '_index': index, '_id': pk}
+             for pk in ids),
+            raise_on_error=False,
+        )
+
+    def document_ids(self, index):
+        """ Ids of the documents of the index, scrolled """
+
+        for hit in helpers.scan(
+                self.client, index=index, _source=False,
+                query={'query': {'match_all': {}}},
+        ):
+            yield int(hit['_id'])
+
+    def refresh(self, index):
+        self.client.indices.refresh(index=index)
+
+    def swap_alias(self, alias, index):
+        """
+        Point the alias to the index only, in one atomic request.
+        An index named as the alias (created before there was an alias)
+        is deleted in the same request.
+
+        :return: names of the indices the alias pointed to
+        """
+        try:
+            previous = list(self.client.indices.get_alias(name=alias))
+        except NotFoundError:
+            previous = []
+        actions = [
+            {'remove': {'index': name, 'alias': alias}} for name in previous
+        ]
+        if not previous and self.client.indices.exists(index=alias):
+            actions.append({'remove_index': {'index': alias}})
+        actions.append({'add': {'index': index, 'alias': alias}})
+        self.client.indices.update_aliases(body={'actions': actions})
+        return previous
+
+    def delete_index(self, name):
+        self.client.indices.delete(index=name, ignore=[404])
+
+
+class MemoryBackend:
+    """
+    Indices and aliases kept in the process, shared by all instances.
+    `indices` maps an index name to its body and documents by id.
+    """
+
+    indices = {}
+    aliases = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def reset(cls):
+        cls.indices.clear()
+        cls.aliases.clear()
+
+    @classmethod
+    def documents(cls, name):
+        """ Documents of an index or an alias, by id """
+
+        return cls.indices[cls.aliases.get(name, name)]['documents']
+
+    def create_index(self, name, body):
+        with self._lock:
+            if name in self.indices or name in self.aliases:
+                raise ValueError('Index {} already exists'.format(name))
+            self.indices[name] = {'body': body, 'documents': {}}
+
+    def bulk(self, index, documents):
+        with self._lock:
+            stored = self.documents(index)
+            for document in documents:
+                stored[document['id']] = document
+        return []
+
+    def delete_documents(self, index, ids):
+        with self._lock:
+            stored = self.documents(index)
+            for pk in ids:
+                stored.pop(pk, None)
+
+    def document_ids(self, index):
+        with self._lock:
+            return list(self.documents(index))
+
+    def refresh(self, index):
+        pass
+
+    def swap_alias(self, alias, index):
+        with self._lock:
+            previous = self.aliases.get(alias)
+            self.indices.pop(alias, None)
+            self.aliases[alias] = index
+        return [previous] if previous else []
+
+    def delete_index(self, name):
+        with self._lock:
+            self.indices.pop(name, None)
+
+
+def get_backend():
+    return import_string(settings.SEARCH_INDEX_BACKEND)()
+
+
+def iter_batches(queryset, batch_size=BATCH_SIZE):
+    """
+    Lists of objects of the queryset, read with a server-side cursor.
+    `prefetch_related` of the queryset runs once per batch
+    (`QuerySet.iterator` alone would ignore it).
+    """
+    lookups = queryset._prefetch_related_lookups
+    objects = queryset.prefetch_related(None).iterator(chunk_size=batch_size)
+    while True:
+        batch = list(islice(objects, batch_size))
+        if not batch:
+            return
+        prefetch_related_objects(batch, *lookups)
+        yield batch
+
+
+def index_posts(backend, index, queryset, batch_size=BATCH_SIZE,
+                workers=WORKERS, max_pending=None):
+    """
+    Send the documents of the posts of the queryset to the index
+
+    :param backend: backend of the cluster
+    :param index: name of the index or the alias to write to
+    :param queryset: queryset of `PostDocument.get_queryset`
+    :param batch_size: posts per bulk request
+    :param workers: concurrent bulk requests
+    :param max_pending: batches prepared ahead of the workers,
+        twice the workers by default
+    :return: (number of documents sent, list of errors)
+    """
+    document = PostDocument()
+    max_pending = max_pending or workers * 2
+    count, errors, pending = 0, [], set()
+
+    def collect(futures):
+        for future in futures:
+            errors.extend(future.result())
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        # the database is read in this thread only, workers only send
+        for batch in iter_batches(queryset, batch_size):
+            if len(pending) >= max_pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+            documents = [document.prepare(post) for post in batch]
+            pending.add(executor.submit(backend.bulk, index, documents))
+            count += len(documents)
+        collect(wait(pending).done)
+    return count, errors
+
+
+def delete_stale_documents(backend, index, queryset,
+                           batch_size=BATCH_SIZE):
+    """
+    Delete the documents of the index whose post is not in the queryset
+    anymore, e.g. deleted while the index was built
+
+    :return: number of deleted documents
+    """
+    ids = iter(backend.document_ids(index))
+    deleted = 0
+    while True:
+        batch = list(islice(ids, batch_size))
+        if not batch:
+            return deleted
+        stale = set(batch) - set(queryset.prefetch_related(None).filter(
+            id__in=batch
+        ).values_list('id', flat=True))
+        if stale:
+            backend.delete_documents(index, sorted(stale))
+            deleted += len(stale)
+
+
+def reindex_posts(backend=None, batch_size=BATCH_SIZE, workers=WORKERS):
+    """
+    Build a new index of all posts and swap the alias to it
+
+    :return: dict of the new `index` and the number of `indexed` posts
+    :raise IndexingError: when a reindex is already running or documents
+        were rejected, the alias is left as it was
+    """
+    if not cache.add(REINDEX_LOCK_KEY, True, REINDEX_LOCK_TIMEOUT):
+        raise IndexingError('A reindex of posts is already running')
+
+    try:
+        backend = backend or get_backend()
+        alias = INDEX._name
+        started = timezone.now()
+        index = '{}-{}'.format(alias, started.strftime('%Y%m%d%H%M%S%f'))
+        backend.create_index(index, INDEX.to_dict())
+
+        queryset = PostDocument().get_queryset().order_by('id')
+        try:
+            count, errors = index_posts(
+                backend, index, queryset, batch_size, workers,
+            )
+            if errors:
+                raise IndexingError(
+                    '{} post(s) were rejected'.format(len(errors)), errors,
+                )
+        except Exception:
+            backend.delete_index(index)
+            raise
+
+        backend.refresh(index)
+        for previous in backend.swap_alias(alias, index):
+            backend.delete_index(previous)
+
+        # changes saved before the swap were written to the previous index
+        index_posts(
+            backend, alias, queryset.filter(updated_at__gte=started),
+            batch_size, workers,
+        )
+        # deletions before the swap were written to the previous index
+        delete_stale_documents(backend, index, queryset, batch_size)
+        return {'index': index, 'indexed': count}
+    finally:
+        cache.delete(REINDEX_LOCK_KEY)
@@ -0,0 +1,51 @@
+"""
+Lead blocks of posts.
+
+Post lists show the lead blocks of a post only: its first `Main Text`
+block and its first block with a photo. `lead_contents` restricts a
+content queryset to them, so the lead blocks of a page of posts are
+prefetched with one query, instead of every block of every post.
+"""
+from django.db.models import OuterRef, Q, Subquery
+
+from .models import Content
+from .options.tools import MAIN_TEXT
+
+# order of the blocks of a post
+BLOCK_ORDER = ('ordering', 'title', 'id')
+
+
+def _first_block(**filters):
+    return Subquery(Content.objects.filter(
+        post=OuterRef('post'), **filters
+    ).order_by(*BLOCK_ORDER).values('id')[:1])
+
+
+def lead_contents(queryset):
+    """ The lead blocks of the content queryset, for every post """
+
+    return queryset.filter(
+        Q(id=_first_block(content_type=MAIN_TEXT)) |
+        Q(id=_first_block(photo__isnull=False))
+    )
+
+
+def select_lead_contents(contents):
+    """
+    The lead blocks among the blocks of a post, in order
+
+    :param contents: Content objects of one post
+    """
+    contents = sorted(contents, key=lambda content: tuple(
+        getattr(content, field) for field in BLOCK_ORDER
+    ))
+    main_text = next((
+        content for content in contents if content.content_type == MAIN_TEXT
+    ), None)
+    photo = next((
+        content for content in contents if content.photo_id is not None
+    ), None)
+    return [
+        content for content in contents
+        if content is main_text or content is photo
+    ]
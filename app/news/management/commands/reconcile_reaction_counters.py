@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from news.models import Post, Comment
+from news.reactions import reconcile_counters
+
+
+class Command(BaseCommand):
+    help = 'Recount like / dislike counters of Posts and Comments ' \
+           'from the reaction table'
+
+    def handle(self, *args, **options):
+        for model in (Post, Comment):
+            corrected = reconcile_counters(model)
+            self.stdout.write(self.style.SUCCESS(
+                '{}: {} counter(s) corrected'.format(
+                    model._meta.verbose_name_plural, corrected
+                )
+            ))
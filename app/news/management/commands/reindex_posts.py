@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from news.indexing import BATCH_SIZE, WORKERS, IndexingError, reindex_posts
+from news.tasks import reindex_posts as reindex_posts_task
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the Elasticsearch index of posts in a new index ' \
+           'and swap the alias to it'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=BATCH_SIZE,
+            help='Posts per bulk request',
+        )
+        parser.add_argument(
+            '--workers', type=int, default=WORKERS,
+            help='Concurrent bulk requests',
+        )
+        parser.add_argument(
+            '--async', action='store_true', dest='run_async',
+            help='Queue the reindex for a Celery worker',
+        )
+
+    def handle(self, *args, **options):
+        if options['run_async']:
+            reindex_posts_task.delay(options['batch_size'], options['workers'])
+            self.stdout.write(self.style.SUCCESS('Reindex queued'))
+            return
+
+        try:
+            result = reindex_posts(
+                batch_size=options['batch_size'], workers=options['workers'],
+            )
+        except IndexingError as error:
+            raise CommandError(error)
+        self.stdout.write(self.style.SUCCESS(
+            '{indexed} post(s) indexed in {index}'.format(**result)
+        ))
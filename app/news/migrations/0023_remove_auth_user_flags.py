@@ -0,0 +1,33 @@
+# Generated by Django 3.1.3 on 2026-10-18 03:06
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0022_post_is_saved_by_auth_user'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='comment',
+            name='is_disliked_by_auth_user',
+        ),
+        migrations.RemoveField(
+            model_name='comment',
+            name='is_liked_by_auth_user',
+        ),
+        migrations.RemoveField(
+            model_name='post',
+            name='is_disliked_by_auth_user',
+        ),
+        migrations.RemoveField(
+            model_name='post',
+            name='is_liked_by_auth_user',
+        ),
+        migrations.RemoveField(
+            model_name='post',
+            name='is_saved_by_auth_user',
+        ),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 3.1.3 on 2026-10-18 03:09
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_users(table, target_field):
+    lookup = '{}__{}'.format(table._meta.model_name, target_field)
+    return Coalesce(Subquery(
+        table.user.through.objects.filter(
+            **{lookup: OuterRef('pk')}
+        ).order_by().values(lookup).annotate(
+            total=Count('*')
+        ).values('total'),
+        output_field=IntegerField(),
+    ), 0)
+
+
+def fill_counters(apps, schema_editor):
+    for model, like, dislike in (
+            ('Post', 'PostLike', 'PostDislike'),
+            ('Comment', 'CommentLike', 'CommentDislike'),
+    ):
+        target_field = model.lower()
+        apps.get_model('news', model).objects.update(
+            like_count=count_users(
+                apps.get_model('news', like), target_field
+            ),
+            dislike_count=count_users(
+                apps.get_model('news', dislike), target_field
+            ),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0023_remove_auth_user_flags'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='dislike_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='Dislike count'),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='like_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='Like count'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='dislike_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='Dislike count'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='like_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='Like count'),
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,106 @@
+# Generated by Django 3.1.3 on 2026-10-18 03:12
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+LIKE = 1
+DISLIKE = -1
+BATCH_SIZE = 1000
+
+
+def copy_reactions(apps, schema_editor):
+    """
+    Copy users of the legacy PostLike, PostDislike, CommentLike and
+    CommentDislike tables into Reaction rows. Likes are copied first, so
+    a user found in both tables of a target keeps the like.
+    """
+    Reaction = apps.get_model('news', 'Reaction')
+
+    for table, target_field, value in (
+            ('PostLike', 'post', LIKE),
+            ('PostDislike', 'post', DISLIKE),
+            ('CommentLike', 'comment', LIKE),
+            ('CommentDislike', 'comment', DISLIKE),
+    ):
+        through = apps.get_model('news', table).user.through
+        lookup = '{}__{}_id'.format(table.lower(), target_field)
+        rows = through.objects.values_list(lookup, 'myuser_id').iterator()
+
+        batch = []
+        for target_id, user_id in rows:
+            batch.append(Reaction(**{
+                '{}_id'.format(target_field): target_id,
+                'user_id': user_id,
+                'value': value,
+            }))
+            if len(batch) == BATCH_SIZE:
+                Reaction.objects.bulk_create(batch, ignore_conflicts=True)
+                batch = []
+        Reaction.objects.bulk_create(batch, ignore_conflicts=True)
+
+
+# Counters of 0024 count both reactions of a user who liked and disliked
+# a target, the copied Reaction rows keep the like only
+RECOUNT_SQL = """
+UPDATE {table} target
+SET like_count = counts.likes, dislike_count = counts.dislikes
+FROM (
+    SELECT target.id,
+        COUNT(reaction.id) FILTER (WHERE reaction.value = 1) AS likes,
+        COUNT(reaction.id) FILTER (WHERE reaction.value = -1) AS dislikes
+    FROM {table} target
+    LEFT JOIN news_reaction reaction ON reaction.{field}_id = target.id
+    GROUP BY target.id
+) counts
+WHERE counts.id = target.id
+    AND (target.like_count, target.dislike_count)
+        IS DISTINCT FROM (counts.likes, counts.dislikes)
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('news', '0024_reaction_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Reaction',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('value', models.SmallIntegerField(choices=[(1, 'Like'), (-1, 'Dislike')], verbose_name='Value')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('comment', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='reactions', to='news.comment', verbose_name='Comment')),
+                ('post', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='reactions', to='news.post', verbose_name='Post')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reactions', to=settings.AUTH_USER_MODEL, verbose_name='User')),
+            ],
+            options={
+                'verbose_name': 'Reaction',
+                'verbose_name_plural': 'Reactions',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='reaction',
+            constraint=models.UniqueConstraint(fields=('post', 'user'), name='unique_post_reaction'),
+        ),
+        migrations.AddConstraint(
+            model_name='reaction',
+            constraint=models.UniqueConstraint(fields=('comment', 'user'), name='unique_comment_reaction'),
+        ),
+        migrations.AddConstraint(
+            model_name='reaction',
+            constraint=models.CheckConstraint(check=models.Q(models.Q(('comment__isnull', True), ('post__isnull', False)), models.Q(('comment__isnull', False), ('post__isnull', True)), _connector='OR'), name='reaction_has_one_target'),
+        ),
+        migrations.RunPython(copy_reactions, migrations.RunPython.noop),
+        migrations.RunSQL(
+            RECOUNT_SQL.format(table='news_post', field='post'),
+            migrations.RunSQL.noop,
+        ),
+        migrations.RunSQL(
+            RECOUNT_SQL.format(table='news_comment', field='comment'),
+            migrations.RunSQL.noop,
+        ),
+    ]
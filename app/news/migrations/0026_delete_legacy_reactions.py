@@ -0,0 +1,49 @@
+# Generated by Django 3.1.3 on 2026-10-18 03:12
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0025_reaction'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='commentlike',
+            name='comment',
+        ),
+        migrations.RemoveField(
+            model_name='commentlike',
+            name='user',
+        ),
+        migrations.RemoveField(
+            model_name='postdislike',
+            name='post',
+        ),
+        migrations.RemoveField(
+            model_name='postdislike',
+            name='user',
+        ),
+        migrations.RemoveField(
+            model_name='postlike',
+            name='post',
+        ),
+        migrations.RemoveField(
+            model_name='postlike',
+            name='user',
+        ),
+        migrations.DeleteModel(
+            name='CommentDislike',
+        ),
+        migrations.DeleteModel(
+            name='CommentLike',
+        ),
+        migrations.DeleteModel(
+            name='PostDislike',
+        ),
+        migrations.DeleteModel(
+            name='PostLike',
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 3.1.3 on 2026-10-18 03:15
+
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0026_delete_legacy_reactions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RelatedPosts',
+            fields=[
+                ('post', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='related_index', serialize=False, to='news.post', verbose_name='Post')),
+                ('post_ids', django.contrib.postgres.fields.ArrayField(base_field=models.PositiveIntegerField(), blank=True, default=list, size=None, verbose_name='Related posts')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Related Posts',
+                'verbose_name_plural': 'Related Posts',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='relatedposts',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['post_ids'], name='related_post_ids_gin'),
+        ),
+    ]
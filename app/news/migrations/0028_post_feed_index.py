@@ -0,0 +1,17 @@
+# Generated by Django 3.1.3 on 2026-10-18 03:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0027_related_posts'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(condition=models.Q(('is_approved', True), ('status', 'Open')), fields=['-publish_date', '-id'], name='post_published_feed_idx'),
+        ),
+    ]
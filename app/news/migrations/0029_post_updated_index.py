@@ -0,0 +1,17 @@
+# Generated by Django 3.1.3 on 2026-10-18 03:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0028_post_feed_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(condition=models.Q(('is_approved', True), ('status', 'Open')), fields=['updated_at'], name='post_published_updated_idx'),
+        ),
+    ]
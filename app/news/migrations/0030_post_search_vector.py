@@ -0,0 +1,71 @@
+# Generated by Django 3.1.3 on 2026-10-18 03:36
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+BATCH_SIZE = 1000
+
+# `news.options.tools.to_e_alphabet` of a column
+E_ALPHABET_SQL = (
+    "replace(replace(replace(COALESCE({}, ''), 'ə', 'e'), 'Ə', 'e'), 'ı', 'i')"
+)
+
+# `news.search.search_document` of the posts of an id range: the title,
+# the short description and the contents weighted A, B and C
+BUILD_SEARCH_VECTORS_SQL = """
+UPDATE news_post AS post SET search_vector =
+    setweight(to_tsvector('simple', {title}), 'A')
+    || setweight(to_tsvector('simple', {short_description}), 'B')
+    || setweight(to_tsvector('simple', {contents}), 'C')
+FROM (
+    SELECT post.id, string_agg(
+        concat_ws(' ', content.title, content.text), ' '
+        ORDER BY content.ordering, content.id
+    ) AS contents
+    FROM news_post AS post
+    LEFT JOIN news_content AS content ON content.post_id = post.id
+    WHERE post.id >= %s AND post.id < %s
+    GROUP BY post.id
+) AS document
+WHERE post.id = document.id
+""".format(
+    title=E_ALPHABET_SQL.format('post.title'),
+    short_description=E_ALPHABET_SQL.format('post.short_description'),
+    contents=E_ALPHABET_SQL.format('document.contents'),
+)
+
+
+def build_search_vectors(apps, schema_editor):
+    """ Search vectors of the existing posts, one statement per batch """
+
+    Post = apps.get_model('news', 'Post')
+    first = Post.objects.order_by('id').values_list('id', flat=True).first()
+    last = Post.objects.order_by('id').values_list('id', flat=True).last()
+    if first is None:
+        return
+    with schema_editor.connection.cursor() as cursor:
+        for start in range(first, last + 1, BATCH_SIZE):
+            cursor.execute(
+                BUILD_SEARCH_VECTORS_SQL, [start, start + BATCH_SIZE]
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0029_post_updated_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='post_search_vector_gin'),
+        ),
+        migrations.RunPython(build_search_vectors, migrations.RunPython.noop),
+    ]
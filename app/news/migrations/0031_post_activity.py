@@ -0,0 +1,36 @@
+# Generated by Django 3.1.3 on 2026-10-18 03:44
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0030_post_search_vector'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostActivity',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hour', models.DateTimeField(verbose_name='Hour')),
+                ('views', models.PositiveIntegerField(default=0, verbose_name='Views')),
+                ('reactions', models.PositiveIntegerField(default=0, verbose_name='Reactions')),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='activity', to='news.post', verbose_name='Post')),
+            ],
+            options={
+                'verbose_name': 'Post Activity',
+                'verbose_name_plural': 'Post Activity',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='postactivity',
+            index=models.Index(fields=['hour'], name='post_activity_hour_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='postactivity',
+            unique_together={('post', 'hour')},
+        ),
+    ]
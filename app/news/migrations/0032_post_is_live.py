@@ -0,0 +1,56 @@
+# Generated by Django 3.1.3 on 2026-10-18 03:55
+
+from django.db import migrations, models
+from django.db.models import Q
+from django.utils import timezone
+
+
+def mark_live_posts(apps, schema_editor):
+    """ Live state of the existing posts """
+
+    Post = apps.get_model('news', 'Post')
+    now = timezone.now()
+    Post.objects.filter(
+        Q(end_date__isnull=True) | Q(end_date__gt=now),
+        status='Open', is_approved=True, publish_date__lte=now,
+    ).update(is_live=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0031_post_activity'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='post',
+            name='post_published_feed_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='post',
+            name='post_published_updated_idx',
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='is_live',
+            field=models.BooleanField(default=False, editable=False, verbose_name='Is live'),
+        ),
+        migrations.RunPython(mark_live_posts, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(condition=models.Q(is_live=True), fields=['-publish_date', '-id'], name='post_live_feed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(condition=models.Q(is_live=True), fields=['updated_at'], name='post_live_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(condition=models.Q(('is_approved', True), ('is_live', False), ('status', 'Open')), fields=['end_date', 'publish_date'], name='post_pending_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(condition=models.Q(('end_date__isnull', False), ('is_live', True)), fields=['end_date'], name='post_live_end_idx'),
+        ),
+    ]
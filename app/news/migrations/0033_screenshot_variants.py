@@ -0,0 +1,18 @@
+# Generated by Django 3.1.3 on 2026-10-18 03:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0032_post_is_live'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='screenshot',
+            name='screenshot_variants',
+            field=models.JSONField(blank=True, editable=False, help_text='Resized copies, see `photos.derivatives`', null=True),
+        ),
+    ]
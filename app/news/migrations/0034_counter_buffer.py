@@ -0,0 +1,27 @@
+# Generated by Django 3.1.3 on 2026-10-18 04:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0033_screenshot_variants'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CounterBuffer',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=64, verbose_name='Key')),
+                ('object_id', models.BigIntegerField(verbose_name='Object id')),
+                ('hits', models.BigIntegerField(default=0, verbose_name='Hits')),
+            ],
+            options={
+                'verbose_name': 'Counter Buffer',
+                'verbose_name_plural': 'Counter Buffer',
+                'unique_together': {('key', 'object_id')},
+            },
+        ),
+    ]
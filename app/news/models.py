@@ -1,24 +1,31 @@
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from django.contrib.auth import get_user_model
 from django.urls import reverse
 from django.utils import timezone
 from django.utils.translation import ugettext_lazy as _
-from django.template.defaultfilters import slugify
-from django_elasticsearch_dsl_drf.wrappers import dict_to_obj
 from core.options.tools import user_directory_path
 
 from .options.tools import (
     NEWS_STATUS,
+    OPEN,
     TITLE_TYPES,
     TOP_NEWS,
     CONTENT_TYPES,
+    MAIN_TEXT,
+    REACTIONS,
     truncate_sentence,
-    generate_unique_slug,
+    UniqueSlugMixin,
 )
 from photos.models import Photo
 
 USER = get_user_model()
 
+# fields deciding whether a post is live
+LIVE_FIELDS = {'status', 'is_approved', 'publish_date', 'end_date'}
+
 
 class Category(models.Model):
     """ Post categories """
@@ -60,7 +67,7 @@ class Category(models.Model):
         ordering = ('ordering', 'title',)
 
 
-class Post(models.Model):
+class Post(UniqueSlugMixin, models.Model):
     title = models.CharField(
         _('Title'),
         max_length=255,
@@ -111,18 +118,6 @@ class Post(models.Model):
         _('Is advertisement'),
         default=False,
     )
-    is_liked_by_auth_user = models.BooleanField(
-        verbose_name=_("Liked by Auth User"),
-        default=False
-    )
-    is_disliked_by_auth_user = models.BooleanField(
-        verbose_name=_("Disliked by Auth User"),
-        default=False
-    )
-    is_saved_by_auth_user = models.BooleanField(
-        verbose_name=_("Saved by Auth User"),
-        default=False
-    )
     status = models.CharField(
         _('Status'),
         max_length=255,
@@ -161,6 +156,14 @@ class Post(models.Model):
         default=1,
         help_text=_('The number of views by visitors')
     )
+    like_count = models.PositiveIntegerField(
+        _('Like count'),
+        default=0,
+    )
+    dislike_count = models.PositiveIntegerField(
+        _('Dislike count'),
+        default=0,
+    )
     publish_date = models.DateTimeField(
         _('Publish date'),
         default=timezone.now
@@ -170,6 +173,13 @@ class Post(models.Model):
         blank=True,
         null=True
     )
+    # open, approved and inside its publishing window, kept by `save` and
+    # flipped at the boundaries of the window by `news.publishing`
+    is_live = models.BooleanField(
+        _('Is live'),
+        default=False,
+        editable=False,
+    )
     is_editors_choice = models.BooleanField(
         verbose_name=_("Editor's choice"),
         default=False
@@ -196,28 +206,15 @@ class Post(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     deleted_at = models.DateTimeField(null=True, blank=True)
 
+    # full-text search document, maintained by `news.search`
+    search_vector = SearchVectorField(null=True, editable=False)
+
     def __str__(self):
         return self.title
 
     def get_absolute_url(self):
         return reverse('public_api:post-detail', kwargs={'pk': self.id})
 
-    @property
-    def like_count(self):
-        try:
-            count = self.post_like.user.count()
-        except PostLike.DoesNotExist:
-            count = 0
-        return count
-
-    @property
-    def dislike_count(self):
-        try:
-            count = self.post_dislike.user.count()
-        except PostDislike.DoesNotExist:
-            count = 0
-        return count
-
     @property
     def author_indexing(self):
         """ Used in Elasticsearch indexing """
@@ -232,36 +229,154 @@ class Post(models.Model):
 
     @property
     def content_indexing(self):
-        for each in self.post_content.all():
-            wrapper = dict_to_obj({
+        """ Used in Elasticsearch indexing """
+
+        return [
+            {
                 'id': each.id,
                 'title': each.title,
                 'text': each.text,
-                # 'photo': each.photo_indexing,
-                # 'video': each.video_indexing,
-            })
+            }
+            for each in self.post_content.all()
+        ]
+
+    def is_live_at(self, moment):
+        """ Whether the post is shown to the public at the moment """
 
-            return wrapper
+        return (
+            self.status == OPEN and self.is_approved
+            and self.publish_date <= moment
+            and (self.end_date is None or self.end_date > moment)
+        )
 
     def save(self, *args, **kwargs):
         """
         If `Custom_slug` is True, slug can be customized, else get `Title` and
-        save to `Slug` field.
+        save to `Slug` field (see `UniqueSlugMixin`).
         """
-        if self.slug:  # edit
-            if slugify(self.title) != self.slug and not self.custom_slug:
-                self.slug = generate_unique_slug(Post, self.title)
-        elif not self.custom_slug:  # create
-            self.slug = generate_unique_slug(Post, self.title)
         # save deletion datetime
         if self.status == 'Closed':
             self.deleted_at = timezone.now()
+        self.is_live = self.is_live_at(timezone.now())
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and LIVE_FIELDS & set(update_fields):
+            kwargs['update_fields'] = set(update_fields) | {'is_live'}
         super(Post, self).save(*args, **kwargs)
 
     class Meta:
         verbose_name = _('Post')
         verbose_name_plural = _('Posts')
         ordering = ('-publish_date',)
+        indexes = [
+            # keyset pagination of the public feed
+            models.Index(
+                fields=['-publish_date', '-id'],
+                name='post_live_feed_idx',
+                condition=models.Q(is_live=True),
+            ),
+            # validators of the public feed (latest change)
+            models.Index(
+                fields=['updated_at'],
+                name='post_live_updated_idx',
+                condition=models.Q(is_live=True),
+            ),
+            # posts waiting for their publish date (see `news.publishing`)
+            models.Index(
+                fields=['end_date', 'publish_date'],
+                name='post_pending_idx',
+                condition=models.Q(
+                    is_live=False, status='Open', is_approved=True
+                ),
+            ),
+            # live posts waiting for their end date
+            models.Index(
+                fields=['end_date'],
+                name='post_live_end_idx',
+                condition=models.Q(is_live=True, end_date__isnull=False),
+            ),
+            GinIndex(fields=['search_vector'], name='post_search_vector_gin'),
+        ]
+
+
+class RelatedPosts(models.Model):
+    """
+    Precomputed related posts of a post: ids of live posts,
+    ranked by the number of shared categories and recency.
+    Built by `news.tasks.refresh_related_posts`.
+    """
+
+    post = models.OneToOneField(
+        Post,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='related_index',
+        verbose_name=_('Post'),
+    )
+    post_ids = ArrayField(
+        models.PositiveIntegerField(),
+        default=list,
+        blank=True,
+        verbose_name=_('Related posts'),
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return "{}".format(self.post)
+
+    class Meta:
+        verbose_name = _('Related Posts')
+        verbose_name_plural = _('Related Posts')
+        indexes = [
+            GinIndex(fields=['post_ids'], name='related_post_ids_gin'),
+        ]
+
+
+class PostActivity(models.Model):
+    """
+    Views and reactions of a post in one hour, the input of the trending
+    ranking (see `news.trending`). Rows older than the ranking window are
+    deleted by the ranking job.
+    """
+
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='activity',
+        verbose_name=_('Post'),
+    )
+    hour = models.DateTimeField(_('Hour'))
+    views = models.PositiveIntegerField(_('Views'), default=0)
+    reactions = models.PositiveIntegerField(_('Reactions'), default=0)
+
+    def __str__(self):
+        return "{} {}".format(self.post_id, self.hour)
+
+    class Meta:
+        verbose_name = _('Post Activity')
+        verbose_name_plural = _('Post Activity')
+        unique_together = ('post', 'hour')
+        indexes = [
+            models.Index(fields=['hour'], name='post_activity_hour_idx'),
+        ]
+
+
+class CounterBuffer(models.Model):
+    """
+    Hits buffered for the counters of many objects, shared by the web and
+    the Celery processes when there is no Redis (see `news.counters`)
+    """
+
+    key = models.CharField(_('Key'), max_length=64)
+    object_id = models.BigIntegerField(_('Object id'))
+    hits = models.BigIntegerField(_('Hits'), default=0)
+
+    def __str__(self):
+        return "{} {}".format(self.key, self.object_id)
+
+    class Meta:
+        verbose_name = _('Counter Buffer')
+        verbose_name_plural = _('Counter Buffer')
+        unique_together = ('key', 'object_id')
 
 
 class Content(models.Model):
@@ -306,11 +421,15 @@ class Content(models.Model):
     )
 
     def save(self, *args, **kwargs):
-        if not self.post.short_description \
-                and self.content_type == 'Main Text':
-            post = Post.objects.get(id=self.post_id)
-            post.short_description = truncate_sentence(self.text)
-            post.save()
+        """
+        Fill an empty short description of the post from its main text,
+        with one statement and without saving the post
+        (see `news.contents` for saving all blocks of a post at once)
+        """
+        if self.content_type == MAIN_TEXT:
+            Post.objects.filter(
+                id=self.post_id, short_description=''
+            ).update(short_description=truncate_sentence(self.text))
         super(Content, self).save(*args, **kwargs)
 
     def __str__(self):
@@ -368,34 +487,18 @@ class Comment(models.Model):
     is_approved = models.BooleanField(
         verbose_name=_("Approved"), default=False
     )
-    is_liked_by_auth_user = models.BooleanField(
-        verbose_name=_("Liked by Auth User"),
-        default=False
+    like_count = models.PositiveIntegerField(
+        _('Like count'),
+        default=0,
     )
-    is_disliked_by_auth_user = models.BooleanField(
-        verbose_name=_("Disliked by Auth User"),
-        default=False
+    dislike_count = models.PositiveIntegerField(
+        _('Dislike count'),
+        default=0,
     )
 
     def __str__(self):
         return self.comment
 
-    @property
-    def like_count(self):
-        try:
-            count = self.comment_like.user.count()
-        except CommentLike.DoesNotExist:
-            count = 0
-        return count
-
-    @property
-    def dislike_count(self):
-        try:
-            count = self.comment_dislike.user.count()
-        except CommentDislike.DoesNotExist:
-            count = 0
-        return count
-
     class Meta:
         verbose_name = _('Comment')
         verbose_name_plural = _('Comments')
@@ -446,104 +549,65 @@ class Feedback(models.Model):
         verbose_name_plural = _('Feedback')
 
 
-class PostLike(models.Model):
-    post = models.OneToOneField(
-        Post,
-        on_delete=models.CASCADE,
-        related_name='post_like',
-        verbose_name=_('Post'),
-    )
-    user = models.ManyToManyField(
-        USER,
-        verbose_name=_('User'),
-        blank=True,
-    )
-
-    # logs
-    created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
-
-    def __str__(self):
-        return "{}".format(self.post.title)
+class Reaction(models.Model):
+    """
+    Like or dislike given by a user to a Post or a Comment.
+    Every row has exactly one target, a user reacts to a target only once.
+    """
 
-    class Meta:
-        verbose_name = _('Post Like')
-        verbose_name_plural = _('Post Likes')
-
-
-class PostDislike(models.Model):
-    post = models.OneToOneField(
+    post = models.ForeignKey(
         Post,
         on_delete=models.CASCADE,
-        related_name='post_dislike',
         verbose_name=_('Post'),
-    )
-    user = models.ManyToManyField(
-        USER,
-        verbose_name=_('User'),
+        related_name='reactions',
+        null=True,
         blank=True,
     )
-
-    # logs
-    created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
-
-    def __str__(self):
-        return "{}".format(self.post.title)
-
-    class Meta:
-        verbose_name = _('Post Dislike')
-        verbose_name_plural = _('Post Dislikes')
-
-
-class CommentLike(models.Model):
-    comment = models.OneToOneField(
+    comment = models.ForeignKey(
         Comment,
         on_delete=models.CASCADE,
-        related_name='comment_like',
         verbose_name=_('Comment'),
-    )
-    user = models.ManyToManyField(
-        USER,
-        verbose_name=_('User'),
+        related_name='reactions',
+        null=True,
         blank=True,
     )
-
-    # logs
-    created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
-
-    def __str__(self):
-        return "{}".format(self.comment)
-
-    class Meta:
-        verbose_name = _('Comment Like')
-        verbose_name_plural = _('Comment Likes')
-
-
-class CommentDislike(models.Model):
-    comment = models.OneToOneField(
-        Comment,
-        on_delete=models.CASCADE,
-        related_name='comment_dislike',
-        verbose_name=_('Comment'),
-    )
-    user = models.ManyToManyField(
+    user = models.ForeignKey(
         USER,
+        on_delete=models.CASCADE,
         verbose_name=_('User'),
-        blank=True,
+        related_name='reactions',
+    )
+    value = models.SmallIntegerField(
+        _('Value'),
+        choices=REACTIONS,
     )
 
     # logs
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
-        return "{}".format(self.comment.comment)
+        return "{} - {}".format(self.get_value_display(), self.user)
 
     class Meta:
-        verbose_name = _('Comment Dislike')
-        verbose_name_plural = _('Comment Dislikes')
+        verbose_name = _('Reaction')
+        verbose_name_plural = _('Reactions')
+        constraints = [
+            models.UniqueConstraint(
+                fields=('post', 'user'),
+                name='unique_post_reaction',
+            ),
+            models.UniqueConstraint(
+                fields=('comment', 'user'),
+                name='unique_comment_reaction',
+            ),
+            models.CheckConstraint(
+                check=(
+                    models.Q(post__isnull=False, comment__isnull=True) |
+                    models.Q(post__isnull=True, comment__isnull=False)
+                ),
+                name='reaction_has_one_target',
+            ),
+        ]
 
 
 class ScreenShot(models.Model):
@@ -551,6 +615,12 @@ class ScreenShot(models.Model):
         _('Photo'),
         upload_to=user_directory_path,
     )
+    screenshot_variants = models.JSONField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text=_('Resized copies, see `photos.derivatives`'),
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     deleted_at = models.DateTimeField(auto_now_add=True)
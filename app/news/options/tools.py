@@ -1,4 +1,15 @@
 import re
+from django.db import IntegrityError, transaction
+from django.db.models import (
+    BigIntegerField,
+    Case,
+    Count,
+    Max,
+    Q,
+    Value,
+    When,
+)
+from django.db.models.functions import Cast, Substr
 from django.template.defaultfilters import slugify
 
 # ------------------------------ News Status ----------------------------------
@@ -47,6 +58,21 @@ CONTENT_TYPES = (
     (QUOTE, 'Quote'),
 )
 
+# ------------------------------ Reactions ------------------------------------
+
+LIKE = 1
+DISLIKE = -1
+
+REACTIONS = (
+    (LIKE, 'Like'),
+    (DISLIKE, 'Dislike'),
+)
+
+REACTION_COUNTERS = {
+    LIKE: 'like_count',
+    DISLIKE: 'dislike_count',
+}
+
 
 # ----------------------------- Tools -----------------------------------------
 
@@ -69,19 +95,88 @@ def to_e_alphabet(title):
     return title
 
 
-def generate_unique_slug(klass, field):
+# longest numeric suffix of a slug, `foo-123456789`
+SLUG_SUFFIX_DIGITS = 9
+# saves retried when a concurrent save takes the same slug
+SLUG_SAVE_ATTEMPTS = 3
+
+
+def generate_unique_slug(klass, field, exclude_pk=None):
     """
     return unique slug if origin slug is exist.
-    eg: `foo-bar` => `foo-bar-1`
+    eg: `foo-bar` => `foo-bar-1`, `foo-bar-1` => `foo-bar-2`
+
+    The slug with the highest suffix is found with one query, whatever
+    the number of existing variants.
 
     :param `klass` is Class model.
     :param `field` is specific field for title.
+    :param `exclude_pk` is the object getting the slug, its own slug is free
     """
     field = to_e_alphabet(field)
-    origin_slug = slugify(field)
-    unique_slug = origin_slug
-    numb = 1
-    while klass.objects.filter(slug=unique_slug).exists():
-        unique_slug = '%s-%d' % (origin_slug, numb)
-        numb += 1
-    return unique_slug
+    max_length = klass._meta.get_field('slug').max_length
+    origin_slug = slugify(field)[:max_length - SLUG_SUFFIX_DIGITS - 1]
+    origin_slug = origin_slug.strip('-')
+
+    suffix_start = len(origin_slug) + 2
+    pattern = r'^{}(-[0-9]{{1,{}}})?$'.format(
+        re.escape(origin_slug), SLUG_SUFFIX_DIGITS,
+    )
+    queryset = klass._default_manager.filter(slug__regex=pattern)
+    if exclude_pk is not None:
+        queryset = queryset.exclude(pk=exclude_pk)
+    found = queryset.aggregate(
+        taken=Count('pk', filter=Q(slug=origin_slug)),
+        suffix=Max(Case(
+            When(slug=origin_slug, then=Value(0)),
+            default=Cast(Substr('slug', suffix_start), BigIntegerField()),
+            output_field=BigIntegerField(),
+        )),
+    )
+
+    # `budget` is free even if `budget-2021` is taken
+    if not found['taken']:
+        return origin_slug
+    return '%s-%d' % (origin_slug, found['suffix'] + 1)
+
+
+class UniqueSlugMixin:
+    """
+    Model mixin keeping `slug` unique and in sync with `title`.
+
+    The slug is generated when it is empty, and regenerated when the title
+    changes, unless `custom_slug` is set. A save losing the slug to a
+    concurrent save is retried with the next free slug.
+    """
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super(UniqueSlugMixin, cls).from_db(db, field_names, values)
+        instance._saved_title = instance.__dict__.get('title')
+        return instance
+
+    def title_changed(self):
+        saved_title = getattr(self, '_saved_title', None)
+        return saved_title is not None and saved_title != self.title
+
+    def save(self, *args, **kwargs):
+        if self.slug and (self.custom_slug or not self.title_changed()):
+            super(UniqueSlugMixin, self).save(*args, **kwargs)
+            self._saved_title = self.title
+            return
+
+        klass = type(self)
+        for attempt in range(SLUG_SAVE_ATTEMPTS):
+            self.slug = generate_unique_slug(klass, self.title, self.pk)
+            try:
+                with transaction.atomic():
+                    super(UniqueSlugMixin, self).save(*args, **kwargs)
+            except IntegrityError:
+                slug_taken = klass._default_manager.filter(
+                    slug=self.slug
+                ).exclude(pk=self.pk).exists()
+                if not slug_taken or attempt == SLUG_SAVE_ATTEMPTS - 1:
+                    raise
+            else:
+                break
+        self._saved_title = self.title
@@ -0,0 +1,59 @@
+"""
+Publishing windows of posts.
+
+A post is shown to the public while it is open, approved and inside its
+publishing window, `publish_date <= now < end_date` (no `end_date`: for
+ever). The result is kept in `Post.is_live`, so public querysets filter
+on one flag covered by partial indexes, and cached responses stay valid
+until the flag changes.
+
+`Post.save` sets the flag. Time alone changes it at the boundaries of the
+windows, `sync_live_posts` (run by Celery beat every minute) flips the
+posts which crossed a boundary and invalidates the cached responses only
+when some did. Both of its lookups are bounded by partial indexes: the
+posts waiting for their publish date and the live posts with an end date.
+"""
+from django.db.models import Q
+from django.utils import timezone
+
+from core.utils.cache import bump_cache_version
+from .models import Post
+from .options.tools import OPEN
+
+
+def live_condition(now):
+    """ Posts shown to the public at `now`, see `Post.is_live_at` """
+
+    return Q(status=OPEN, is_approved=True, publish_date__lte=now) & (
+        Q(end_date__isnull=True) | Q(end_date__gt=now)
+    )
+
+
+def sync_live_posts(now=None):
+    """
+    Flip the live state of the posts whose window started or ended
+
+    :param now: moment to sync to, the current time by default
+    :return: (ids of the posts gone live, ids of the posts gone offline)
+    """
+    now = now or timezone.now()
+    live = live_condition(now)
+    started = list(Post.objects.filter(live, is_live=False).values_list(
+        'id', flat=True
+    ))
+    ended = list(Post.objects.filter(
+        is_live=True, end_date__lte=now
+    ).values_list('id', flat=True))
+
+    # the conditions are checked again, a post may be saved meanwhile
+    if started:
+        Post.objects.filter(live, id__in=started, is_live=False).update(
+            is_live=True, updated_at=now
+        )
+    if ended:
+        Post.objects.filter(id__in=ended, is_live=True).exclude(live).update(
+            is_live=False, updated_at=now
+        )
+    if started or ended:
+        bump_cache_version('posts')
+    return started, ended
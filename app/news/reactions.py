@@ -0,0 +1,145 @@
+"""
+Likes and dislikes of Posts and Comments.
+
+Reactions are rows of the `Reaction` table: (target, user, value).
+`Post` and `Comment` keep `like_count` and `dislike_count` columns, which
+are updated by the same statement that writes the reaction, so a reaction
+costs one round trip and reading the counts never touches the reaction
+table.
+"""
+from django.db import connection
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from core.signals import invalidate_reaction_target
+from .models import Post, Comment, Reaction
+from .options.tools import LIKE, DISLIKE, REACTION_COUNTERS
+from .trending import record_reaction
+
+# Reaction column pointing to the target of each model
+TARGET_FIELDS = {
+    Post: 'post',
+    Comment: 'comment',
+}
+
+# Insert the reaction or switch its value. `xmax = 0` is true for inserted
+# rows only, so an updated row had the opposite value. Nothing is returned
+# when the reaction already had the same value, so counters stay intact.
+UPSERT_SQL = """
+WITH changed AS (
+    INSERT INTO {reaction} ({target_column}, user_id, value, created_at)
+    VALUES (%(target)s, %(user)s, %(value)s, NOW())
+    ON CONFLICT ({target_column}, user_id)
+    DO UPDATE SET value = EXCLUDED.value
+    WHERE {reaction}.value <> EXCLUDED.value
+    RETURNING value, (xmax = 0) AS inserted
+)
+UPDATE {table} SET
+    like_count = GREATEST(like_count + CASE
+        WHEN changed.value = {like} THEN 1
+        WHEN NOT changed.inserted THEN -1
+        ELSE 0 END, 0),
+    dislike_count = GREATEST(dislike_count + CASE
+        WHEN changed.value = {dislike} THEN 1
+        WHEN NOT changed.inserted THEN -1
+        ELSE 0 END, 0)
+FROM changed
+WHERE {table}.id = %(target)s
+"""
+
+DELETE_SQL = """
+WITH removed AS (
+    DELETE FROM {reaction}
+    WHERE {target_column} = %(target)s AND user_id = %(user)s
+    RETURNING value
+)
+UPDATE {table} SET
+    like_count = GREATEST(like_count - CASE
+        WHEN removed.value = {like} THEN 1 ELSE 0 END, 0),
+    dislike_count = GREATEST(dislike_count - CASE
+        WHEN removed.value = {dislike} THEN 1 ELSE 0 END, 0)
+FROM removed
+WHERE {table}.id = %(target)s
+"""
+
+
+def _format(sql, model):
+    quote = connection.ops.quote_name
+    target_field = Reaction._meta.get_field(TARGET_FIELDS[model])
+    return sql.format(
+        reaction=quote(Reaction._meta.db_table),
+        table=quote(model._meta.db_table),
+        target_column=quote(target_field.column),
+        like=LIKE,
+        dislike=DISLIKE,
+    )
+
+
+def set_reaction(target, user, value):
+    """
+    Like (`LIKE`) or dislike (`DISLIKE`) a Post or a Comment by the user,
+    replacing the opposite reaction of the user. `None` removes the
+    reaction of the user. The reaction and the counters of the target are
+    written with a single statement.
+
+    :param target: Post or Comment object
+    :param user: the user who reacts
+    :param value: `LIKE`, `DISLIKE` or None
+    """
+    model = type(target)
+    sql = DELETE_SQL if value is None else UPSERT_SQL
+    with connection.cursor() as cursor:
+        cursor.execute(_format(sql, model), {
+            'target': target.pk,
+            'user': user.pk,
+            'value': value,
+        })
+        # a counter was updated: a new or switched reaction
+        changed = cursor.rowcount > 0
+    if changed and value is not None and model is Post:
+        record_reaction(target.pk)
+    invalidate_reaction_target(target)
+
+
+def reaction_count(target_field, value):
+    """
+    Subquery counting reactions with the given value
+    for the outer Post / Comment
+
+    :param target_field: `post` or `comment`
+    :param value: `LIKE` or `DISLIKE`
+    """
+    return Coalesce(Subquery(
+        Reaction.objects.filter(
+            **{target_field: OuterRef('pk'), 'value': value}
+        ).order_by().values(target_field).annotate(
+            total=Count('*')
+        ).values('total'),
+        output_field=IntegerField(),
+    ), 0)
+
+
+def reconcile_counters(model):
+    """
+    Recount likes and dislikes of every Post (or Comment) from the reaction
+    table and fix the counter columns which drifted, in bulk.
+
+    :param model: Post or Comment
+    :return: number of corrected rows
+    """
+    target_field = TARGET_FIELDS[model]
+    counters = {
+        REACTION_COUNTERS[value]: reaction_count(target_field, value)
+        for value in (LIKE, DISLIKE)
+    }
+
+    drifted = model.objects.annotate(
+        actual_likes=counters['like_count'],
+        actual_dislikes=counters['dislike_count'],
+    ).exclude(
+        like_count=F('actual_likes'),
+        dislike_count=F('actual_dislikes'),
+    )
+    return model.objects.filter(
+        pk__in=drifted.values('pk')
+    ).update(**counters)
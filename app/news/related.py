@@ -0,0 +1,94 @@
+"""
+Precomputed related posts.
+
+The related posts of a post are ranked once, in the background, and kept
+in `RelatedPosts`. The post detail endpoint reads the ranked ids and loads
+the posts by primary key instead of joining categories on every request.
+"""
+from django.db.models import Count
+
+from .models import Post, RelatedPosts
+
+RELATED_POSTS_COUNT = 12
+
+# The most recent posts sharing a category with a changed post are
+# re-ranked too, so a newly published post shows up in their lists.
+# Older lists catch up with the nightly rebuild.
+REFRESH_FANOUT = 50
+
+
+def published_posts():
+    return Post.objects.filter(is_live=True)
+
+
+def rank_related_posts(post, count=RELATED_POSTS_COUNT):
+    """
+    Ids of live posts sharing categories with the post,
+    ranked by the number of shared categories, then by publish date
+
+    :param post: Post object
+    :param count: number of ids to return
+    :return: list of Post ids
+    """
+    categories = list(post.category.values_list('id', flat=True))
+    if not categories:
+        return []
+
+    return list(published_posts().filter(
+        category__in=categories,
+    ).exclude(id=post.id).annotate(
+        shared=Count('category'),
+    ).order_by(
+        '-shared', '-publish_date', '-id',
+    ).values_list('id', flat=True)[:count])
+
+
+def build_related_posts(post):
+    """ Rank the related posts of the post and store them """
+
+    RelatedPosts.objects.update_or_create(
+        post=post, defaults={'post_ids': rank_related_posts(post)}
+    )
+
+
+def posts_to_refresh(post):
+    """
+    Posts whose related posts may change when the given post is
+    published, closed or recategorized: the post itself, the posts which
+    list it and the most recent posts sharing a category with it
+    """
+    listing = RelatedPosts.objects.filter(
+        post_ids__contains=[post.id]
+    ).values_list('post_id', flat=True)
+    neighbours = published_posts().filter(
+        category__in=post.category.all(),
+    ).exclude(id=post.id).order_by(
+        '-publish_date', '-id'
+    ).values_list('id', flat=True).distinct()[:REFRESH_FANOUT]
+
+    return Post.objects.filter(id__in=(
+        {post.id} | set(listing) | set(neighbours)
+    ))
+
+
+def get_related_posts(post, fields=()):
+    """
+    Related posts of the post from the precomputed index, in rank order.
+    Posts closed or unapproved since the index was built are skipped.
+
+    :param post: Post object, `related_index` is best selected with it
+    :param fields: if given, only these fields of the posts are loaded
+    :return: list of Post objects, empty if the index is not built yet
+    """
+    try:
+        post_ids = post.related_index.post_ids
+    except RelatedPosts.DoesNotExist:
+        return []
+    if not post_ids:
+        return []
+
+    queryset = published_posts().filter(id__in=post_ids)
+    if fields:
+        queryset = queryset.only(*fields)
+    posts = {related.id: related for related in queryset}
+    return [posts[pk] for pk in post_ids if pk in posts]
@@ -0,0 +1,94 @@
+"""
+Full-text search of posts with PostgreSQL.
+
+Every post keeps a `search_vector` (title, short description and the text
+of its contents, weighted in this order), indexed with GIN. The vector is
+rebuilt when the post or one of its contents is saved, and searched with
+a `SearchQuery` ranked by `SearchRank`.
+
+Azerbaijani has no PostgreSQL dictionary: documents and queries are
+parsed with the `simple` configuration (lowercasing, no stemming) after
+`to_e_alphabet`, so `xəbər` and `xeber` find the same posts.
+"""
+from collections import defaultdict
+
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    SearchVector,
+)
+from django.db.models import F, FloatField, TextField, Value
+from django.db.models.functions import Cast
+
+from .models import Content, Post
+from .options.tools import to_e_alphabet
+
+SEARCH_CONFIG = 'simple'
+
+# (field, weight) of the document of a post
+DOCUMENT_WEIGHTS = (
+    ('title', 'A'),
+    ('short_description', 'B'),
+    ('contents', 'C'),
+)
+
+
+def search_document(**texts):
+    """
+    Search vector of a post
+
+    :param texts: text of each field of `DOCUMENT_WEIGHTS`
+    """
+    vector = None
+    for field, weight in DOCUMENT_WEIGHTS:
+        part = SearchVector(
+            Value(to_e_alphabet(texts.get(field) or ''),
+                  output_field=TextField()),
+            weight=weight,
+            config=SEARCH_CONFIG,
+        )
+        vector = part if vector is None else vector + part
+    return vector
+
+
+def update_search_vectors(post_ids):
+    """
+    Rebuild the search vectors of the given posts,
+    with two reads and one update per post
+    """
+    post_ids = set(post_ids)
+    contents = defaultdict(list)
+    for post_id, title, text in Content.objects.filter(
+            post_id__in=post_ids,
+    ).order_by('ordering', 'id').values_list('post_id', 'title', 'text'):
+        contents[post_id].extend((title, text))
+
+    posts = Post.objects.filter(id__in=post_ids).values_list(
+        'id', 'title', 'short_description',
+    )
+    for post_id, title, short_description in posts:
+        Post.objects.filter(id=post_id).update(search_vector=search_document(
+            title=title,
+            short_description=short_description,
+            contents=' '.join(contents[post_id]),
+        ))
+
+
+def search_posts(queryset, query):
+    """
+    Posts of the queryset matching all words of the query,
+    annotated with their `rank`
+
+    :param queryset: Post queryset
+    :param query: text typed by the user, its words are searched as they
+        are: punctuation and operators (quotes, `-`, `or`) have no meaning,
+        `websearch_to_tsquery` needs PostgreSQL 11
+    """
+    search_query = SearchQuery(
+        to_e_alphabet(query), config=SEARCH_CONFIG, search_type='plain',
+    )
+    # `ts_rank` is a `real`: as a double precision the rank survives the
+    # round trip through a keyset cursor unchanged
+    return queryset.filter(search_vector=search_query).annotate(
+        rank=Cast(SearchRank(F('search_vector'), search_query), FloatField()),
+    )
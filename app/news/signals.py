@@ -1,38 +1,75 @@
-from django.db.models.signals import post_save
-from django.dispatch import receiver
-from .models import (
-    Post,
-    Comment,
-    PostLike,
-    PostDislike,
-    CommentLike,
-    CommentDislike,
+from django.db import transaction
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_init,
+    post_save,
 )
+from django.dispatch import Signal, receiver
+
+from .models import Content, Post
+from .search import update_search_vectors
+from .tasks import refresh_related_posts
+
+# Sent after the bulk writes of posts or contents (e.g. `news.contents`,
+# `news.publishing`), which send no model signals, with the model as
+# sender. The home page snapshot (see `public_api.signals`) listens.
+posts_changed = Signal()
+
+
+def schedule_related_posts_refresh(post_id):
+    transaction.on_commit(lambda: refresh_related_posts.delay(post_id))
+
+
+# fields of a post the related posts are ranked by, with its categories
+RANKING_FIELDS = ('is_live', 'publish_date')
+
+
+def ranking_state(post):
+    # a deferred field is not loaded, nor changed by the save
+    return tuple(post.__dict__.get(field) for field in RANKING_FIELDS)
+
+
+@receiver(post_init, sender=Post, dispatch_uid='remember_ranking_state')
+def remember_ranking_state(sender, instance, **kwargs):
+    instance._ranking_state = ranking_state(instance)
 
 
 @receiver(post_save, sender=Post,
-          dispatch_uid='create_post_like_dislike_tables')
-def create_post_like_dislike_tables(sender, created, **kwargs):
+          dispatch_uid='refresh_related_posts_on_save')
+def refresh_related_posts_on_save(sender, instance, created, **kwargs):
     """
-    As soon as a new Post object is created,
-     create its Post Like and Post Dislike objects
+    Publishing, approving or closing a post changes the related posts
+    of the post and of its neighbours. Saves changing none of
+    `RANKING_FIELDS` (e.g. editing the text) schedule nothing.
     """
+    state = ranking_state(instance)
+    if created or state != instance._ranking_state:
+        schedule_related_posts_refresh(instance.id)
+    instance._ranking_state = state
 
-    instance = kwargs.get('instance')
-    if created:
-        PostLike.objects.create(post=instance)
-        PostDislike.objects.create(post=instance)
 
+@receiver(m2m_changed, sender=Post.category.through,
+          dispatch_uid='refresh_related_posts_on_recategorize')
+def refresh_related_posts_on_recategorize(sender, instance, action, reverse,
+                                          **kwargs):
+    """ Changing categories of a post re-ranks its related posts """
+
+    if action in ('post_add', 'post_remove', 'post_clear') and not reverse:
+        schedule_related_posts_refresh(instance.id)
+
+
+@receiver(post_save, sender=Post, dispatch_uid='update_search_vector_of_post')
+def update_search_vector_of_post(sender, instance, update_fields, **kwargs):
+    if update_fields and not {'title', 'short_description'} & set(
+            update_fields):
+        return
+    update_search_vectors([instance.id])
 
-@receiver(post_save, sender=Comment,
-          dispatch_uid='create_comment_like_dislike_tables')
-def create_comment_like_dislike_tables(sender, created, **kwargs):
-    """
-    As soon as a new Comment object is created,
-     create its Comment Like and Comment Dislike objects
-    """
 
-    instance = kwargs.get('instance')
-    if created:
-        CommentLike.objects.create(comment=instance)
-        CommentDislike.objects.create(comment=instance)
+@receiver(post_save, sender=Content,
+          dispatch_uid='update_search_vector_on_content')
+@receiver(post_delete, sender=Content,
+          dispatch_uid='update_search_vector_on_content_delete')
+def update_search_vector_on_content(sender, instance, **kwargs):
+    update_search_vectors([instance.post_id])
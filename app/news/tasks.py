@@ -0,0 +1,74 @@
+from celery import shared_task
+
+from . import indexing, publishing, trending
+from .counters import COUNTED_MODELS, flush_views
+from .models import Post
+from .related import build_related_posts, posts_to_refresh, published_posts
+
+
+# views of posts also feed the trending ranking
+VIEW_LISTENERS = {
+    'news.post': trending.add_views,
+}
+
+
+@shared_task
+def flush_view_counters():
+    """
+    Apply buffered views of Posts and Stories, and buffered reactions
+    of Posts, to the database
+    """
+    for model in COUNTED_MODELS:
+        flush_views(model, on_flush=VIEW_LISTENERS.get(model))
+    trending.flush_reactions()
+
+
+@shared_task
+def refresh_related_posts(post_id):
+    """
+    Re-rank related posts affected by a published, closed or
+    recategorized post
+    """
+    post = Post.objects.filter(id=post_id).first()
+    if post is None:
+        return
+    for related in posts_to_refresh(post):
+        build_related_posts(related)
+
+
+@shared_task
+def rebuild_related_posts():
+    """ Re-rank related posts of every published post """
+
+    for post in published_posts().iterator():
+        build_related_posts(post)
+
+
+@shared_task
+def reindex_posts(batch_size=indexing.BATCH_SIZE, workers=indexing.WORKERS):
+    """ Rebuild the Elasticsearch index of posts and swap its alias """
+
+    return indexing.reindex_posts(batch_size=batch_size, workers=workers)
+
+
+@shared_task
+def rank_trending_posts():
+    """ Score the trending posts and cache the rankings """
+
+    trending.rank_trending_posts()
+
+
+@shared_task
+def sync_live_posts():
+    """
+    Publish the posts reaching their publish date and hide the posts
+    reaching their end date
+    """
+    started, ended = publishing.sync_live_posts()
+    if not (started or ended):
+        return
+    # imported here, the signals import the tasks of this module
+    from .signals import posts_changed
+    posts_changed.send(sender=Post)
+    for post_id in started + ended:
+        refresh_related_posts.delay(post_id)
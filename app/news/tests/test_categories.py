@@ -0,0 +1,92 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from news.categories import get_category_tree, get_descendant_ids
+from news.models import Category, Post
+
+USER = get_user_model()
+
+
+class CategoryTreeTests(TestCase):
+    """ Cached category tree """
+
+    def setUp(self):
+        cache.clear()
+        self.sport = Category.objects.create(title='Sport', ordering=2)
+        self.politics = Category.objects.create(title='Politics', ordering=1)
+        self.football = Category.objects.create(
+            title='Football', parent_category=self.sport,
+        )
+        self.league = Category.objects.create(
+            title='League', parent_category=self.football,
+        )
+
+    def test_tree_of_any_depth_with_one_query(self):
+        with self.assertNumQueries(1):
+            tree = get_category_tree()
+
+        self.assertEqual(
+            [node['title'] for node in tree], ['Politics', 'Sport']
+        )
+        football, = tree[1]['child_category']
+        self.assertEqual(football['title'], 'Football')
+        self.assertEqual(football['child_category'][0]['id'], self.league.id)
+
+    def test_tree_is_cached_until_a_category_changes(self):
+        get_category_tree()
+        with self.assertNumQueries(0):
+            get_category_tree()
+
+        self.league.title = 'Premier League'
+        self.league.save()
+
+        tree = get_category_tree()
+        league = tree[1]['child_category'][0]['child_category'][0]
+        self.assertEqual(league['title'], 'Premier League')
+
+    def test_descendants(self):
+        self.assertEqual(
+            get_descendant_ids(self.sport.id),
+            [self.sport.id, self.football.id, self.league.id],
+        )
+        self.assertEqual(get_descendant_ids(0), [])
+
+
+class CategoryFeedTests(APITestCase):
+    """ Category filtered feeds include the subcategories """
+
+    def setUp(self):
+        cache.clear()
+        author = USER.objects.create_user(email='author@user.com')
+        sport = Category.objects.create(title='Sport')
+        football = Category.objects.create(
+            title='Football', parent_category=sport,
+        )
+        politics = Category.objects.create(title='Politics')
+        self.sport = sport
+
+        self.both = Post.objects.create(
+            title='Both', author=author, is_approved=True,
+        )
+        self.both.category.add(sport, football)
+        self.football = Post.objects.create(
+            title='Football', author=author, is_approved=True,
+        )
+        self.football.category.add(football)
+        Post.objects.create(
+            title='Politics', author=author, is_approved=True,
+        ).category.add(politics)
+
+    def test_public_feed(self):
+        response = self.client.get(
+            reverse('public_api:public-post-list'),
+            {'category': self.sport.id},
+        )
+
+        self.assertEqual(
+            sorted(post['id'] for post in response.data['data']),
+            [self.both.id, self.football.id],
+        )
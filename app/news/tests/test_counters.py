@@ -0,0 +1,234 @@
+import multiprocessing
+
+from django.contrib.auth import get_user_model
+from django.db import connections
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from news.counters import (
+    RedisBuffer,
+    flush_views,
+    get_buffer,
+    record_view,
+    record_view_of,
+)
+from news.models import Post
+from news.tasks import flush_view_counters
+from stories.models import Story
+
+USER = get_user_model()
+
+
+def create_post(**payload):
+    return Post.objects.create(**payload)
+
+
+# counted in the memory of the test process, without queries
+@override_settings(VIEW_BUFFER='local')
+class ViewCounterTests(TestCase):
+    """ Buffered view counters for Posts and Stories """
+
+    def setUp(self):
+        # start every test with an empty buffer
+        flush_view_counters()
+
+        author = USER.objects.create_user(email='author@user.com')
+        self.first_post = create_post(title='First', author=author)
+        self.second_post = create_post(title='Second', author=author)
+        self.story = Story.objects.create(
+            title='Story', cover_photo='testurl.url'
+        )
+
+    def test_record_view_does_not_write_to_the_row(self):
+        with self.assertNumQueries(0):
+            record_view(self.first_post)
+
+        self.first_post.refresh_from_db()
+        self.assertEqual(self.first_post.views, 1)
+
+    def test_flush_applies_aggregated_views(self):
+        for _ in range(3):
+            record_view(self.first_post)
+        record_view(self.second_post)
+        record_view(self.story)
+
+        flush_view_counters()
+
+        self.first_post.refresh_from_db()
+        self.second_post.refresh_from_db()
+        self.story.refresh_from_db()
+        self.assertEqual(self.first_post.views, 4)
+        self.assertEqual(self.second_post.views, 2)
+        self.assertEqual(self.story.views, 1)
+
+        # hits are applied only once
+        flush_view_counters()
+        self.first_post.refresh_from_db()
+        self.assertEqual(self.first_post.views, 4)
+
+    def test_failed_flush_keeps_the_hits(self):
+        record_view(self.first_post)
+
+        def failing_apply(hits):
+            raise RuntimeError
+
+        with self.assertRaises(RuntimeError):
+            get_buffer().flush('news.post', failing_apply)
+
+        flush_views('news.post')
+        self.first_post.refresh_from_db()
+        self.assertEqual(self.first_post.views, 2)
+
+
+class PostRetrieveViewCountTests(APITestCase):
+    """ Post detail endpoint counts views without updating the Post """
+
+    def setUp(self):
+        flush_view_counters()
+        author = USER.objects.create_user(email='author@user.com')
+        self.post = create_post(
+            title='Test Post', author=author, is_approved=True
+        )
+        self.url = reverse(
+            'public_api:public-post-detail', kwargs={'pk': self.post.id}
+        )
+
+    def test_retrieve_is_read_only(self):
+        updated_at = self.post.updated_at
+
+        self.client.get(self.url)
+        self.client.get(self.url)
+
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.views, 1)
+        self.assertEqual(self.post.updated_at, updated_at)
+
+        flush_view_counters()
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.views, 3)
+
+
+def record_views_in_another_process(pk, count):
+    for _ in range(count):
+        record_view_of('news.post', pk)
+    connections.close_all()
+
+
+@override_settings(VIEW_BUFFER='database')
+class SharedViewBufferTests(TransactionTestCase):
+    """ Without Redis, views are buffered in the database """
+
+    def test_views_recorded_by_another_process_are_flushed(self):
+        author = USER.objects.create_user(email='author@user.com')
+        post = create_post(title='Post', author=author)
+        # the web process recording the views has its own connection
+        connections.close_all()
+        process = multiprocessing.get_context('fork').Process(
+            target=record_views_in_another_process, args=(post.id, 3),
+        )
+        process.start()
+        process.join()
+        self.assertEqual(process.exitcode, 0)
+
+        flush_view_counters()
+
+        post.refresh_from_db()
+        self.assertEqual(post.views, 4)
+
+
+@override_settings(VIEW_BUFFER='database')
+class DatabaseViewBufferTests(TestCase):
+
+    def test_failed_flush_keeps_the_hits(self):
+        author = USER.objects.create_user(email='author@user.com')
+        post = create_post(title='Post', author=author)
+        record_view(post)
+
+        def failing_apply(hits):
+            raise RuntimeError
+
+        with self.assertRaises(RuntimeError):
+            get_buffer().flush('news.post', failing_apply)
+
+        flush_views('news.post')
+        post.refresh_from_db()
+        self.assertEqual(post.views, 2)
+
+
+class FakeRedis:
+    """ The hash commands of Redis used by `RedisBuffer` """
+
+    def __init__(self):
+        self.hashes = {}
+
+    def exists(self, key):
+        return int(key in self.hashes)
+
+    def renamenx(self, key, new_key):
+        if new_key in self.hashes:
+            return False
+        self.hashes[new_key] = self.hashes.pop(key)
+        return True
+
+    def hincrby(self, key, field, amount):
+        fields = self.hashes.setdefault(key, {})
+        fields[str(field).encode()] = fields.get(
+            str(field).encode(), 0
+        ) + amount
+
+    def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+    def delete(self, key):
+        self.hashes.pop(key, None)
+
+    def pipeline(self):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    def __getattr__(self, name):
+        return lambda *args: self.commands.append((name, args))
+
+    def execute(self):
+        return [
+            getattr(self.redis, name)(*args) for name, args in self.commands
+        ]
+
+
+class RedisViewBufferTests(TestCase):
+
+    def setUp(self):
+        self.buffer = RedisBuffer(FakeRedis())
+        self.applied = []
+
+    def test_failed_flush_puts_the_hits_back(self):
+        self.buffer.incr('news.post', 1, 2)
+
+        def failing_apply(hits):
+            self.buffer.incr('news.post', 1)
+            raise RuntimeError
+
+        with self.assertRaises(RuntimeError):
+            self.buffer.flush('news.post', failing_apply)
+        self.buffer.flush('news.post', self.applied.append)
+
+        self.assertEqual(self.applied, [{1: 3}])
+
+    def test_hash_left_by_a_stopped_flush_is_applied_once(self):
+        self.buffer.incr('news.post', 1)
+        # stopped after the rename, before reading the hash
+        self.buffer.connection.renamenx('views:news.post',
+                                        'views:news.post:flushing')
+        self.buffer.incr('news.post', 2)
+
+        self.buffer.flush('news.post', self.applied.append)
+        self.buffer.flush('news.post', self.applied.append)
+        self.buffer.flush('news.post', self.applied.append)
+
+        self.assertEqual(self.applied, [{1: 1}, {2: 1}])
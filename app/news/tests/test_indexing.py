@@ -0,0 +1,150 @@
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from news.documents import PostDocument
+from news.indexing import (
+    REINDEX_LOCK_KEY,
+    IndexingError,
+    MemoryBackend,
+    index_posts,
+    iter_batches,
+    reindex_posts,
+)
+from news.models import Category, Content, Post
+
+USER = get_user_model()
+
+
+class RejectingBackend(MemoryBackend):
+    def bulk(self, index, documents):
+        super(RejectingBackend, self).bulk(index, documents)
+        return [{'index': {'_id': documents[0]['id'], 'status': 400}}]
+
+
+@override_settings(SEARCH_INDEX_BACKEND='news.indexing.MemoryBackend')
+class ReindexPostsTests(TestCase):
+    """ Bulk reindexing of posts with the in-process backend """
+
+    def setUp(self):
+        cache.clear()
+        MemoryBackend.reset()
+        self.author = USER.objects.create_user(
+            email='author@user.com', first_name='Ali', last_name='Aliyev',
+        )
+        self.sport = Category.objects.create(title='Sport')
+
+    def create_posts(self, count):
+        posts = []
+        for i in range(count):
+            post = Post.objects.create(
+                title='Post {}'.format(i), author=self.author,
+            )
+            post.category.add(self.sport)
+            Content.objects.create(
+                post=post, content_type='Text', title='Block', text='Text',
+            )
+            posts.append(post)
+        return posts
+
+    def test_documents(self):
+        post, = self.create_posts(1)
+
+        result = reindex_posts()
+
+        self.assertEqual(result['indexed'], 1)
+        document = MemoryBackend.documents('posts')[post.id]
+        self.assertEqual(document['title'], 'Post 0')
+        self.assertEqual(document['author'], 'Ali Aliyev')
+        self.assertEqual(document['category'], ['Sport'])
+        self.assertEqual(
+            [content['text'] for content in document['content']], ['Text']
+        )
+
+    def test_queries_per_batch(self):
+        queryset = PostDocument().get_queryset().order_by('id')
+        self.create_posts(3)
+        # a read of the cursor and a prefetch of categories and contents
+        with self.assertNumQueries(3):
+            list(iter_batches(queryset, batch_size=10))
+
+        self.create_posts(6)
+        with self.assertNumQueries(3):
+            list(iter_batches(queryset, batch_size=10))
+
+    def test_batches_across_workers(self):
+        self.create_posts(7)
+
+        result = reindex_posts(batch_size=2, workers=2)
+
+        self.assertEqual(result['indexed'], 7)
+        self.assertEqual(len(MemoryBackend.documents('posts')), 7)
+
+    def test_alias_is_swapped_to_the_new_index(self):
+        self.create_posts(1)
+        # index created before there was an alias
+        MemoryBackend().create_index('posts', {})
+
+        first = reindex_posts()['index']
+        self.assertEqual(MemoryBackend.aliases, {'posts': first})
+        self.assertNotIn('posts', MemoryBackend.indices)
+
+        second = reindex_posts()['index']
+        self.assertEqual(MemoryBackend.aliases, {'posts': second})
+        self.assertEqual(list(MemoryBackend.indices), [second])
+
+    def test_posts_deleted_while_indexing_are_not_kept(self):
+        posts = self.create_posts(3)
+        reindex_posts()
+
+        deleted = posts[0].id
+
+        def index_and_delete(*args, **kwargs):
+            result = index_posts(*args, **kwargs)
+            if Post.objects.filter(id=deleted).exists():
+                # deleted through the alias, from the previous index only
+                Post.objects.filter(id=deleted).delete()
+                MemoryBackend().delete_documents('posts', [deleted])
+            return result
+
+        with mock.patch('news.indexing.index_posts', index_and_delete):
+            result = reindex_posts()
+
+        self.assertEqual(result['indexed'], 3)
+        self.assertEqual(
+            sorted(MemoryBackend.documents('posts')),
+            [posts[1].id, posts[2].id],
+        )
+
+    @override_settings(SEARCH_INDEX_BACKEND='news.tests.test_indexing.'
+                                            'RejectingBackend')
+    def test_rejected_documents_keep_the_previous_index(self):
+        self.create_posts(1)
+        MemoryBackend.aliases['posts'] = 'posts-old'
+        MemoryBackend.indices['posts-old'] = {'body': {}, 'documents': {}}
+
+        with self.assertRaises(IndexingError) as context:
+            reindex_posts()
+
+        self.assertEqual(len(context.exception.errors), 1)
+        self.assertEqual(MemoryBackend.aliases, {'posts': 'posts-old'})
+        self.assertEqual(list(MemoryBackend.indices), ['posts-old'])
+        self.assertIsNone(cache.get(REINDEX_LOCK_KEY))
+
+    def test_one_reindex_at_a_time(self):
+        cache.set(REINDEX_LOCK_KEY, True)
+
+        with self.assertRaises(IndexingError):
+            reindex_posts()
+        self.assertEqual(MemoryBackend.indices, {})
+
+    def test_command(self):
+        self.create_posts(2)
+
+        call_command('reindex_posts', '--batch-size', '1', stdout=StringIO())
+
+        self.assertEqual(len(MemoryBackend.documents('posts')), 2)
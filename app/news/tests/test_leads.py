@@ -0,0 +1,66 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from news.leads import lead_contents
+from news.models import Content, Post
+from news.options.tools import GALLERY, MAIN_TEXT, TEXT
+from photos.models import Photo
+from public_api.serializers.news import PublicPostListModelSerializer
+
+USER = get_user_model()
+
+
+class LeadContentTests(APITestCase):
+    """ Post lists show the lead blocks of the posts only """
+
+    def setUp(self):
+        cache.clear()
+        self.author = USER.objects.create_user(email='author@user.com')
+        self.posts, self.leads = [], []
+        for i in range(3):
+            post = Post.objects.create(
+                title='Post {}'.format(i), author=self.author,
+                is_approved=True,
+            )
+            photo = Photo.objects.create(title='Photo', photo='photo.jpg')
+            blocks = [
+                Content.objects.create(post=post, content_type=content_type,
+                                       ordering=ordering, title=title,
+                                       photo=photo if with_photo else None)
+                for content_type, ordering, title, with_photo in (
+                    (TEXT, 1, 'Intro', False),
+                    (MAIN_TEXT, 2, 'Main', False),
+                    (GALLERY, 3, 'First gallery', True),
+                    (MAIN_TEXT, 4, 'Second main', False),
+                    (GALLERY, 5, 'Second gallery', True),
+                )
+            ]
+            self.posts.append(post)
+            self.leads.extend([blocks[1].id, blocks[2].id])
+
+    def test_lead_blocks_of_all_posts_with_one_query(self):
+        with self.assertNumQueries(1):
+            ids = list(lead_contents(Content.objects.all()).values_list(
+                'id', flat=True
+            ))
+
+        self.assertEqual(sorted(ids), sorted(self.leads))
+
+    def test_post_list(self):
+        response = self.client.get(reverse('public_api:public-post-list'))
+
+        for post in response.data['data']:
+            self.assertEqual(
+                [content['title'] for content in post['content']],
+                ['Main', 'First gallery'],
+            )
+
+    def test_lead_blocks_without_prefetch(self):
+        data = PublicPostListModelSerializer(self.posts[0]).data
+
+        self.assertEqual(
+            [content['title'] for content in data['content']],
+            ['Main', 'First gallery'],
+        )
@@ -0,0 +1,92 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from news.models import Post
+from news.publishing import sync_live_posts
+from news.tasks import sync_live_posts as sync_live_posts_task
+
+USER = get_user_model()
+
+POST_LIST_URL = reverse('public_api:public-post-list')
+
+
+class PublishingWindowTests(APITestCase):
+    """ Posts are public inside their publishing window only """
+
+    def setUp(self):
+        cache.clear()
+        self.author = USER.objects.create_user(email='author@user.com')
+        self.now = timezone.now()
+
+    def create_post(self, title, **payload):
+        payload.setdefault('is_approved', True)
+        return Post.objects.create(title=title, author=self.author, **payload)
+
+    def listed_ids(self):
+        response = self.client.get(POST_LIST_URL)
+        return [post['id'] for post in response.data['data']]
+
+    def test_live_state_is_set_on_save(self):
+        live = self.create_post('Live')
+        scheduled = self.create_post(
+            'Scheduled', publish_date=self.now + timedelta(hours=1),
+        )
+        ended = self.create_post('Ended', end_date=self.now)
+        unapproved = self.create_post('Unapproved', is_approved=False)
+
+        self.assertTrue(live.is_live)
+        self.assertFalse(scheduled.is_live)
+        self.assertFalse(ended.is_live)
+        self.assertFalse(unapproved.is_live)
+        self.assertEqual(self.listed_ids(), [live.id])
+
+    def test_saving_some_fields_updates_the_live_state(self):
+        post = self.create_post('Post')
+        post.status = 'Closed'
+        post.save(update_fields=['status'])
+
+        post.refresh_from_db()
+        self.assertFalse(post.is_live)
+
+    def test_posts_go_live_and_offline_at_the_boundaries(self):
+        scheduled = self.create_post(
+            'Scheduled', publish_date=self.now + timedelta(minutes=5),
+        )
+        ending = self.create_post(
+            'Ending', end_date=self.now + timedelta(minutes=10),
+        )
+        self.assertEqual(self.listed_ids(), [ending.id])
+
+        started, ended = sync_live_posts(self.now + timedelta(minutes=6))
+        self.assertEqual((started, ended), ([scheduled.id], []))
+        self.assertEqual(self.listed_ids(), [scheduled.id, ending.id])
+
+        started, ended = sync_live_posts(self.now + timedelta(minutes=11))
+        self.assertEqual((started, ended), ([], [ending.id]))
+        self.assertEqual(self.listed_ids(), [scheduled.id])
+
+    def test_window_ended_before_the_sync_is_skipped(self):
+        self.create_post(
+            'Missed', publish_date=self.now + timedelta(minutes=5),
+            end_date=self.now + timedelta(minutes=10),
+        )
+
+        self.assertEqual(sync_live_posts(self.now + timedelta(hours=1)),
+                         ([], []))
+
+    def test_cached_responses_stay_valid_between_boundaries(self):
+        self.create_post('Post')
+        self.create_post(
+            'Scheduled', publish_date=self.now + timedelta(hours=1),
+        )
+        self.listed_ids()
+
+        sync_live_posts_task()
+
+        with self.assertNumQueries(0):
+            self.listed_ids()
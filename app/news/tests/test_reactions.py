@@ -0,0 +1,83 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from news.models import Post, Comment, Reaction
+from news.options.tools import LIKE, DISLIKE
+from news.reactions import set_reaction
+
+USER = get_user_model()
+
+
+# trending hits counted in the memory of the test process
+@override_settings(VIEW_BUFFER='local')
+class ReactionCounterTests(TestCase):
+    """ Reactions and like / dislike counters of Posts and Comments """
+
+    def setUp(self):
+        self.user = USER.objects.create_user(email='user@user.com')
+        self.post = Post.objects.create(title='Post', author=self.user)
+        self.comment = Comment.objects.create(
+            post=self.post, commented_by=self.user, comment='comment'
+        )
+
+    def test_set_reaction_updates_counters(self):
+        set_reaction(self.post, self.user, LIKE)
+        set_reaction(self.post, self.user, LIKE)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.like_count, 1)
+        self.assertEqual(self.post.dislike_count, 0)
+
+        set_reaction(self.post, self.user, DISLIKE)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.like_count, 0)
+        self.assertEqual(self.post.dislike_count, 1)
+
+        set_reaction(self.comment, self.user, DISLIKE)
+        self.comment.refresh_from_db()
+        self.assertEqual(self.comment.dislike_count, 1)
+
+    def test_reaction_costs_one_query(self):
+        with self.assertNumQueries(1):
+            set_reaction(self.post, self.user, LIKE)
+        with self.assertNumQueries(1):
+            set_reaction(self.post, self.user, DISLIKE)
+
+        # the like was switched, not duplicated
+        reactions = Reaction.objects.filter(post=self.post, user=self.user)
+        self.assertEqual(list(reactions.values_list('value', flat=True)),
+                         [DISLIKE])
+
+    def test_removing_reaction_updates_counters(self):
+        set_reaction(self.comment, self.user, LIKE)
+        set_reaction(self.comment, self.user, None)
+        # removing a missing reaction changes nothing
+        set_reaction(self.comment, self.user, None)
+
+        self.comment.refresh_from_db()
+        self.assertEqual(self.comment.like_count, 0)
+        self.assertEqual(self.comment.dislike_count, 0)
+        self.assertFalse(self.comment.reactions.exists())
+
+    def test_reconcile_command_fixes_drifted_counters(self):
+        other_user = USER.objects.create_user(email='other@user.com')
+        set_reaction(self.post, self.user, LIKE)
+        # reactions written around the counters
+        Reaction.objects.create(post=self.post, user=other_user, value=LIKE)
+        Reaction.objects.create(
+            comment=self.comment, user=self.user, value=DISLIKE
+        )
+        Post.objects.filter(pk=self.post.pk).update(dislike_count=5)
+
+        out = StringIO()
+        call_command('reconcile_reaction_counters', stdout=out)
+
+        self.post.refresh_from_db()
+        self.comment.refresh_from_db()
+        self.assertEqual(self.post.like_count, 2)
+        self.assertEqual(self.post.dislike_count, 0)
+        self.assertEqual(self.comment.like_count, 0)
+        self.assertEqual(self.comment.dislike_count, 1)
+        self.assertIn('1 counter(s) corrected', out.getvalue())
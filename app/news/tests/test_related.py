@@ -0,0 +1,170 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from news.models import Category, Post, RelatedPosts
+from news.related import get_related_posts, rank_related_posts
+from news.tasks import rebuild_related_posts, refresh_related_posts
+
+USER = get_user_model()
+
+
+def create_post(categories=(), days_ago=0, **payload):
+    payload.setdefault('is_approved', True)
+    post = Post.objects.create(
+        publish_date=timezone.now() - timedelta(days=days_ago), **payload
+    )
+    post.category.add(*categories)
+    return post
+
+
+class RelatedPostsIndexTests(TestCase):
+    """ Background built related posts of a post """
+
+    def setUp(self):
+        self.author = USER.objects.create_user(email='author@user.com')
+        self.sport = Category.objects.create(title='Sport')
+        self.politics = Category.objects.create(title='Politics')
+        self.post = create_post(
+            title='Post', author=self.author,
+            categories=(self.sport, self.politics),
+        )
+
+    def test_ranked_by_shared_categories_then_recency(self):
+        old_both = create_post(
+            title='Old both', author=self.author, days_ago=10,
+            categories=(self.sport, self.politics),
+        )
+        new_sport = create_post(
+            title='New sport', author=self.author, days_ago=1,
+            categories=(self.sport,),
+        )
+        older_sport = create_post(
+            title='Older sport', author=self.author, days_ago=5,
+            categories=(self.sport,),
+        )
+        # never related
+        create_post(
+            title='Closed', author=self.author, status='Closed',
+            categories=(self.sport,),
+        )
+        create_post(
+            title='Not approved', author=self.author, is_approved=False,
+            categories=(self.sport,),
+        )
+        create_post(title='Other', author=self.author)
+
+        self.assertEqual(
+            rank_related_posts(self.post),
+            [old_both.id, new_sport.id, older_sport.id],
+        )
+
+    def test_refresh_updates_the_post_and_its_neighbours(self):
+        neighbour = create_post(
+            title='Neighbour', author=self.author, days_ago=1,
+            categories=(self.sport,),
+        )
+        rebuild_related_posts()
+        self.assertEqual(
+            RelatedPosts.objects.get(post=neighbour).post_ids, [self.post.id]
+        )
+
+        new_post = create_post(
+            title='New', author=self.author, categories=(self.sport,),
+        )
+        refresh_related_posts(new_post.id)
+
+        self.assertEqual(
+            RelatedPosts.objects.get(post=new_post).post_ids,
+            [self.post.id, neighbour.id],
+        )
+        self.assertEqual(
+            RelatedPosts.objects.get(post=neighbour).post_ids,
+            [new_post.id, self.post.id],
+        )
+
+        # a closed post is dropped from the lists which contain it
+        new_post.status = 'Closed'
+        new_post.save()
+        refresh_related_posts(new_post.id)
+        self.assertEqual(
+            RelatedPosts.objects.get(post=neighbour).post_ids, [self.post.id]
+        )
+
+    def test_refresh_is_scheduled_when_the_ranking_changes(self):
+        post = Post.objects.get(id=self.post.id)
+
+        with mock.patch(
+                'news.signals.schedule_related_posts_refresh'
+        ) as schedule:
+            post.title = 'Edited'
+            post.save()
+            schedule.assert_not_called()
+
+            post.status = 'Closed'
+            post.save()
+            schedule.assert_called_once_with(post.id)
+
+    def test_missing_index_returns_no_posts(self):
+        create_post(
+            title='Neighbour', author=self.author, categories=(self.sport,),
+        )
+        self.assertEqual(get_related_posts(self.post), [])
+
+
+class RelatedPostsDetailApiTests(APITestCase):
+    """ Post detail endpoint reads related posts from the index """
+
+    def setUp(self):
+        author = USER.objects.create_user(email='author@user.com')
+        self.category = Category.objects.create(title='Sport')
+        self.post = create_post(
+            title='Post', author=author, categories=(self.category,)
+        )
+        self.author = author
+        self.url = reverse(
+            'public_api:public-post-detail', kwargs={'pk': self.post.id}
+        )
+
+    def add_related_posts(self, count):
+        for i in range(count):
+            create_post(
+                title='Related {}'.format(i), author=self.author,
+                days_ago=i + 1, categories=(self.category,),
+            )
+        refresh_related_posts(self.post.id)
+
+    def get_detail(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+        return response, len(queries)
+
+    def test_related_posts_are_lightweight_and_ranked(self):
+        self.add_related_posts(3)
+
+        response, _ = self.get_detail()
+
+        related = response.data['related_posts_list']
+        self.assertEqual(
+            [post['title'] for post in related],
+            ['Related 0', 'Related 1', 'Related 2'],
+        )
+        self.assertEqual(set(related[0]), {
+            'id', 'title', 'slug', 'title_type', 'publish_date', 'views',
+        })
+
+    def test_query_count_does_not_grow_with_related_posts(self):
+        self.add_related_posts(2)
+        _, few_posts = self.get_detail()
+
+        self.add_related_posts(10)
+        _, many_posts = self.get_detail()
+
+        self.assertEqual(few_posts, many_posts)
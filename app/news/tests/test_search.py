@@ -0,0 +1,94 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from news.contents import save_post_contents
+from news.models import Content, Post
+from news.search import search_posts
+
+USER = get_user_model()
+
+SEARCH_URL = reverse('public_api:public-post-search')
+
+
+class PostSearchTests(APITestCase):
+    """ Full-text search of posts """
+
+    def setUp(self):
+        cache.clear()
+        self.author = USER.objects.create_user(email='author@user.com')
+
+    def create_post(self, title, text='', **payload):
+        payload.setdefault('is_approved', True)
+        post = Post.objects.create(title=title, author=self.author, **payload)
+        if text:
+            Content.objects.create(
+                post=post, content_type='Text', title='Block', text=text,
+            )
+        return post
+
+    def search(self, query):
+        return [
+            post.title for post in search_posts(Post.objects.all(), query)
+            .order_by('-rank', '-id')
+        ]
+
+    def test_title_ranks_above_contents(self):
+        self.create_post('Weather', text='Football match was postponed')
+        self.create_post('Football match')
+        self.create_post('Elections')
+
+        self.assertEqual(
+            self.search('football'), ['Football match', 'Weather']
+        )
+
+    def test_azerbaijani_letters_are_normalized(self):
+        self.create_post('Son xəbərlər')
+        self.create_post('Qısa xeberler')
+
+        self.assertEqual(len(self.search('xeberler')), 2)
+        self.assertEqual(len(self.search('XƏBƏRLƏR')), 2)
+        self.assertEqual(self.search('qisa'), ['Qısa xeberler'])
+
+    def test_operators_are_searched_as_words(self):
+        self.create_post('Football match')
+        self.create_post('Football')
+
+        self.assertEqual(self.search('"football" -match'), ['Football match'])
+        self.assertEqual(self.search('football & (match'), ['Football match'])
+
+    def test_vector_follows_changes(self):
+        post = self.create_post('Weather', text='Sunny')
+        self.assertEqual(self.search('sunny'), ['Weather'])
+
+        save_post_contents(post, [{'title': 'Block', 'text': 'Rainy'}])
+        self.assertEqual(self.search('sunny'), [])
+        self.assertEqual(self.search('rainy'), ['Weather'])
+
+        post.title = 'Forecast'
+        post.save()
+        self.assertEqual(self.search('forecast'), ['Forecast'])
+
+    def test_endpoint_pages_through_results(self):
+        for i in range(5):
+            self.create_post('Football {}'.format(i), text='football ' * i)
+        self.create_post('Football closed', status='Closed')
+
+        titles, url = [], SEARCH_URL + '?q=football&page_size=2'
+        while url:
+            response = self.client.get(url)
+            titles.extend(post['title'] for post in response.data['data'])
+            url = response.data['next']
+
+        # the more often the word, the higher the rank
+        self.assertEqual(
+            titles, ['Football {}'.format(i) for i in range(4, -1, -1)]
+        )
+
+    def test_empty_query(self):
+        self.create_post('Football')
+
+        response = self.client.get(SEARCH_URL)
+
+        self.assertEqual(response.data['data'], [])
@@ -0,0 +1,101 @@
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from unittest import mock
+
+from news.models import Post
+from news.options import tools
+from news.options.tools import generate_unique_slug
+
+USER = get_user_model()
+
+
+class UniqueSlugTests(TestCase):
+    """ Slugs of posts are unique and follow the title """
+
+    def setUp(self):
+        self.author = USER.objects.create_user(email='author@user.com')
+
+    def create_post(self, title='Foo bar', **payload):
+        return Post.objects.create(title=title, author=self.author, **payload)
+
+    def test_next_free_suffix(self):
+        self.assertEqual(self.create_post().slug, 'foo-bar')
+        self.assertEqual(self.create_post().slug, 'foo-bar-1')
+        self.assertEqual(self.create_post().slug, 'foo-bar-2')
+        # other prefixes are not variants
+        self.create_post(title='Foo bar baz')
+        self.assertEqual(self.create_post().slug, 'foo-bar-3')
+
+    def test_titles_ending_in_numbers(self):
+        self.assertEqual(self.create_post('Budget 2021').slug, 'budget-2021')
+        # the number of a title is not a suffix of a taken slug
+        self.assertEqual(self.create_post('Budget').slug, 'budget')
+        self.assertEqual(self.create_post('Budget 2021').slug,
+                         'budget-2021-1')
+
+    def test_transliterated_title(self):
+        post = self.create_post(title='Xəbər')
+        self.assertEqual(post.slug, 'xeber')
+
+        # saving the same title keeps the slug
+        post.save()
+        self.assertEqual(post.slug, 'xeber')
+        post = Post.objects.get(pk=post.pk)
+        post.save()
+        self.assertEqual(post.slug, 'xeber')
+
+    def test_slug_follows_title_changes(self):
+        self.create_post()
+        post = self.create_post()
+        self.assertEqual(post.slug, 'foo-bar-1')
+
+        post = Post.objects.get(pk=post.pk)
+        post.save()
+        self.assertEqual(post.slug, 'foo-bar-1')
+
+        post.title = 'New title'
+        post.save()
+        self.assertEqual(post.slug, 'new-title')
+
+    def test_custom_slug_is_kept(self):
+        post = self.create_post(slug='custom', custom_slug=True)
+
+        post.title = 'New title'
+        post.save()
+
+        self.assertEqual(post.slug, 'custom')
+
+    def test_constant_queries_per_save(self):
+        def save_cost():
+            with CaptureQueriesContext(connection) as queries:
+                self.create_post()
+            return len(queries)
+
+        first = save_cost()
+        for _ in range(50):
+            self.create_post()
+        self.assertEqual(save_cost(), first)
+
+        with self.assertNumQueries(1):
+            generate_unique_slug(Post, 'Foo bar')
+
+    def test_concurrent_save_is_retried(self):
+        self.create_post()
+        # a concurrent save took the slug found free by this one
+        self.create_post(slug='foo-bar-1', custom_slug=True)
+        slugs = iter(['foo-bar-1', 'foo-bar-2'])
+
+        with mock.patch.object(tools, 'generate_unique_slug',
+                               side_effect=lambda *args: next(slugs)):
+            post = self.create_post()
+
+        self.assertEqual(post.slug, 'foo-bar-2')
+        self.assertEqual(
+            Post.objects.filter(slug__startswith='foo-bar').count(), 3
+        )
+
+    def test_other_integrity_errors_are_raised(self):
+        with self.assertRaises(IntegrityError):
+            Post.objects.create(title='Foo bar', author=None)
@@ -0,0 +1,108 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from news.counters import record_view
+from news.models import Category, Post, PostActivity
+from news.options.tools import DISLIKE, LIKE
+from news.reactions import set_reaction
+from news.tasks import flush_view_counters
+from news.trending import (
+    WINDOW_HOURS,
+    add_activity,
+    get_trending_ids,
+    rank_trending_posts,
+)
+
+USER = get_user_model()
+
+TRENDING_URL = reverse('public_api:public-post-trending')
+
+
+class TrendingPostsTests(APITestCase):
+    """ Time-decayed trending rankings """
+
+    def setUp(self):
+        cache.clear()
+        # start every test with empty buffers
+        flush_view_counters()
+        self.user = USER.objects.create_user(email='author@user.com')
+
+    def create_post(self, title, **payload):
+        payload.setdefault('is_approved', True)
+        return Post.objects.create(title=title, author=self.user, **payload)
+
+    def hours_ago(self, hours):
+        return timezone.now() - timezone.timedelta(hours=hours)
+
+    def test_buffered_views_and_reactions_fill_the_buckets(self):
+        post = self.create_post('Post')
+        record_view(post)
+        record_view(post)
+        set_reaction(post, self.user, LIKE)
+        # the same reaction again is not counted, a switched one is
+        set_reaction(post, self.user, LIKE)
+        set_reaction(post, self.user, DISLIKE)
+
+        flush_view_counters()
+
+        activity = PostActivity.objects.get(post=post)
+        self.assertEqual((activity.views, activity.reactions), (2, 2))
+
+    def test_older_activity_decays(self):
+        old = self.create_post('Old')
+        new = self.create_post('New')
+        closed = self.create_post('Closed', status='Closed')
+        add_activity({old.id: 100}, 'views', hour=self.hours_ago(25))
+        add_activity({old.id: 1, new.id: 30}, 'views')
+        add_activity({closed.id: 1000}, 'views')
+
+        self.assertEqual(get_trending_ids(), [new.id, old.id])
+
+    def test_buckets_leaving_the_window_are_deleted(self):
+        post = self.create_post('Post')
+        add_activity({post.id: 100}, 'views',
+                     hour=self.hours_ago(WINDOW_HOURS + 1))
+
+        rankings = rank_trending_posts()
+
+        self.assertEqual(rankings['posts'], [])
+        self.assertFalse(PostActivity.objects.exists())
+
+    def test_category_ranking_includes_subcategories(self):
+        sport = Category.objects.create(title='Sport')
+        football = Category.objects.create(
+            title='Football', parent_category=sport,
+        )
+        first = self.create_post('First')
+        first.category.add(sport, football)
+        second = self.create_post('Second')
+        second.category.add(football)
+        other = self.create_post('Other')
+        add_activity({first.id: 10, second.id: 20, other.id: 30}, 'views')
+
+        self.assertEqual(get_trending_ids(sport.id), [second.id, first.id])
+        self.assertEqual(get_trending_ids(sport.id, count=1), [second.id])
+
+    def test_endpoint_reads_the_rankings(self):
+        first = self.create_post('First')
+        second = self.create_post('Second')
+        add_activity({first.id: 10}, 'views')
+        rank_trending_posts()
+
+        response = self.client.get(TRENDING_URL)
+        self.assertEqual(
+            [post['id'] for post in response.data], [first.id]
+        )
+
+        add_activity({second.id: 20}, 'views')
+        rank_trending_posts()
+
+        with self.assertNumQueries(3):
+            # the posts, their categories and contents
+            response = self.client.get(TRENDING_URL)
+        self.assertEqual(
+            [post['id'] for post in response.data], [second.id, first.id]
+        )
@@ -0,0 +1,198 @@
+"""
+Trending posts.
+
+Views of posts (applied from the view buffer, see `news.counters`) and new
+reactions (buffered the same way) are added to hourly `PostActivity`
+buckets. `rank_trending_posts` periodically scores every post with
+activity in the last `WINDOW_HOURS` with one aggregate query:
+
+    score = sum over the buckets of the post of
+            (views + REACTION_WEIGHT * reactions)
+            * 0.5 ** (age of the bucket in hours / HALF_LIFE_HOURS)
+
+and caches the rankings (of all posts and of the posts of every
+category), sorted by score, so a trending feed is read without scanning
+posts.
+"""
+import heapq
+
+from django.core.cache import cache
+from django.db import connection
+from django.utils import timezone
+
+from core.utils.cache import bump_cache_version
+from .categories import get_descendant_ids
+from .counters import get_buffer
+from .models import Post, PostActivity
+
+# a view half as old counts half as much
+HALF_LIFE_HOURS = 12
+# buckets older than this are ignored and deleted
+WINDOW_HOURS = 72
+# a like or a dislike counts as much as this many views
+REACTION_WEIGHT = 5
+# posts kept in every ranking
+TRENDING_SIZE = 100
+
+REACTIONS_BUFFER = 'news.post:reactions'
+TRENDING_KEY = 'trending-posts'
+
+# Add the hits of many posts to their buckets of the hour in one
+# statement. Hits of deleted posts are dropped.
+ADD_ACTIVITY_SQL = """
+INSERT INTO {activity} (post_id, hour, views, reactions)
+SELECT hits.post_id, %(hour)s, hits.views, hits.reactions
+FROM UNNEST(%(post_ids)s::integer[], %(views)s::integer[],
+            %(reactions)s::integer[]) AS hits (post_id, views, reactions)
+WHERE EXISTS (SELECT 1 FROM {post} WHERE {post}.id = hits.post_id)
+ON CONFLICT (post_id, hour) DO UPDATE SET
+    views = {activity}.views + EXCLUDED.views,
+    reactions = {activity}.reactions + EXCLUDED.reactions
+"""
+
+SCORE_SQL = """
+SELECT activity.post_id, SUM(
+    (activity.views + %(reaction_weight)s * activity.reactions)
+    * POWER(0.5, EXTRACT(EPOCH FROM %(now)s - activity.hour)
+                 / 3600 / %(half_life)s)
+) AS score
+FROM {activity} activity
+INNER JOIN {post} post ON post.id = activity.post_id
+WHERE activity.hour >= %(since)s
+    AND post.is_live
+GROUP BY activity.post_id
+ORDER BY score DESC, activity.post_id DESC
+"""
+
+
+def _format(sql):
+    quote = connection.ops.quote_name
+    return sql.format(
+        activity=quote(PostActivity._meta.db_table),
+        post=quote(Post._meta.db_table),
+    )
+
+
+def add_activity(hits, field, hour=None):
+    """
+    Add views or reactions to the buckets of the hour
+
+    :param hits: dict of {post id: number of views or reactions}
+    :param field: `views` or `reactions`
+    :param hour: any time of the hour, now by default
+    """
+    if not hits:
+        return
+    hour = (hour or timezone.now()).replace(minute=0, second=0, microsecond=0)
+    post_ids = list(hits)
+    amounts = [hits[pk] for pk in post_ids]
+    zeros = [0] * len(post_ids)
+    with connection.cursor() as cursor:
+        cursor.execute(_format(ADD_ACTIVITY_SQL), {
+            'hour': hour,
+            'post_ids': post_ids,
+            'views': amounts if field == 'views' else zeros,
+            'reactions': amounts if field == 'reactions' else zeros,
+        })
+
+
+def add_views(hits):
+    """ Add views flushed from the view buffer """
+
+    add_activity(hits, 'views')
+
+
+def record_reaction(post_id):
+    """ Buffer a new like or dislike of a post (see `news.counters`) """
+
+    get_buffer().incr(REACTIONS_BUFFER, int(post_id))
+
+
+def flush_reactions():
+    """ Add the buffered reactions to the buckets """
+
+    get_buffer().flush(
+        REACTIONS_BUFFER, lambda hits: add_activity(hits, 'reactions')
+    )
+
+
+def score_posts(now=None):
+    """
+    :return: list of (post id, score) of live posts with
+        activity in the window, highest score first
+    """
+    now = now or timezone.now()
+    with connection.cursor() as cursor:
+        cursor.execute(_format(SCORE_SQL), {
+            'now': now,
+            'since': now - timezone.timedelta(hours=WINDOW_HOURS),
+            'half_life': HALF_LIFE_HOURS,
+            'reaction_weight': REACTION_WEIGHT,
+        })
+        return cursor.fetchall()
+
+
+def rank_trending_posts(now=None):
+    """
+    Score the posts, cache the rankings and delete the buckets which
+    left the window
+
+    :return: the rankings:
+        {
+            "posts": [(post id, score), ...],
+            "categories": {category id: [(post id, score), ...]}
+        }
+    """
+    now = now or timezone.now()
+    scores = score_posts(now)
+
+    categories = {}
+    memberships = Post.category.through.objects.filter(
+        post_id__in=[post_id for post_id, _ in scores]
+    ).values_list('post_id', 'category_id')
+    post_categories = {}
+    for post_id, category_id in memberships:
+        post_categories.setdefault(post_id, []).append(category_id)
+    for post_id, score in scores:
+        for category_id in post_categories.get(post_id, ()):
+            ranking = categories.setdefault(category_id, [])
+            if len(ranking) < TRENDING_SIZE:
+                ranking.append((post_id, score))
+
+    rankings = {'posts': scores[:TRENDING_SIZE], 'categories': categories}
+    cache.set(TRENDING_KEY, rankings, None)
+    bump_cache_version('trending')
+
+    PostActivity.objects.filter(
+        hour__lt=now - timezone.timedelta(hours=WINDOW_HOURS)
+    ).delete()
+    return rankings
+
+
+def get_trending_ids(category_id=None, count=10):
+    """
+    Ids of the trending posts, ranked when there is no ranking yet
+
+    :param category_id: only posts of the category and its subcategories
+    :param count: number of ids
+    """
+    rankings = cache.get(TRENDING_KEY)
+    if rankings is None:
+        rankings = rank_trending_posts()
+
+    if category_id is None:
+        ranked = rankings['posts']
+    else:
+        # a post may rank in several subcategories
+        ranked = heapq.merge(*(
+            rankings['categories'].get(pk, ())
+            for pk in get_descendant_ids(category_id)
+        ), key=lambda item: -item[1])
+
+    ids = []
+    for post_id, _ in ranked:
+        if post_id not in ids:
+            ids.append(post_id)
+            if len(ids) == count:
+                break
+    return ids
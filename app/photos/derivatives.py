@@ -0,0 +1,246 @@
+"""
+Resized copies of uploaded images.
+
+Originals are served as uploaded, often several megabytes. After an image
+is saved, `build_variants` (run by a Celery worker, see `photos.signals`)
+renders a square thumbnail and WebP copies of smaller widths with Pillow,
+stores them next to the original and keeps their paths and dimensions in
+the `<field>_variants` column of the row:
+
+    {
+        "source": "blobs/3a/7b/3a7b...4f1b.jpg",
+        "width": 4000,
+        "height": 3000,
+        "variants": {
+            "thumbnail": {"path": "...", "width": 160, "height": 160},
+            "480w": {"path": "...", "width": 480, "height": 360},
+            ...
+        }
+    }
+
+A file which is not an image (e.g. an SVG logo) gets no variants and is
+served as uploaded. The column is cleared when the file is replaced, so it
+never describes another file.
+
+Variants are files derived from a blob of the content-addressed storage
+(see `core.utils.storage`), deleted with it. An image uploaded before the
+storage was content-addressed is stored as a blob first, the row then
+references the blob. Blob URLs are cached for ever: the name of a variant
+contains its size and quality, a variant of other settings gets another
+name instead of replacing the file.
+
+`backfill_variants` builds the variants of the existing media in parallel
+worker processes, Pillow holds the GIL while resizing.
+"""
+import multiprocessing
+import posixpath
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import connections, transaction
+from PIL import Image, ImageOps
+
+from core.blobs import add_references
+from core.utils.cache import bump_cache_version
+from core.utils.storage import DERIVED_ROOT, is_blob
+
+THUMBNAIL_SIZE = 160
+WIDTHS = (480, 960, 1600)
+FORMAT = 'WEBP'
+EXTENSION = 'webp'
+QUALITY = 80
+
+# EXIF orientations displaying the image rotated by 90 degrees
+ORIENTATION = 0x0112
+TRANSPOSED = (5, 6, 7, 8)
+
+BATCH_SIZE = 50
+WORKERS = 4
+
+# model => (image field, versions of the responses showing the image)
+IMAGE_FIELDS = {
+    'photos.photo': ('photo', ('photos', 'posts')),
+    'news.screenshot': ('screenshot', ()),
+    settings.AUTH_USER_MODEL.lower(): ('avatar', ('posts',)),
+    'core.settings': ('logo', ('settings',)),
+}
+
+
+def variants_field(field_name):
+    return '{}_variants'.format(field_name)
+
+
+def variant_path(source, name):
+    """
+    :return: `blobs/3a/7b/variants/3a7b...4f1b-480w-q80.webp`
+        for the `480w` variant of `blobs/3a/7b/3a7b...4f1b.jpg`
+    """
+    directory, filename = posixpath.split(source)
+    stem = posixpath.splitext(filename)[0]
+    if name == 'thumbnail':
+        name = 'thumbnail{}'.format(THUMBNAIL_SIZE)
+    return posixpath.join(directory, DERIVED_ROOT, '{}-{}-q{}.{}'.format(
+        stem, name, QUALITY, EXTENSION
+    ))
+
+
+def render_variants(file):
+    """
+    Thumbnail and copies of the smaller widths of an image
+
+    :param file: file object of the image
+    :return: (width, height, {name: PIL image}), the dimensions of the
+        original as displayed (EXIF orientation applied)
+    :raise OSError: the file is not a readable image
+    """
+    with Image.open(file) as image:
+        width, height = image.size
+        if image.getexif().get(ORIENTATION) in TRANSPOSED:
+            width, height = height, width
+        # JPEGs are decoded at a reduced scale when the largest copy allows
+        largest = max([w for w in WIDTHS if w < max(width, height)],
+                      default=THUMBNAIL_SIZE)
+        image.draft('RGB', (largest, largest))
+        image = ImageOps.exif_transpose(image)
+        if image.mode not in ('RGB', 'RGBA'):
+            image = image.convert(
+                'RGBA' if 'transparency' in image.info
+                or image.mode.endswith('A') else 'RGB'
+            )
+
+    variants = {
+        'thumbnail': ImageOps.fit(
+            image, (THUMBNAIL_SIZE, THUMBNAIL_SIZE), Image.LANCZOS
+        ),
+    }
+    for target in WIDTHS:
+        if target < width:
+            variants['{}w'.format(target)] = image.resize(
+                (target, max(1, round(height * target / width))),
+                Image.LANCZOS,
+            )
+    return width, height, variants
+
+
+def encode(image):
+    buffer = BytesIO()
+    image.save(buffer, FORMAT, quality=QUALITY)
+    return buffer.getvalue()
+
+
+def build_variants(label, pk, invalidate=True):
+    """
+    Render and store the variants of the image of a row
+
+    :param label: lower case model label, a key of `IMAGE_FIELDS`
+    :param pk: primary key of the row
+    :param invalidate: bump the cache versions of the responses showing
+        the image
+    :return: the stored variants, None when the row has no image
+    """
+    field_name, groups = IMAGE_FIELDS[label]
+    model = apps.get_model(label)
+    instance = model._default_manager.filter(pk=pk).first()
+    field_file = instance and getattr(instance, field_name)
+    if not field_file:
+        return None
+
+    storage = field_file.storage
+    source = field_file.name
+    size = {}
+    try:
+        if not is_blob(source):
+            with field_file.open('rb') as file:
+                source = storage.save(source, file)
+        with storage.open(source) as file:
+            width, height, images = render_variants(file)
+    except (OSError, Image.DecompressionBombError):
+        images = {}
+    else:
+        size = {'width': width, 'height': height}
+
+    data = {'source': source, **size, 'variants': {}}
+
+    for name, image in images.items():
+        path = variant_path(source, name)
+        # stored by a previous build with the same settings
+        if not storage.exists(path):
+            storage.save(path, ContentFile(encode(image)))
+        data['variants'][name] = {
+            'path': path,
+            'width': image.width,
+            'height': image.height,
+        }
+
+    values = {field_name: source, variants_field(field_name): data}
+    with transaction.atomic():
+        # the file may have been replaced meanwhile
+        updated = model._default_manager.filter(
+            pk=pk, **{field_name: field_file.name}
+        ).update(**values)
+        if updated and source != field_file.name:
+            # the row references the blob of its legacy upload
+            add_references([source])
+    if updated and invalidate and groups:
+        bump_cache_version(*groups)
+    return data
+
+
+def pending_ids(label, rebuild=False):
+    """ Primary keys of the rows of the model with an image to process """
+
+    field_name = IMAGE_FIELDS[label][0]
+    queryset = apps.get_model(label)._default_manager.exclude(
+        **{field_name: ''}
+    ).exclude(**{'{}__isnull'.format(field_name): True})
+    if not rebuild:
+        queryset = queryset.filter(
+            **{'{}__isnull'.format(variants_field(field_name)): True}
+        )
+    return list(queryset.order_by('pk').values_list('pk', flat=True))
+
+
+def build_batch(label, pks):
+    for pk in pks:
+        build_variants(label, pk, invalidate=False)
+    return len(pks)
+
+
+def backfill_variants(labels=None, rebuild=False, batch_size=BATCH_SIZE,
+                      workers=WORKERS):
+    """
+    Build the missing variants of the existing images
+
+    :param labels: models to process, all of `IMAGE_FIELDS` by default
+    :param rebuild: build the variants of every image again
+    :param batch_size: images sent to a worker process at once
+    :param workers: worker processes, 1 builds in this process
+    :return: number of images processed
+    """
+    labels = labels or list(IMAGE_FIELDS)
+    batches = [
+        (label, pks[start:start + batch_size])
+        for label in labels
+        for pks in [pending_ids(label, rebuild)]
+        for start in range(0, len(pks), batch_size)
+    ]
+    if not batches:
+        return 0
+
+    if workers <= 1:
+        processed = sum(build_batch(*batch) for batch in batches)
+    else:
+        # forked workers must not share the connections of this process
+        connections.close_all()
+        with ProcessPoolExecutor(
+                workers, mp_context=multiprocessing.get_context('fork'),
+        ) as executor:
+            processed = sum(executor.map(build_batch, *zip(*batches)))
+
+    groups = {group for label in labels for group in IMAGE_FIELDS[label][1]}
+    if groups:
+        bump_cache_version(*sorted(groups))
+    return processed
@@ -0,0 +1,60 @@
+from django.core.management.base import BaseCommand
+
+from photos.derivatives import (
+    BATCH_SIZE,
+    IMAGE_FIELDS,
+    WORKERS,
+    backfill_variants,
+    pending_ids,
+)
+from photos.tasks import build_image_variants
+
+
+class Command(BaseCommand):
+    help = 'Build the thumbnails and the resized copies of the uploaded ' \
+           'images which have none'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--model', action='append', dest='labels',
+            choices=sorted(IMAGE_FIELDS),
+            help='Model to process (repeatable), all of them by default',
+        )
+        parser.add_argument(
+            '--rebuild', action='store_true',
+            help='Build the variants of every image again, e.g. after '
+                 'changing their size or quality',
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=BATCH_SIZE,
+            help='Images sent to a worker process at once',
+        )
+        parser.add_argument(
+            '--workers', type=int, default=WORKERS,
+            help='Worker processes',
+        )
+        parser.add_argument(
+            '--async', action='store_true', dest='run_async',
+            help='Queue one task per image for the Celery workers',
+        )
+
+    def handle(self, *args, **options):
+        labels = options['labels'] or list(IMAGE_FIELDS)
+        if options['run_async']:
+            queued = 0
+            for label in labels:
+                for pk in pending_ids(label, options['rebuild']):
+                    build_image_variants.delay(label, pk)
+                    queued += 1
+            self.stdout.write(self.style.SUCCESS(
+                '{} image(s) queued'.format(queued)
+            ))
+            return
+
+        processed = backfill_variants(
+            labels, rebuild=options['rebuild'],
+            batch_size=options['batch_size'], workers=options['workers'],
+        )
+        self.stdout.write(self.style.SUCCESS(
+            '{} image(s) processed'.format(processed)
+        ))
@@ -0,0 +1,18 @@
+# Generated by Django 3.1.3 on 2026-10-18 03:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('photos', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='photo',
+            name='photo_variants',
+            field=models.JSONField(blank=True, editable=False, help_text='Resized copies, see `photos.derivatives`', null=True),
+        ),
+    ]
@@ -12,6 +12,12 @@ class Photo(models.Model):
         _('Photo'),
         upload_to=user_directory_path,
     )
+    photo_variants = models.JSONField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text=_('Resized copies, see `photos.derivatives`'),
+    )
 
     # logs
     created_at = models.DateTimeField(auto_now_add=True)
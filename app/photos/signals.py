@@ -0,0 +1,39 @@
+from django.apps import apps
+from django.db import transaction
+from django.db.models.signals import post_save, pre_save
+
+from .derivatives import IMAGE_FIELDS, variants_field
+from .tasks import build_image_variants
+
+
+def forget_replaced_variants(sender, instance, **kwargs):
+    """ Variants of a replaced image describe another file """
+
+    field_name = IMAGE_FIELDS[sender._meta.label_lower][0]
+    variants = getattr(instance, variants_field(field_name))
+    if variants and variants['source'] != getattr(instance, field_name).name:
+        setattr(instance, variants_field(field_name), None)
+
+
+def schedule_variants_build(sender, instance, **kwargs):
+    """ Build the variants of a new image after the transaction """
+
+    label = sender._meta.label_lower
+    field_name = IMAGE_FIELDS[label][0]
+    if getattr(instance, field_name) and \
+            getattr(instance, variants_field(field_name)) is None:
+        transaction.on_commit(
+            lambda: build_image_variants.delay(label, instance.pk)
+        )
+
+
+for label in IMAGE_FIELDS:
+    model = apps.get_model(label)
+    pre_save.connect(
+        forget_replaced_variants, sender=model,
+        dispatch_uid='forget_replaced_variants_{}'.format(label),
+    )
+    post_save.connect(
+        schedule_variants_build, sender=model,
+        dispatch_uid='schedule_variants_build_{}'.format(label),
+    )
@@ -0,0 +1,10 @@
+from celery import shared_task
+
+from . import derivatives
+
+
+@shared_task
+def build_image_variants(label, pk):
+    """ Render the thumbnail and the resized copies of an uploaded image """
+
+    derivatives.build_variants(label, pk)
@@ -0,0 +1,147 @@
+import os
+import shutil
+import tempfile
+from io import BytesIO
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.files.storage import FileSystemStorage, default_storage
+from django.test import TestCase, override_settings
+from PIL import Image
+
+from core.models import Blob
+from photos.derivatives import backfill_variants, build_variants
+from photos.models import Photo
+from public_api.serializers.photos import PublicPhotoSerializer
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def image_file(name, size, image_format='JPEG', orientation=None):
+    buffer = BytesIO()
+    exif = Image.Exif()
+    if orientation:
+        exif[0x0112] = orientation
+    Image.new('RGB', size).save(buffer, image_format, exif=exif.tobytes())
+    return SimpleUploadedFile(name, buffer.getvalue())
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class ImageVariantsTests(TestCase):
+    """ Thumbnails and resized WebP copies of uploaded images """
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def create_photo(self, file):
+        return Photo.objects.create(title='Photo', photo=file)
+
+    def test_variants_of_the_smaller_widths(self):
+        photo = self.create_photo(image_file('press.jpg', (2000, 1000)))
+
+        data = build_variants('photos.photo', photo.id)
+
+        self.assertEqual((data['width'], data['height']), (2000, 1000))
+        self.assertEqual(
+            {name: (variant['width'], variant['height'])
+             for name, variant in data['variants'].items()},
+            {'thumbnail': (160, 160), '480w': (480, 240),
+             '960w': (960, 480), '1600w': (1600, 800)},
+        )
+        for variant in data['variants'].values():
+            self.assertTrue(variant['path'].endswith('.webp'))
+            with default_storage.open(variant['path']) as file:
+                self.assertEqual(Image.open(file).format, 'WEBP')
+        photo.refresh_from_db()
+        self.assertEqual(photo.photo_variants, data)
+
+    def test_serialized_srcset(self):
+        photo = self.create_photo(image_file('small.png', (600, 300), 'PNG'))
+        self.assertIsNone(PublicPhotoSerializer(photo).data['photo_variants'])
+
+        build_variants('photos.photo', photo.id)
+        photo.refresh_from_db()
+
+        variants = PublicPhotoSerializer(photo).data['photo_variants']
+        self.assertEqual((variants['width'], variants['height']), (600, 300))
+        self.assertTrue(
+            variants['thumbnail'].endswith('-thumbnail160-q80.webp')
+        )
+        self.assertEqual(list(variants['srcset']), ['480w'])
+
+    def test_exif_orientation_is_applied(self):
+        photo = self.create_photo(
+            image_file('rotated.jpg', (1000, 500), orientation=6)
+        )
+
+        data = build_variants('photos.photo', photo.id)
+
+        self.assertEqual((data['width'], data['height']), (500, 1000))
+        self.assertEqual(
+            (data['variants']['480w']['width'],
+             data['variants']['480w']['height']),
+            (480, 960),
+        )
+
+    def test_file_which_is_not_an_image(self):
+        photo = self.create_photo(SimpleUploadedFile('logo.svg', b'<svg/>'))
+
+        data = build_variants('photos.photo', photo.id)
+
+        self.assertEqual(data['variants'], {})
+        self.assertIsNone(PublicPhotoSerializer(photo).data['photo_variants'])
+
+    def test_replaced_image_forgets_its_variants(self):
+        photo = self.create_photo(image_file('first.jpg', (800, 600)))
+        build_variants('photos.photo', photo.id)
+        photo.refresh_from_db()
+
+        photo.photo = image_file('second.jpg', (800, 600))
+        photo.save()
+
+        photo.refresh_from_db()
+        self.assertIsNone(photo.photo_variants)
+
+    def test_backfill_builds_the_missing_variants(self):
+        photos = [
+            self.create_photo(image_file('{}.jpg'.format(i), (500, 500)))
+            for i in range(3)
+        ]
+
+        self.assertEqual(
+            backfill_variants(['photos.photo'], batch_size=2, workers=1), 3
+        )
+        self.assertEqual(backfill_variants(['photos.photo'], workers=1), 0)
+        for photo in photos:
+            photo.refresh_from_db()
+            self.assertIn('480w', photo.photo_variants['variants'])
+
+    def test_rebuild_keeps_the_stored_variants(self):
+        photo = self.create_photo(image_file('press.jpg', (800, 600)))
+        data = build_variants('photos.photo', photo.id)
+        path = default_storage.path(data['variants']['480w']['path'])
+        os.utime(path, (0, 0))
+
+        build_variants('photos.photo', photo.id)
+
+        # served as immutable, a variant of the same settings is not written
+        self.assertEqual(os.path.getmtime(path), 0)
+
+    def test_legacy_upload_is_stored_as_a_blob(self):
+        legacy = FileSystemStorage(location=MEDIA_ROOT).save(
+            'uploads/photos/legacy.jpg', image_file('legacy.jpg', (800, 600))
+        )
+        photo = self.create_photo(legacy)
+
+        data = build_variants('photos.photo', photo.id)
+
+        photo.refresh_from_db()
+        self.assertTrue(photo.photo.name.startswith('blobs/'))
+        self.assertEqual(data['source'], photo.photo.name)
+        self.assertTrue(data['variants']['480w']['path'].startswith(
+            os.path.dirname(photo.photo.name) + '/variants/'
+        ))
+        self.assertEqual(
+            Blob.objects.get(name=photo.photo.name).reference_count, 1
+        )
@@ -1,4 +1,5 @@
 from django.contrib.auth import get_user_model
+from django.utils.translation import ugettext_lazy as _
 from drf_yasg.utils import swagger_serializer_method
 from rest_framework import serializers
 from news.models import (
@@ -8,14 +9,12 @@ from news.models import (
     Comment,
     PostIdentifier,
     Feedback,
-    PostLike,
-    PostDislike,
-    CommentLike,
-    CommentDislike,
+    Reaction,
 )
 
+from core.utils.tools import sync_m2m
 from .photos import PhotoSerializer
-from public_api.utils.utils import get_comment_count_tool
+from public_api.utils.comments import load_comment_tree, get_comment_count
 
 User = get_user_model()
 
@@ -88,6 +87,46 @@ class ContentUpdateModelSerializer(serializers.ModelSerializer):
         )
 
 
+class ContentBulkListSerializer(serializers.ListSerializer):
+    """ All content blocks of a post, given by `context['post']` """
+
+    def validate(self, blocks):
+        ids = [block['id'] for block in blocks if block.get('id')]
+        if len(ids) != len(set(ids)):
+            raise serializers.ValidationError(
+                _('A content block is given more than once')
+            )
+        if ids and Content.objects.filter(
+                post=self.context['post'], id__in=ids
+        ).count() != len(ids):
+            raise serializers.ValidationError(
+                _('Content blocks must belong to the post')
+            )
+        return blocks
+
+
+class ContentBulkSerializer(serializers.ModelSerializer):
+    """
+    Content block of a post for saving all blocks at once,
+    a block without `id` is created
+    """
+
+    id = serializers.IntegerField(required=False, allow_null=True)
+
+    class Meta:
+        model = Content
+        fields = (
+            'id',
+            'content_type',
+            'ordering',
+            'title',
+            'text',
+            'photo',
+            'video',
+        )
+        list_serializer_class = ContentBulkListSerializer
+
+
 class ContentModelSerializer(serializers.ModelSerializer):
     """
     Content serializer for content field on Post Detail Model Serializer
@@ -129,10 +168,13 @@ class ChildCommentModelSerializer(serializers.ModelSerializer):
 
 
 class CommentModelSerializer(serializers.ModelSerializer):
-    """ Comment Model Serializer for Post Detail Model Serializer """
+    """
+    Comment Model Serializer for Post Detail Model Serializer.
+    Expects comments loaded by `load_comment_tree`.
+    """
 
     commented_by = UserModelSerializer()
-    reply = ChildCommentModelSerializer(many=True)
+    reply = ChildCommentModelSerializer(source='replies', many=True)
 
     class Meta:
         model = Comment
@@ -210,6 +252,8 @@ class NonApprovedPostUpdateSerializer(serializers.ModelSerializer):
         exclude = (
             'is_approved',
             'views',
+            'like_count',
+            'dislike_count',
             'publish_date',
             'created_at',
             'updated_at',
@@ -220,14 +264,8 @@ class NonApprovedPostUpdateSerializer(serializers.ModelSerializer):
         )
 
     def update(self, instance, validated_data):
-        if validated_data.get('category'):
-            categories = validated_data.pop('category')
-            instance.category.clear()
-            for category in categories:
-                category, created = Category.objects.get_or_create(
-                    id=category.id
-                )
-                instance.category.add(category)
+        if 'category' in validated_data:
+            sync_m2m(instance, 'category', validated_data.pop('category'))
         for key in validated_data.keys():
             setattr(instance, key, validated_data.get(key))
         instance.save()
@@ -256,17 +294,14 @@ class ApprovedPostUpdateSerializer(serializers.ModelSerializer):
         read_only_fields = (
             'publish_date',
             'views',
+            'like_count',
+            'dislike_count',
             'id',
         )
 
     def update(self, instance, validated_data):
-        categories = validated_data.pop('category')
-        instance.category.clear()
-        for category in categories:
-            category, created = Category.objects.get_or_create(
-                id=category.id
-            )
-            instance.category.add(category)
+        if 'category' in validated_data:
+            sync_m2m(instance, 'category', validated_data.pop('category'))
         for key in validated_data.keys():
             setattr(instance, key, validated_data.get(key))
         instance.save()
@@ -281,8 +316,7 @@ class PostSerializer(serializers.ModelSerializer):
     keyword = KeywordModelSerializer(required=False)
     category = SelectCategorySerializer(many=True)
     author = UserModelSerializer()
-    comment = CommentModelSerializer(source='post_commented',
-                                     many=True, required=False)
+    comment = serializers.SerializerMethodField(read_only=True)
     comment_count = serializers.SerializerMethodField(read_only=True)
 
     class Meta:
@@ -327,7 +361,19 @@ class PostSerializer(serializers.ModelSerializer):
     def get_comment_count(self, post):
         """ Get total count of comments on a post and their replies """
 
-        return get_comment_count_tool(post)
+        return get_comment_count(post)
+
+    @swagger_serializer_method(
+        serializer_or_field=CommentModelSerializer(many=True)
+    )
+    def get_comment(self, post):
+        """ Get all comments of a post, replies nested in their parent """
+
+        return CommentModelSerializer(
+            load_comment_tree(post, approved_only=False),
+            many=True,
+            context=self.context,
+        ).data
 
 
 class CategorySerializer(serializers.ModelSerializer):
@@ -401,34 +447,6 @@ class PostIdentifierSerializer(serializers.ModelSerializer):
         )
 
 
-class PostLikeSerializer(serializers.ModelSerializer):
-
-    class Meta:
-        model = PostLike
-        fields = (
-            'id',
-            'post',
-            'user',
-        )
-        read_only_fields = (
-            'id',
-        )
-
-
-class PostDislikeSerializer(serializers.ModelSerializer):
-
-    class Meta:
-        model = PostDislike
-        fields = (
-            'id',
-            'post',
-            'user',
-        )
-        read_only_fields = (
-            'id',
-        )
-
-
 class CommentSerializer(serializers.ModelSerializer):
     commented_by = UserModelSerializer()
 
@@ -457,33 +475,16 @@ class CommentSerializer(serializers.ModelSerializer):
         )
 
 
-class CommentLikeSerializer(serializers.ModelSerializer):
+class ReactionSerializer(serializers.ModelSerializer):
 
     class Meta:
-        model = CommentLike
+        model = Reaction
         fields = (
             'id',
+            'post',
             'comment',
             'user',
+            'value',
+            'created_at',
         )
-        read_only_fields = (
-            'id',
-            'comment',
-            'user',
-        )
-
-
-class CommentDislikeSerializer(serializers.ModelSerializer):
-
-    class Meta:
-        model = CommentDislike
-        fields = (
-            'id',
-            'comment',
-            'user',
-        )
-        read_only_fields = (
-            'id',
-            'comment',
-            'user',
-        )
+        read_only_fields = fields
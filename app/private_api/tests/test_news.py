@@ -1,27 +1,27 @@
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from rest_framework.test import APITestCase, APIClient
 from django.contrib.auth import get_user_model
 from django.urls import reverse
 from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from news.contents import save_post_contents
 from news.models import (
     Category,
     Feedback,
     PostIdentifier,
     Post,
-    PostLike,
-    PostDislike,
     Content,
     Comment,
-    CommentLike,
-    CommentDislike,
+    Reaction,
 )
+from news.options.tools import LIKE, DISLIKE
+from news.reactions import set_reaction
 from ..serializers.news import (
     CategorySerializer,
     FeedbackSerializer,
-    PostLikeSerializer,
-    PostDislikeSerializer,
-    CommentLikeSerializer,
-    CommentDislikeSerializer,
+    ReactionSerializer,
 )
 
 """
@@ -29,13 +29,10 @@ TESTED ENDPOINTS:
     1. PostIdentifierApiView => PostIdentifierApiTests
     2. CategoryApiView => PrivateCategoryApiTest
     3. FeedbackApiView => FeedbackApiTests
-    4. PostLikeViewSet => PostLikeAndDislikeApiTest
-    5. PostDislikeViewSet => PostLikeAndDislikeApiTest
-    6. ContentApiView => ContentApiTestCases
-    7. CommentLikeViewSet => ??
-    8. CommentDislikeViewSet => ??
-    7. PostApiView => ??
-    8. CommentApiViewSet => ??
+    4. ReactionViewSet => ReactionApiTest
+    5. ContentApiView => ContentApiTestCases
+    6. PostApiView => ??
+    7. CommentApiViewSet => ??
 """
 
 USER = get_user_model()
@@ -58,10 +55,6 @@ def create_post(**payload):
     return Post.objects.create(**payload)
 
 
-def create_postlike(**payload):
-    return PostLike.objects.create(**payload)
-
-
 def create_comment(**payload):
     return Comment.objects.create(**payload)
 
@@ -849,9 +842,9 @@ class PostIdentifierApiTests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
 
 
-class PostLikeAndDislikeApiTest(TestCase):
+class ReactionApiTest(TestCase):
     """
-    Post like and dislike API endpoint tests.
+    Reaction (likes and dislikes of posts and comments) API endpoint tests.
     `RETRIEVE` => Staff user
     `LIST` => Staff user
     `CREATE` => No one
@@ -884,237 +877,79 @@ class PostLikeAndDislikeApiTest(TestCase):
         }
         self.post = create_post(**post_data)
         self.post.category.add(category)
-        self.postlike = PostLike.objects.filter(post=self.post)[0]
-        self.postdislike = PostDislike.objects.filter(post=self.post)[0]
+        comment = create_comment(
+            post=self.post, commented_by=self.user, comment='comment'
+        )
+        set_reaction(self.post, self.user, LIKE)
+        set_reaction(comment, self.user, DISLIKE)
+        self.reaction = Reaction.objects.get(post=self.post)
 
-        self.url_like_detail = reverse('private_api:postlike-api-detail',
-                                       kwargs={'pk': self.postlike.id})
-        self.url_dislike_detail = reverse('private_api:postdislike-api-detail',
-                                          kwargs={'pk': self.postdislike.id})
-        self.url_like_list = reverse('private_api:postlike-api-list')
-        self.url_dislike_list = reverse('private_api:postdislike-api-list')
+        self.url_detail = reverse('private_api:reaction-api-detail',
+                                  kwargs={'pk': self.reaction.id})
+        self.url_list = reverse('private_api:reaction-api-list')
 
-    def test_api_returns_post_like_list_to_only_staff_user(self):
+    def test_api_returns_reaction_list_to_only_staff_user(self):
         """
-        Testing Post like list request test, only Staff user is allowed
+        Testing Reaction list request test, only Staff user is allowed
         """
-        serializer = PostLikeSerializer(
-            PostLike.objects.all(),
+        serializer = ReactionSerializer(
+            Reaction.objects.all(),
             many=True
         )
         client = APIClient()
         # basic user
-        response = client.get(self.url_like_list)
+        response = client.get(self.url_list)
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
 
         # logged user
         client.force_authenticate(user=self.user)
-        response = client.get(self.url_like_list)
+        response = client.get(self.url_list)
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
 
         # staff user
         self.user.is_staff = True
-        response = client.get(self.url_like_list)
+        response = client.get(self.url_list)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data, serializer.data)
 
-    def test_api_returns_post_like_retrieve_to_only_staff_user(self):
+    def test_api_returns_reaction_retrieve_to_only_staff_user(self):
         """
-        Testing Post like retrieve request test, only Staff user is allowed
+        Testing Reaction retrieve request test, only Staff user is allowed
         """
 
-        serializer = PostLikeSerializer(
-            PostLike.objects.all()[0]
+        serializer = ReactionSerializer(
+            self.reaction
         )
         client = APIClient()
 
         # basic user
-        response = client.get(self.url_like_detail)
+        response = client.get(self.url_detail)
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
 
         # logged user
         client.force_authenticate(user=self.user)
-        response = client.get(self.url_like_detail)
+        response = client.get(self.url_detail)
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
 
         # staff user
         self.user.is_staff = True
-        response = client.get(self.url_like_detail)
+        response = client.get(self.url_detail)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data, serializer.data)
 
-    def test_update_post_like_is_not_allowed(self):
+    def test_update_reaction_is_not_allowed(self):
         """
-        Testing Post like update request method is NOT allowed to ANYONE
+        Testing Reaction update request method is NOT allowed to ANYONE
         """
 
         client = APIClient()
 
         # basic user
         patch_response = client.patch(
-            path=self.url_like_detail
-        )
-        put_response = client.put(
-            path=self.url_like_detail
-        )
-        self.assertEqual(
-            patch_response.status_code, status.HTTP_401_UNAUTHORIZED
-        )
-        self.assertEqual(
-            put_response.status_code, status.HTTP_401_UNAUTHORIZED
-        )
-
-        # logged user
-        client.force_authenticate(user=self.user)
-        patch_response = client.patch(
-            path=self.url_like_detail
-        )
-        put_response = client.put(
-            path=self.url_like_detail
-        )
-        self.assertEqual(patch_response.status_code, status.HTTP_403_FORBIDDEN)
-        self.assertEqual(put_response.status_code, status.HTTP_403_FORBIDDEN)
-
-        # reporter user
-        self.user.user_type = 2
-        patch_response = client.patch(
-            path=self.url_like_detail
+            path=self.url_detail
         )
         put_response = client.put(
-            path=self.url_like_detail
-        )
-        self.assertEqual(patch_response.status_code, status.HTTP_403_FORBIDDEN)
-        self.assertEqual(put_response.status_code, status.HTTP_403_FORBIDDEN)
-
-        # editor user
-        self.user.user_type = 3
-        patch_response = client.patch(
-            path=self.url_like_detail
-        )
-        put_response = client.put(
-            path=self.url_like_detail
-        )
-        self.assertEqual(patch_response.status_code, status.HTTP_403_FORBIDDEN)
-        self.assertEqual(put_response.status_code, status.HTTP_403_FORBIDDEN)
-
-        # admin user
-        self.user.user_type = 4
-        patch_response = client.patch(
-            path=self.url_like_detail
-        )
-        put_response = client.put(
-            path=self.url_like_detail
-        )
-        self.assertEqual(patch_response.status_code, status.HTTP_403_FORBIDDEN)
-        self.assertEqual(put_response.status_code, status.HTTP_403_FORBIDDEN)
-
-    def test_delete_post_like_is_not_allowed(self):
-        """
-        Testing Post like delete request method is NOT allowed to ANYONE
-        """
-
-        client = APIClient()
-
-        # basic user
-        response = client.delete(
-            path=self.url_like_detail
-        )
-        self.assertEqual(
-            response.status_code, status.HTTP_401_UNAUTHORIZED
-        )
-
-        # logged user
-        client.force_authenticate(user=self.user)
-        response = client.delete(
-            path=self.url_like_detail
-        )
-        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
-
-        # reporter user
-        self.user.user_type = 2
-        response = client.delete(
-            path=self.url_like_detail
-        )
-        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
-
-        # editor user
-        self.user.user_type = 3
-        response = client.delete(
-            path=self.url_like_detail
-        )
-        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
-
-        # admin user
-        self.user.user_type = 4
-        response = client.delete(
-            path=self.url_like_detail
-        )
-        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
-
-    def test_api_returns_post_dislike_list_to_only_staff_user(self):
-        """
-        Testing Post dislike list request, only Staff user is allowed
-        """
-
-        serializer = PostDislikeSerializer(
-            PostDislike.objects.all(),
-            many=True
-        )
-        client = APIClient()
-
-        # basic user
-        response = client.get(self.url_dislike_list)
-        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
-
-        # logged user
-        client.force_authenticate(user=self.user)
-        response = client.get(self.url_dislike_list)
-        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
-
-        # staff user
-        self.user.is_staff = True
-        response = client.get(self.url_dislike_list)
-        self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data, serializer.data)
-
-    def test_api_returns_post_dislike_retrieve_to_only_staff_user(self):
-        """
-        Testing Post dislike retrieve request, only Staff user is allowed
-        """
-
-        serializer = PostDislikeSerializer(
-            PostDislike.objects.all()[0]
-        )
-        client = APIClient()
-
-        # basic user
-        response = client.get(self.url_dislike_detail)
-        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
-
-        # logged user
-        client.force_authenticate(user=self.user)
-        response = client.get(self.url_dislike_detail)
-        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
-
-        # staff user
-        self.user.is_staff = True
-        response = client.get(self.url_dislike_detail)
-        self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data, serializer.data)
-
-    def test_update_post_dislike_is_not_allowed(self):
-        """
-        Testing Post dislike update request method is NOT allowed to ANYONE
-        """
-
-        client = APIClient()
-
-        # basic user
-        put_response = client.patch(
-            path=self.url_dislike_detail
-        )
-        patch_response = client.put(
-            path=self.url_dislike_detail
+            path=self.url_detail
         )
         self.assertEqual(
             patch_response.status_code, status.HTTP_401_UNAUTHORIZED
@@ -1126,10 +961,10 @@ class PostLikeAndDislikeApiTest(TestCase):
         # logged user
         client.force_authenticate(user=self.user)
         patch_response = client.patch(
-            path=self.url_dislike_detail
+            path=self.url_detail
         )
         put_response = client.put(
-            path=self.url_dislike_detail
+            path=self.url_detail
         )
         self.assertEqual(patch_response.status_code, status.HTTP_403_FORBIDDEN)
         self.assertEqual(put_response.status_code, status.HTTP_403_FORBIDDEN)
@@ -1137,10 +972,10 @@ class PostLikeAndDislikeApiTest(TestCase):
         # reporter user
         self.user.user_type = 2
         patch_response = client.patch(
-            path=self.url_dislike_detail
+            path=self.url_detail
         )
         put_response = client.put(
-            path=self.url_dislike_detail
+            path=self.url_detail
         )
         self.assertEqual(patch_response.status_code, status.HTTP_403_FORBIDDEN)
         self.assertEqual(put_response.status_code, status.HTTP_403_FORBIDDEN)
@@ -1148,10 +983,10 @@ class PostLikeAndDislikeApiTest(TestCase):
         # editor user
         self.user.user_type = 3
         patch_response = client.patch(
-            path=self.url_dislike_detail
+            path=self.url_detail
         )
         put_response = client.put(
-            path=self.url_dislike_detail
+            path=self.url_detail
         )
         self.assertEqual(patch_response.status_code, status.HTTP_403_FORBIDDEN)
         self.assertEqual(put_response.status_code, status.HTTP_403_FORBIDDEN)
@@ -1159,24 +994,24 @@ class PostLikeAndDislikeApiTest(TestCase):
         # admin user
         self.user.user_type = 4
         patch_response = client.patch(
-            path=self.url_dislike_detail
+            path=self.url_detail
         )
         put_response = client.put(
-            path=self.url_dislike_detail
+            path=self.url_detail
         )
         self.assertEqual(patch_response.status_code, status.HTTP_403_FORBIDDEN)
         self.assertEqual(put_response.status_code, status.HTTP_403_FORBIDDEN)
 
-    def test_delete_post_dislike_is_not_allowed(self):
+    def test_delete_reaction_is_not_allowed(self):
         """
-        Testing Post like delete request method is NOT allowed to ANYONE
+        Testing Reaction delete request method is NOT allowed to ANYONE
         """
 
         client = APIClient()
 
         # basic user
         response = client.delete(
-            path=self.url_dislike_detail
+            path=self.url_detail
         )
         self.assertEqual(
             response.status_code, status.HTTP_401_UNAUTHORIZED
@@ -1185,28 +1020,28 @@ class PostLikeAndDislikeApiTest(TestCase):
         # logged user
         client.force_authenticate(user=self.user)
         response = client.delete(
-            path=self.url_dislike_detail
+            path=self.url_detail
         )
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
 
         # reporter user
         self.user.user_type = 2
         response = client.delete(
-            path=self.url_dislike_detail
+            path=self.url_detail
         )
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
 
         # editor user
         self.user.user_type = 3
         response = client.delete(
-            path=self.url_dislike_detail
+            path=self.url_detail
         )
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
 
         # admin user
         self.user.user_type = 4
         response = client.delete(
-            path=self.url_dislike_detail
+            path=self.url_detail
         )
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
 
@@ -1606,415 +1441,6 @@ class ContentApiTestCases(APITestCase):
         )
 
 
-class CommentLikeAndDislikeApiTest(TestCase):
-    """
-    Comment like and dislike API endpoint tests.
-    `RETRIEVE` => Staff user
-    `LIST` => Staff user
-    `CREATE` => Nobody
-    `UPDATE` => Nobody
-    `PARTIAL_UPDATE` => Nobody
-    `DESTROY` => Nobody
-
-    """
-
-    def setUp(self):
-        user_data = {
-            "email": "user@user.az",
-            "password": "sdhd62863%&fcdafsswegfs",
-            "first_name": "test_ first name",
-            "last_name": "test_ last name",
-        }
-        self.user = create_user(**user_data)
-        self.user.set_password(user_data["password"])
-        self.user.save()
-
-        keyword = PostIdentifier.objects.create(title="OPEN")
-        category = Category.objects.create(title="Category")
-
-        post_data = {
-            "title": "TEstpost",
-            "author": self.user,
-            "keyword": keyword,
-            "short_description": "sfhswiaa"
-        }
-        self.post = create_post(**post_data)
-        self.post.category.add(category)
-
-        self.post.save()
-        comment_data = {
-            "commented_by": self.user,
-            "post": self.post,
-            "replied_comment": None,
-            "comment": "testing like and dislike request"
-        }
-        self.comment = create_comment(**comment_data)
-        self.comment.save()
-
-        self.commentlike = CommentLike.objects.filter(
-            comment=self.comment)[0]
-        self.commentdislike = CommentDislike.objects.filter(
-            comment=self.comment)[0]
-
-        self.url_like_list = reverse(
-            'private_api:comment-like-api-list',
-        )
-        self.url_like_detail = reverse(
-            'private_api:comment-like-api-detail',
-            kwargs={'pk': self.commentlike.id})
-        self.url_dislike_list = reverse(
-            'private_api:comment-dislike-api-list',
-        )
-        self.url_dislike_detail = reverse(
-            'private_api:comment-dislike-api-detail',
-            kwargs={'pk': self.commentdislike.id})
-
-    def test_api_returns_comment_like_list_to_only_staff_user(self):
-        """
-        Testing Comment like list request test, only Staff user is allowed
-        """
-        serializer = CommentLikeSerializer(
-            CommentLike.objects.all(),
-            many=True
-        )
-        client = APIClient()
-
-        # basic user
-        response = client.get(self.url_like_list)
-        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
-
-        # logged user
-        client.force_authenticate(user=self.user)
-        response = client.get(self.url_like_list)
-        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
-
-        # staff user
-        self.user.is_staff = True
-        response = client.get(self.url_like_list)
-        self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data, serializer.data)
-
-    def test_api_returns_comment_like_retrieve_to_only_staff_user(self):
-        """
-        Testing Comment like retrieve request test, only Staff user is allowed
-        """
-
-        serializer = CommentLikeSerializer(
-            CommentLike.objects.all()[0]
-        )
-        client = APIClient()
-
-        # basic user
-        response = client.get(self.url_like_detail)
-        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
-
-        # logged user
-        client.force_authenticate(user=self.user)
-        response = client.get(self.url_like_detail)
-        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
-
-        # staff user
-        self.user.is_staff = True
-        response = client.get(self.url_like_detail)
-        self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data, serializer.data)
-
-    def test_nobody_can_update_comment_like(self):
-        """
-        Testing Comment like update request test, no one is allowed.
-        """
-
-        client = APIClient()
-
-        # basic user
-        patch_response = client.patch(
-            path=self.url_like_detail
-        )
-        put_response = client.put(
-            path=self.url_like_detail
-        )
-        self.assertEqual(
-            patch_response.status_code, status.HTTP_401_UNAUTHORIZED
-        )
-        self.assertEqual(
-            put_response.status_code, status.HTTP_401_UNAUTHORIZED
-        )
-
-        # logged user
-        client.force_authenticate(user=self.user)
-        put_response = client.put(
-            path=self.url_like_detail
-        )
-        patch_response = client.patch(
-            path=self.url_like_detail
-        )
-        self.assertEqual(put_response.status_code, status.HTTP_403_FORBIDDEN)
-        self.assertEqual(patch_response.status_code, status.HTTP_403_FORBIDDEN)
-
-        # reporter user
-        self.user.is_staff = True
-        self.user.user_type = 2
-        patch_response = client.patch(
-            path=self.url_like_detail
-        )
-        put_response = client.put(
-            path=self.url_like_detail
-        )
-        self.assertEqual(
-            patch_response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED
-        )
-        self.assertEqual(
-            put_response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED
-        )
-        self.assertEqual(self.user.user_type, 2)
-
-        # editor user
-        self.user.user_type = 3
-        put_response = client.put(
-            path=self.url_like_detail
-        )
-        patch_response = client.patch(
-            path=self.url_like_detail
-        )
-        self.assertEqual(
-            put_response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED
-        )
-        self.assertEqual(
-            patch_response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED
-        )
-        self.assertEqual(self.user.user_type, 3)
-
-        # admin user
-        self.user.user_type = 4
-        put_response = client.put(
-            path=self.url_like_detail
-        )
-        patch_response = client.patch(
-            path=self.url_like_detail
-        )
-        self.assertEqual(
-            put_response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED
-        )
-        self.assertEqual(
-            patch_response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED
-        )
-        self.assertEqual(self.user.user_type, 4)
-
-    def test_nobody_can_delete_comment_like(self):
-        """
-        Testing Comment like delete request test, no one is allowed
-        """
-
-        client = APIClient()
-
-        # basic user
-        response = client.delete(self.url_like_detail)
-        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
-
-        # logged user
-        client.force_authenticate(user=self.user)
-        response = client.delete(self.url_like_detail)
-        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
-
-        # reporter user
-        self.user.is_staff = True
-        self.user.user_type = 2
-        response = client.delete(self.url_like_detail)
-        self.assertEqual(
-            response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED
-        )
-        self.assertEqual(self.user.user_type, 2)
-
-        # editor user
-        self.user.user_type = 3
-        response = client.delete(self.url_like_detail)
-        self.assertEqual(
-            response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED
-        )
-        self.assertEqual(self.user.user_type, 3)
-
-        # admin user
-        self.user.user_type = 4
-        response = client.delete(self.url_like_detail)
-        self.assertEqual(
-            response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED
-        )
-        self.assertEqual(self.user.user_type, 4)
-
-    def test_api_returns_comment_dislike_list_to_only_staff_user(self):
-        """
-        Testing Comment dislike list request, only Staff user is allowed
-        """
-
-        serializer = CommentDislikeSerializer(
-            CommentDislike.objects.all(),
-            many=True
-        )
-        client = APIClient()
-
-        # basic user
-        response = client.get(self.url_dislike_list)
-        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
-
-        # logged user
-        client.force_authenticate(user=self.user)
-        response = client.get(self.url_dislike_list)
-        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
-
-        # staff user
-        self.user.is_staff = True
-        response = client.get(self.url_dislike_list)
-        self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data, serializer.data)
-
-    def test_api_returns_comment_dislike_retrieve_to_only_staff_user(self):
-        """
-        Testing Comment dislike retrieve request, only Staff user is allowed
-        """
-
-        serializer = CommentDislikeSerializer(
-            CommentDislike.objects.all()[0]
-        )
-        client = APIClient()
-
-        # basic user
-        response = client.get(self.url_dislike_detail)
-        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
-
-        # logged user
-        client.force_authenticate(user=self.user)
-        response = client.get(self.url_dislike_detail)
-        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
-
-        # staff user
-        self.user.is_staff = True
-        response = client.get(self.url_dislike_detail)
-        self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data, serializer.data)
-
-    def test_nobody_can_update_comment_dislike(self):
-        """
-        Testing Comment dislike update request test, no one is allowed.
-        """
-
-        client = APIClient()
-
-        # basic user
-        patch_response = client.patch(
-            path=self.url_dislike_detail
-        )
-        put_response = client.put(
-            path=self.url_dislike_detail
-        )
-        self.assertEqual(
-            patch_response.status_code, status.HTTP_401_UNAUTHORIZED
-        )
-        self.assertEqual(
-            put_response.status_code, status.HTTP_401_UNAUTHORIZED
-        )
-
-        # logged user
-        client.force_authenticate(user=self.user)
-        put_response = client.put(
-            path=self.url_dislike_detail
-        )
-        patch_response = client.patch(
-            path=self.url_dislike_detail
-        )
-        self.assertEqual(put_response.status_code, status.HTTP_403_FORBIDDEN)
-        self.assertEqual(patch_response.status_code, status.HTTP_403_FORBIDDEN)
-
-        # reporter user
-        self.user.is_staff = True
-        self.user.user_type = 2
-        patch_response = client.patch(
-            path=self.url_dislike_detail
-        )
-        put_response = client.put(
-            path=self.url_dislike_detail
-        )
-        self.assertEqual(
-            patch_response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED
-        )
-        self.assertEqual(
-            put_response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED
-        )
-        self.assertEqual(self.user.user_type, 2)
-
-        # editor user
-        self.user.user_type = 3
-        put_response = client.put(
-            path=self.url_dislike_detail
-        )
-        patch_response = client.patch(
-            path=self.url_dislike_detail
-        )
-        self.assertEqual(
-            put_response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED
-        )
-        self.assertEqual(
-            patch_response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED
-        )
-        self.assertEqual(self.user.user_type, 3)
-
-        # admin user
-        self.user.user_type = 4
-        put_response = client.put(
-            path=self.url_dislike_detail
-        )
-        patch_response = client.patch(
-            path=self.url_dislike_detail
-        )
-        self.assertEqual(
-            put_response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED
-        )
-        self.assertEqual(
-            patch_response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED
-        )
-        self.assertEqual(self.user.user_type, 4)
-
-    def test_nobody_can_delete_comment_dislike(self):
-        """
-        Testing Comment dislike delete request test, no one is allowed
-        """
-
-        client = APIClient()
-
-        # basic user
-        response = client.delete(self.url_dislike_detail)
-        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
-
-        # logged user
-        client.force_authenticate(user=self.user)
-        response = client.delete(self.url_dislike_detail)
-        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
-
-        # reporter user
-        self.user.is_staff = True
-        self.user.user_type = 2
-        response = client.delete(self.url_dislike_detail)
-        self.assertEqual(
-            response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED
-        )
-        self.assertEqual(self.user.user_type, 2)
-
-        # editor user
-        self.user.user_type = 3
-        response = client.delete(self.url_dislike_detail)
-        self.assertEqual(
-            response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED
-        )
-        self.assertEqual(self.user.user_type, 3)
-
-        # admin user
-        self.user.user_type = 4
-        response = client.delete(self.url_dislike_detail)
-        self.assertEqual(
-            response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED
-        )
-        self.assertEqual(self.user.user_type, 4)
-
-
 class PrivatePostApiTests(APITestCase):
     """
     `GET` => Staff user
@@ -2376,3 +1802,117 @@ class PrivatePostApiTests(APITestCase):
 
     def test_post_approve_by_only_editor_or_admin_user(self):
         pass
+
+
+class PostContentsBulkApiTests(APITestCase):
+    """
+    Saving all content blocks of a post with one request
+
+    Allowed requests:
+        `PUT` => Staff user if Post is not approved
+        `PUT` => Editor and Admin user if Post is approved
+    """
+
+    def setUp(self):
+        self.user = create_user(email='reporter@test.az', is_staff=True)
+        self.user.user_type = 2
+        self.client.force_authenticate(user=self.user)
+        self.post = create_post(title='Testing Post', author=self.user)
+        self.first = Content.objects.create(
+            post=self.post, content_type='Text', ordering=1, title='First',
+        )
+        self.second = Content.objects.create(
+            post=self.post, content_type='Text', ordering=2, title='Second',
+        )
+        self.url = reverse(
+            'private_api:update-post-contents', kwargs={'pk': self.post.id}
+        )
+
+    def blocks(self, count):
+        return [
+            {
+                'content_type': 'Main Text',
+                'ordering': i + 3,
+                'title': 'Block {}'.format(i),
+                'text': 'First sentence. Second sentence. Third sentence.',
+            }
+            for i in range(count)
+        ]
+
+    def test_create_update_reorder_and_delete(self):
+        payload = [
+            {'id': self.second.id, 'ordering': 0, 'title': 'Second',
+             'content_type': 'Text'},
+        ] + self.blocks(2)
+
+        response = self.client.put(self.url, data=payload, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [block['title'] for block in response.data['data']],
+            ['Second', 'Block 0', 'Block 1'],
+        )
+        self.assertEqual(
+            list(self.post.post_content.values_list('title', flat=True)),
+            ['Second', 'Block 0', 'Block 1'],
+        )
+        self.assertFalse(Content.objects.filter(id=self.first.id).exists())
+
+        self.post.refresh_from_db()
+        self.assertEqual(
+            self.post.short_description, 'First sentence. Second sentence.'
+        )
+
+    def test_query_count_does_not_grow_with_blocks(self):
+        with CaptureQueriesContext(connection) as few_blocks:
+            self.client.put(self.url, data=self.blocks(2), format='json')
+
+        blocks = [
+            {'id': content.id, 'title': content.title,
+             'ordering': content.ordering}
+            for content in self.post.post_content.all()
+        ] + self.blocks(40)
+        with CaptureQueriesContext(connection) as many_blocks:
+            response = self.client.put(self.url, data=blocks, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.post.post_content.count(), 42)
+        self.assertLessEqual(len(many_blocks), len(few_blocks) + 1)
+
+    def test_blocks_of_other_posts_are_rejected(self):
+        other_post = create_post(title='Other Post', author=self.user)
+        other = Content.objects.create(
+            post=other_post, ordering=1, title='Other',
+        )
+
+        response = self.client.put(
+            self.url, data=[{'id': other.id, 'title': 'Stolen'}],
+            format='json',
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        other.refresh_from_db()
+        self.assertEqual(other.title, 'Other')
+
+    def test_block_deleted_after_validation_is_rejected(self):
+        blocks = [{'id': self.first.id, 'title': 'Edited'}]
+        # deleted by a concurrent save of the article
+        self.first.delete()
+
+        with self.assertRaises(ValidationError):
+            save_post_contents(self.post, blocks)
+
+        self.assertTrue(Content.objects.filter(id=self.second.id).exists())
+
+    def test_approved_post_by_editor_only(self):
+        self.post.is_approved = True
+        self.post.save()
+
+        response = self.client.put(self.url, data=self.blocks(1),
+                                   format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        self.user.user_type = 3
+        response = self.client.put(self.url, data=self.blocks(1),
+                                   format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -9,14 +9,8 @@ router.register('categories', views.CategoryApiView)
 router.register('feedback', views.FeedbackApiView, basename='feedback-api')
 router.register('post-identifier', views.PostIdentifierApiView,
                 basename='post-identifier-api')
-router.register('post-like', views.PostLikeViewSet, basename='postlike-api')
-router.register('post-dislike', views.PostDislikeViewSet,
-                basename='postdislike-api')
 router.register('comments', views.CommentApiViewSet, basename='comment-api')
-router.register('comment-like', views.CommentLikeViewSet,
-                basename='comment-like-api')
-router.register('comment-dislike', views.CommentDislikeViewSet,
-                basename='comment-dislike-api')
+router.register('reactions', views.ReactionViewSet, basename='reaction-api')
 
 
 POST_URLS = [
@@ -32,6 +26,9 @@ POST_URLS = [
     path('<int:pk>/update-approved/', views.PostApiView.as_view(
         actions={'patch': 'update_approved'}),
          name='update-approved-post'),
+    path('<int:pk>/contents/', views.PostApiView.as_view(
+        actions={'put': 'update_contents'}),
+         name='update-post-contents'),
     path('<int:pk>/delete/', views.PostApiView.as_view(
         actions={'delete': 'destroy'}),
          name='post-delete'),
@@ -1,6 +1,7 @@
 from knox.auth import TokenAuthentication
 from rest_framework import viewsets, parsers, pagination
 
+from core.utils.optimizer import OptimizedQuerysetMixin
 from ..serializers.core import (
     SettingsSerializer,
     SocialMediaSerializer,
@@ -14,7 +15,7 @@ class ExamplePagination(pagination.PageNumberPagination):
     page_size = 10
 
 
-class SettingsAPIView(viewsets.ModelViewSet):
+class SettingsAPIView(OptimizedQuerysetMixin, viewsets.ModelViewSet):
     """
     API endpoint for working on Website Settings.
 
@@ -32,7 +33,7 @@ class SettingsAPIView(viewsets.ModelViewSet):
     parser_classes = (parsers.MultiPartParser,)
 
 
-class SocialMediaAPIView(viewsets.ModelViewSet):
+class SocialMediaAPIView(OptimizedQuerysetMixin, viewsets.ModelViewSet):
     """
     API endpoint for working on Website's Social Media accounts.
 
@@ -49,7 +50,8 @@ class SocialMediaAPIView(viewsets.ModelViewSet):
     serializer_class = SocialMediaSerializer
 
 
-class ContactFormAPIView(viewsets.ReadOnlyModelViewSet):
+class ContactFormAPIView(OptimizedQuerysetMixin,
+                         viewsets.ReadOnlyModelViewSet):
     """
     API endpoint for getting Contact Forms sent by users.
 
@@ -9,15 +9,17 @@ from news.models import (
     Comment,
     Feedback,
     PostIdentifier,
-    PostLike,
-    PostDislike,
-    CommentLike,
-    CommentDislike,
+    Reaction,
 )
 
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from core.utils.optimizer import OptimizedQuerysetMixin
+from core.utils.tools import sync_m2m
+from news.categories import get_category_tree, iter_categories
+from news.contents import save_post_contents
 from .. import permissions as perm
+from public_api.utils.comments import with_comment_count
 from ..serializers.news import (
     PostCreateSerializer,
     NonApprovedPostUpdateSerializer,
@@ -25,15 +27,13 @@ from ..serializers.news import (
     PostSerializer,
     ContentModelSerializer,
     ContentUpdateModelSerializer,
+    ContentBulkSerializer,
     CategorySerializer,
     FeedbackSerializer,
     FeedbackGetSerializer,
     PostIdentifierSerializer,
-    PostLikeSerializer,
-    PostDislikeSerializer,
     CommentSerializer,
-    CommentLikeSerializer,
-    CommentDislikeSerializer,
+    ReactionSerializer,
 )
 
 from news.options.tools import (
@@ -48,7 +48,7 @@ class ExamplePagination(pagination.PageNumberPagination):
     page_size = 10
 
 
-class PostApiView(viewsets.ModelViewSet):
+class PostApiView(OptimizedQuerysetMixin, viewsets.ModelViewSet):
     """
     API endpoint for working on Posts.
     `Post` and `Post's Contents` are different endpoints.
@@ -65,6 +65,12 @@ class PostApiView(viewsets.ModelViewSet):
     serializer_class = PostSerializer
     pagination_class = ExamplePagination
 
+    def get_queryset(self):
+        queryset = super(PostApiView, self).get_queryset()
+        if self.action in ('list', 'retrieve'):
+            queryset = with_comment_count(queryset)
+        return queryset
+
     def get_serializer_class(self):
         if self.action == 'create':
             return PostCreateSerializer
@@ -72,6 +78,8 @@ class PostApiView(viewsets.ModelViewSet):
             return NonApprovedPostUpdateSerializer
         if self.action == 'update_approved':
             return ApprovedPostUpdateSerializer
+        if self.action == 'update_contents':
+            return ContentBulkSerializer
         return PostSerializer
 
     def get_permissions(self):
@@ -116,11 +124,7 @@ class PostApiView(viewsets.ModelViewSet):
             obj = Post.objects.create(
                 **serializer.validated_data
             )
-            for category in category:
-                category, created = Category.objects.get_or_create(
-                    id=category.id
-                )
-                obj.category.add(category)
+            sync_m2m(obj, 'category', category)
             obj.save()
             return Response(
                 {
@@ -199,8 +203,49 @@ class PostApiView(viewsets.ModelViewSet):
                 status=status.HTTP_200_OK,
             )
 
+    @swagger_auto_schema(
+        request_body=ContentBulkSerializer(many=True),
+        operation_description='Save all content blocks of the post at once: '
+                              'blocks with `id` are updated, blocks without '
+                              '`id` are created, and the blocks of the post '
+                              'which are not given are deleted. \n'
+                              'If the post is approved, only `Editor` and '
+                              '`Admin` users are allowed. \n'
+
+                              'Response: \n'
+                              ' `200` => OK\n'
+                              ' `401` => Unauthenticated user\n'
+                              ' `403` => Not Staff user or is Reporter user\n'
+                              ' `400` => Invalid data\n'
+    )
+    @action(detail=True, methods=['put'],
+            url_name='update-post-contents',
+            url_path='<int:pk>/contents/')
+    def update_contents(self, request, *args, **kwargs):
+        obj = self.get_object()
+        if obj.is_approved and request.user.user_type not in (3, 4):
+            return Response(
+                {"status": "You are not allowed to update approved posts"},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+
+        serializer = ContentBulkSerializer(
+            data=request.data,
+            many=True,
+            context={"request": self.request, "post": obj},
+        )
+        serializer.is_valid(raise_exception=True)
+        contents = save_post_contents(obj, serializer.validated_data)
+        return Response(
+            {
+                'data': ContentModelSerializer(contents, many=True).data,
+                'status': _('Post contents are updated successfully')
+            },
+            status=status.HTTP_200_OK,
+        )
+
 
-class ContentApiView(viewsets.ModelViewSet):
+class ContentApiView(OptimizedQuerysetMixin, viewsets.ModelViewSet):
     """
     API endpoints for Post Contents.
     All staff users can perform all requests.
@@ -227,17 +272,30 @@ class ContentApiView(viewsets.ModelViewSet):
         return ContentModelSerializer
 
 
-class CategoryApiView(viewsets.ModelViewSet):
+class CategoryApiView(OptimizedQuerysetMixin, viewsets.ModelViewSet):
     """
     API endpoint for Categories.
+    The list is read from the cached category tree, each category is
+    followed by its subcategories.
     """
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
     authentication_classes = (TokenAuthentication,)
     permission_classes = (permissions.IsAdminUser,)
 
+    def list(self, request, *args, **kwargs):
+        return Response([
+            {
+                'id': node['id'],
+                'parent_category': parent_id,
+                'title': node['title'],
+                'ordering': node['ordering'],
+            }
+            for parent_id, node in iter_categories(get_category_tree())
+        ])
+
 
-class FeedbackApiView(viewsets.ModelViewSet):
+class FeedbackApiView(OptimizedQuerysetMixin, viewsets.ModelViewSet):
     """
     API endpoints for giving Feedback on Posts by Editor, Admin users.
     Reporter is allowed only for `SAFE METHODS`
@@ -260,7 +318,7 @@ class FeedbackApiView(viewsets.ModelViewSet):
         return FeedbackSerializer
 
 
-class PostIdentifierApiView(viewsets.ModelViewSet):
+class PostIdentifierApiView(OptimizedQuerysetMixin, viewsets.ModelViewSet):
     """
     API endpoints for working on PostIdentifier ( keyword )
 
@@ -278,34 +336,7 @@ class PostIdentifierApiView(viewsets.ModelViewSet):
     serializer_class = PostIdentifierSerializer
 
 
-class PostLikeViewSet(viewsets.ReadOnlyModelViewSet):
-    """
-    Readonly API endpoint for working on "Likes" given to Posts
-
-    Allowed requests:
-        `GET` => Staff user
-    """
-    queryset = PostLike.objects.all()
-    serializer_class = PostLikeSerializer
-    authentication_classes = (TokenAuthentication,)
-    permission_classes = (permissions.IsAdminUser,)
-
-
-class PostDislikeViewSet(viewsets.ReadOnlyModelViewSet):
-    """
-    Readonly API endpoint for working on "Dislikes" given to Posts
-
-    Allowed requests:
-        `GET` => Admin user
-    """
-
-    queryset = PostDislike.objects.all()
-    serializer_class = PostDislikeSerializer
-    authentication_classes = (TokenAuthentication,)
-    permission_classes = (permissions.IsAdminUser,)
-
-
-class CommentApiViewSet(viewsets.ModelViewSet):
+class CommentApiViewSet(OptimizedQuerysetMixin, viewsets.ModelViewSet):
     """
     API endpoints for Comments.
     All admin user can get and delete comments
@@ -332,30 +363,17 @@ class CommentApiViewSet(viewsets.ModelViewSet):
         return [permission() for permission in permission_classes]
 
 
-class CommentLikeViewSet(viewsets.ReadOnlyModelViewSet):
-    """
-    Readonly API endpoint for working on "Likes" given to Comments
-
-    Allowed requests:
-        `GET` => Staff user
-    """
-
-    queryset = CommentLike.objects.all()
-    serializer_class = CommentLikeSerializer
-    authentication_classes = (TokenAuthentication,)
-    permission_classes = (permissions.IsAdminUser,)
-
-
-class CommentDislikeViewSet(viewsets.ReadOnlyModelViewSet):
+class ReactionViewSet(OptimizedQuerysetMixin, viewsets.ReadOnlyModelViewSet):
     """
-    Readonly API endpoint for working on "Dislikes" given to Comments
+    Readonly API endpoint for working on "Likes" and "Dislikes" given to
+    Posts and Comments
 
     Allowed requests:
         `GET` => Staff user
     """
 
-    queryset = CommentDislike.objects.all()
-    serializer_class = CommentDislikeSerializer
+    queryset = Reaction.objects.all()
+    serializer_class = ReactionSerializer
     authentication_classes = (TokenAuthentication,)
     permission_classes = (permissions.IsAdminUser,)
 
@@ -1,5 +1,6 @@
 from knox.auth import TokenAuthentication
 from rest_framework import viewsets, permissions
+from core.utils.optimizer import OptimizedQuerysetMixin
 from ..serializers.photos import (
     PhotoSerializer,
     GallerySerializer,
@@ -7,7 +8,7 @@ from ..serializers.photos import (
 from photos.models import Photo, Gallery
 
 
-class PhotoApiViewSet(viewsets.ModelViewSet):
+class PhotoApiViewSet(OptimizedQuerysetMixin, viewsets.ModelViewSet):
     """
     API endpoint for working on Photos.
     All photos are controlled with this API.
@@ -27,7 +28,7 @@ class PhotoApiViewSet(viewsets.ModelViewSet):
     permission_classes = (permissions.IsAdminUser,)
 
 
-class GalleryApiViewSet(viewsets.ModelViewSet):
+class GalleryApiViewSet(OptimizedQuerysetMixin, viewsets.ModelViewSet):
     """
     API endpoint for working on Gallery.
 
@@ -2,11 +2,12 @@ from knox.auth import TokenAuthentication
 from rest_framework import viewsets
 from rest_framework import permissions
 
+from core.utils.optimizer import OptimizedQuerysetMixin
 from ..serializers.stories import StorySerializer, StoryContentSerializer
 from stories.models import Story, StoryContent
 
 
-class StoryViewSet(viewsets.ModelViewSet):
+class StoryViewSet(OptimizedQuerysetMixin, viewsets.ModelViewSet):
     """
     API endpoint for working on Stories.
 
@@ -24,7 +25,7 @@ class StoryViewSet(viewsets.ModelViewSet):
     authentication_classes = (TokenAuthentication,)
 
 
-class StoryContentViewSet(viewsets.ModelViewSet):
+class StoryContentViewSet(OptimizedQuerysetMixin, viewsets.ModelViewSet):
     """
     API endpoint for working on Story Contents.
 
@@ -7,6 +7,7 @@ from knox.models import AuthToken
 from knox.auth import TokenAuthentication
 
 from user.models import AuthorSocialMediaAccounts
+from core.utils.optimizer import OptimizedQuerysetMixin
 from ..serializers.user import (
     PrivateUserSerializer,
     LoginSerializer,
@@ -38,7 +39,7 @@ class ChoiceApiView(generics.ListAPIView):
         })
 
 
-class PrivateUserApiView(viewsets.ModelViewSet):
+class PrivateUserApiView(OptimizedQuerysetMixin, viewsets.ModelViewSet):
     """
     API endpoint for `retrieve`, `update` and `delete` users.
     In order to add/update `saved news` or `preferred categories`, pass `ID`s
@@ -61,7 +62,7 @@ class PrivateUserApiView(viewsets.ModelViewSet):
     def list(self, request, *args, **kwargs):
 
         serializer = self.get_serializer_class()
-        page = self.paginate_queryset(self.queryset)
+        page = self.paginate_queryset(self.get_queryset())
         serialized_data = serializer(page, many=True)
 
         return self.get_paginated_response(serialized_data.data)
@@ -107,7 +108,7 @@ class PrivateUserAddAPIView(generics.CreateAPIView):
     permission_classes = (IsCustomAdminUser,)
 
 
-class AuthorSocialMediaViewSet(viewsets.ModelViewSet):
+class AuthorSocialMediaViewSet(OptimizedQuerysetMixin, viewsets.ModelViewSet):
     """
     API endpoint for Social Media Accounts of Website's Authors.
     Author field for `POST`, `PUT`, `PATCH` request methods is hidden.
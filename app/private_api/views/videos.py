@@ -1,10 +1,11 @@
 from knox.auth import TokenAuthentication
 from rest_framework import viewsets, permissions
 from videos.models import Video
+from core.utils.optimizer import OptimizedQuerysetMixin
 from ..serializers.videos import VideoSerializer
 
 
-class VideoApiViewSet(viewsets.ModelViewSet):
+class VideoApiViewSet(OptimizedQuerysetMixin, viewsets.ModelViewSet):
     """
     API endpoints for working on Videos
 
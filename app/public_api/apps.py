@@ -0,0 +1,8 @@
+from django.apps import AppConfig
+
+
+class PublicApiConfig(AppConfig):
+    name = 'public_api'
+
+    def ready(self):
+        import public_api.signals
@@ -0,0 +1,140 @@
+import base64
+import json
+from collections import OrderedDict
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from django.utils.translation import gettext_lazy as _
+from rest_framework import pagination
+from rest_framework.exceptions import NotFound
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class PostKeysetPagination(pagination.BasePagination):
+    """
+    Keyset pagination of posts over (`publish_date`, `id`), newest first.
+
+    The cursor is the position of the last post of a page, so a page is
+    fetched with an indexed range condition instead of an offset, and no
+    `COUNT(*)` is run: a deep page costs the same as the first one.
+
+    Response:
+        {
+            "next": <url of the next page or null>,
+            "data": [<posts>]
+        }
+    """
+
+    page_size = 10
+    max_page_size = 50
+    page_size_query_param = 'page_size'
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = _('Invalid cursor')
+    # the page is ordered by this field, then by `id`, both descending
+    ordering_field = 'publish_date'
+    # path the next page is linked to, the requested URL by default
+    url = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        page_size = self.get_page_size(request)
+        field = self.ordering_field
+
+        queryset = queryset.order_by('-' + field, '-id')
+        position = self.decode_cursor(request)
+        if position is not None:
+            value, pk = position
+            queryset = queryset.filter(**{field + '__lte': value}).filter(
+                Q(**{field + '__lt': value}) |
+                Q(**{field: value, 'id__lt': pk})
+            )
+
+        # one more post tells whether there is a next page
+        page = list(queryset[:page_size + 1])
+        self.has_next = len(page) > page_size
+        page = page[:page_size]
+        self.last = page[-1] if page else None
+        return page
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri(self.url)
+        cursor = self.encode_cursor(
+            getattr(self.last, self.ordering_field), self.last.id
+        )
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('data', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {
+                    'type': 'string',
+                    'nullable': True,
+                },
+                'data': schema,
+            },
+        }
+
+    def dump_value(self, value):
+        return value.isoformat()
+
+    def load_value(self, value):
+        """ Ordering value of a cursor, raises ValueError if invalid """
+
+        value = parse_datetime(value)
+        if value is None:
+            raise ValueError(value)
+        return value
+
+    def encode_cursor(self, value, pk):
+        position = json.dumps([self.dump_value(value), pk])
+        return base64.urlsafe_b64encode(position.encode()).decode()
+
+    def decode_cursor(self, request):
+        """
+        :return: (ordering value, id) of the last post of the previous page,
+            None for the first page
+        """
+        cursor = request.query_params.get(self.cursor_query_param)
+        if not cursor:
+            return None
+        try:
+            value, pk = json.loads(
+                base64.urlsafe_b64decode(cursor.encode()).decode()
+            )
+            return self.load_value(value), int(pk)
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+
+class SearchKeysetPagination(PostKeysetPagination):
+    """
+    Keyset pagination of search results over (`rank`, `id`),
+    best match first
+    """
+
+    ordering_field = 'rank'
+
+    def dump_value(self, value):
+        return value
+
+    def load_value(self, value):
+        return float(value)
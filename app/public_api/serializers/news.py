@@ -1,5 +1,5 @@
-from django.forms import model_to_dict
 from django.contrib.auth import get_user_model
+from django.db.models import Manager
 
 from rest_framework import serializers
 from drf_yasg.utils import swagger_serializer_method
@@ -10,12 +10,18 @@ from news.models import (
     PostIdentifier,
     Category,
     Comment,
-    CommentLike,
-    CommentDislike,
 )
-
-from .photos import PublicPhotoSerializer
-from ..utils.utils import get_comment_count_tool
+from news.categories import get_category
+from news.leads import lead_contents, select_lead_contents
+from news.related import get_related_posts
+
+from .photos import ImageVariantsField, PublicPhotoSerializer
+from ..utils.comments import (
+    load_comment_tree,
+    iter_comment_tree,
+    get_comment_count,
+)
+from ..utils.viewer import ViewerFlagField
 
 USER = get_user_model()
 
@@ -59,6 +65,7 @@ class PublicAuthorSerializer(serializers.ModelSerializer):
     """
     Author serializer for author field on Post Model Serializer
     """
+    avatar_variants = ImageVariantsField()
 
     class Meta:
         model = USER
@@ -69,6 +76,7 @@ class PublicAuthorSerializer(serializers.ModelSerializer):
             'first_name',
             'last_name',
             'avatar',
+            'avatar_variants',
         )
 
 
@@ -99,29 +107,22 @@ class PublicUserModelSerializer(serializers.ModelSerializer):
 
 class PublicContentListSerializer(serializers.ListSerializer):
     """
-    Overriding 'to_representation" method on Content serializer
-    to filter queryset
+    The lead blocks of a post only (see `news.leads`). With
+    `core.utils.optimizer` the lead blocks of all posts are prefetched
+    with one query, otherwise the blocks of the post are loaded and the
+    lead ones are picked.
     """
 
+    @staticmethod
+    def restrict_queryset(queryset):
+        return lead_contents(queryset)
+
     def to_representation(self, data):
-        data = data.filter(content_type="Main Text", ordering=1)
+        if isinstance(data, Manager):
+            data = data.all()
         return super(
             PublicContentListSerializer, self
-        ).to_representation(data=data)
-
-
-# -----------------------------------------------------------------------------
-
-
-class PublicContentFilteredModelSerializer(serializers.ModelSerializer):
-    """
-    Content serializer for content field on Post List Model Serializer
-    """
-
-    class Meta:
-        model = Content
-        fields = '__all__'
-        list_serializer_class = PublicContentListSerializer
+        ).to_representation(data=select_lead_contents(data))
 
 
 # -----------------------------------------------------------------------------
@@ -147,6 +148,19 @@ class PublicContentModelSerializer(serializers.ModelSerializer):
         )
 
 
+# -----------------------------------------------------------------------------
+
+
+class PublicContentFilteredModelSerializer(PublicContentModelSerializer):
+    """
+    Content serializer for content field on Post List Model Serializer,
+    the lead blocks of the post only
+    """
+
+    class Meta(PublicContentModelSerializer.Meta):
+        list_serializer_class = PublicContentListSerializer
+
+
 # ========================== Comment Serializers ==============================
 
 
@@ -154,6 +168,8 @@ class PublicChildCommentModelSerializer(serializers.ModelSerializer):
     """ Child Model Serializer for Comment Model Serializer """
 
     commented_by = PublicUserModelSerializer()
+    is_liked_by_auth_user = ViewerFlagField('liked_comments')
+    is_disliked_by_auth_user = ViewerFlagField('disliked_comments')
 
     class Meta:
         model = Comment
@@ -177,20 +193,17 @@ class PublicChildCommentModelSerializer(serializers.ModelSerializer):
 
 
 class PublicCommentModelSerializer(serializers.ModelSerializer):
-    """ Comment Model Serializer for Post Detail Model Serializer """
+    """
+    Comment Model Serializer for Post Detail Model Serializer.
+    Expects comments loaded by `load_comment_tree`.
+    """
 
-    reply = serializers.SerializerMethodField(read_only=True)
+    reply = PublicChildCommentModelSerializer(
+        source='replies', many=True, read_only=True
+    )
     commented_by = PublicUserModelSerializer()
-
-    def get_reply(self, obj):
-        queryset = Comment.objects.filter(
-            is_approved=True, replied_comment=obj.id
-        )
-        request = self.context.get('request')
-        serializer = PublicChildCommentModelSerializer(
-            queryset, many=True, context={"request": request}
-        )
-        return serializer.data
+    is_liked_by_auth_user = ViewerFlagField('liked_comments')
+    is_disliked_by_auth_user = ViewerFlagField('disliked_comments')
 
     class Meta:
         model = Comment
@@ -253,12 +266,23 @@ class PublicRelatedPostListModelSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Post
+        fields = (
+            'id',
+            'title',
+            'slug',
+            'title_type',
+            'publish_date',
+            'views',
+        )
+        read_only_fields = fields
 
 
 class PublicPostListModelSerializer(serializers.ModelSerializer):
     """ Post List Model Serializer """
 
-    content = PublicContentModelSerializer(source='post_content', many=True)
+    content = PublicContentFilteredModelSerializer(
+        source='post_content', many=True
+    )
     keyword = PublicKeywordModelSerializer(required=False)
     category = serializers.PrimaryKeyRelatedField(many=True, read_only=True)
     author = PublicAuthorSerializer()
@@ -298,56 +322,37 @@ class PublicPostDetailModelSerializer(serializers.ModelSerializer):
     comment = serializers.SerializerMethodField(read_only=True)
     comment_count = serializers.SerializerMethodField(read_only=True)
     related_posts_list = serializers.SerializerMethodField(read_only=True)
+    is_liked_by_auth_user = ViewerFlagField('liked_posts')
+    is_disliked_by_auth_user = ViewerFlagField('disliked_posts')
+    is_saved_by_auth_user = ViewerFlagField('saved_posts')
 
     @swagger_serializer_method(serializer_or_field=serializers.IntegerField)
     def get_comment_count(self, post):
         """ Get total count of comments on a post and their replies """
 
-        return get_comment_count_tool(post)
+        return get_comment_count(post)
 
+    @swagger_serializer_method(
+        serializer_or_field=PublicRelatedPostListModelSerializer(many=True)
+    )
     def get_related_posts_list(self, obj):
-        related_category = [category.id for category in obj.category.all()]
-        posts = Post.objects.filter(
-            category__in=related_category,
-        ).exclude(id=obj.id)[:12]
-        request = self.context.get('request')
-        serializer = PublicPostListModelSerializer(
-            posts, context={"request": request}, many=True
+        """ Related posts from the precomputed index, in rank order """
+
+        fields = PublicRelatedPostListModelSerializer.Meta.fields
+        serializer = PublicRelatedPostListModelSerializer(
+            get_related_posts(obj, fields=fields), many=True
         )
         return serializer.data
 
     def get_comment(self, obj):
-        comments = Comment.objects.filter(
-            replied_comment=None, post=obj.id, is_approved=True
-        )
-        all_comments = Comment.objects.filter(post=obj.id)
-        request = self.context.get('request')
-
-        for comment in all_comments:
-            if request.user.is_authenticated:
-                auth_user = request.user
-                liked_comments = CommentLike.objects.filter(
-                    user=auth_user, comment=comment
-                )
-                disliked_comments = CommentDislike.objects.filter(
-                    user=auth_user, comment=comment
-                )
-
-                if liked_comments.count() > 0:
-                    comment.is_liked_by_auth_user = True
-                else:
-                    comment.is_liked_by_auth_user = False
-                if disliked_comments.count() > 0:
-                    comment.is_disliked_by_auth_user = True
-                else:
-                    comment.is_disliked_by_auth_user = False
-
-            else:
-                comment.is_liked_by_auth_user = False
-                comment.is_disliked_by_auth_user = False
-            comment.save()
+        comments = load_comment_tree(obj)
+        viewer = self.context.get('viewer')
+        if viewer is not None:
+            viewer.load_comments([
+                comment.id for comment in iter_comment_tree(comments)
+            ])
         serializer = PublicCommentModelSerializer(
-            comments, context={"request": request}, many=True
+            comments, context=self.context, many=True
         )
         return serializer.data
 
@@ -425,5 +430,7 @@ class PublicCategoryListModelSerializer(serializers.ModelSerializer):
         )
 
     def get_child_categories(self, obj):
-        categories = Category.objects.filter(parent_category=obj.id)
-        return [model_to_dict(category) for category in categories]
+        """ Subcategories at any depth, from the cached category tree """
+
+        node = get_category(obj.id)
+        return node['child_category'] if node is not None else []
@@ -1,8 +1,52 @@
+from django.core.files.storage import default_storage
 from rest_framework import serializers
 from photos.models import Photo
 
 
+class ImageVariantsField(serializers.Field):
+    """
+    `srcset`-style map of the resized copies of an image, read from its
+    `<field>_variants` column (see `photos.derivatives`). Null until the
+    copies are built or when the file is not an image:
+
+        {
+            "width": 4000,
+            "height": 3000,
+            "thumbnail": "http://.../variants/press-thumbnail.webp",
+            "srcset": {
+                "480w": "http://.../variants/press-480w.webp",
+                "960w": "http://.../variants/press-960w.webp"
+            }
+        }
+    """
+
+    def __init__(self, **kwargs):
+        kwargs['read_only'] = True
+        super(ImageVariantsField, self).__init__(**kwargs)
+
+    def url(self, path):
+        url = default_storage.url(path)
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request else url
+
+    def to_representation(self, value):
+        if not value or 'width' not in value:
+            return None
+        variants = dict(value['variants'])
+        thumbnail = variants.pop('thumbnail', None)
+        return {
+            'width': value['width'],
+            'height': value['height'],
+            'thumbnail': thumbnail and self.url(thumbnail['path']),
+            'srcset': {
+                name: self.url(variant['path'])
+                for name, variant in variants.items()
+            },
+        }
+
+
 class PublicPhotoSerializer(serializers.ModelSerializer):
+    photo_variants = ImageVariantsField()
 
     class Meta:
         model = Photo
@@ -10,6 +54,7 @@ class PublicPhotoSerializer(serializers.ModelSerializer):
             'id',
             'title',
             'photo',
+            'photo_variants',
         )
         read_only_fields = (
             'id',
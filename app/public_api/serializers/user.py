@@ -2,8 +2,9 @@ from rest_framework import serializers
 from django.utils.translation import ugettext_lazy as _
 from django.contrib.auth import authenticate, password_validation
 from django.contrib.auth import get_user_model
+from core.utils.tools import sync_m2m
 from user.models import AuthorSocialMediaAccounts
-from .news import PublicPostListModelSerializer
+from .photos import ImageVariantsField
 
 User = get_user_model()
 
@@ -27,17 +28,9 @@ class PublicUserSerializer(serializers.ModelSerializer):
         )
 
     def update(self, instance, validated_data):
-        if validated_data.get('preferred_categories'):
-            categories = validated_data.pop('preferred_categories')
-            instance.preferred_categories.clear()
-            for each in categories:
-                instance.preferred_categories.add(each)
-
-        if validated_data.get('saved_news'):
-            saved_news = validated_data.pop('saved_news')
-            instance.saved_news.clear()
-            for each in saved_news:
-                instance.saved_news.add(each)
+        for field in ('preferred_categories', 'saved_news'):
+            if field in validated_data:
+                sync_m2m(instance, field, validated_data.pop(field))
 
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
@@ -182,12 +175,24 @@ class PublicAuthorSocialMediaAccountSerializer(serializers.ModelSerializer):
         )
 
 
+class PublicAuthorStatsSerializer(serializers.Serializer):
+    """ Annotated by `public_api.utils.authors.with_author_stats` """
+
+    post_count = serializers.IntegerField(read_only=True)
+    total_views = serializers.IntegerField(read_only=True)
+
+
 class PublicAuthorProfileSerializer(serializers.ModelSerializer):
-    post = PublicPostListModelSerializer(source='post_author', many=True)
+    """
+    Profile of an author with the stats of their published posts.
+    The posts are paged by the author posts endpoint.
+    """
     social_media = PublicAuthorSocialMediaAccountSerializer(
         source='social_account',
         many=True
     )
+    stats = PublicAuthorStatsSerializer(source='*', read_only=True)
+    avatar_variants = ImageVariantsField()
 
     class Meta:
         model = get_user_model()
@@ -198,8 +203,9 @@ class PublicAuthorProfileSerializer(serializers.ModelSerializer):
             'first_name',
             'last_name',
             'avatar',
+            'avatar_variants',
             'phone_number',
             'email',
             'social_media',
-            'post',
+            'stats',
         )
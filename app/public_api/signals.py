@@ -0,0 +1,46 @@
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+from news.models import Category, Content, HomePageSectionsSettings, Post
+from news.signals import posts_changed
+from .tasks import HOME_FEED_PENDING_KEY, rebuild_home_feed
+
+# seconds changes are collected before the home page is rebuilt
+HOME_FEED_DELAY = 5
+
+
+def schedule_home_feed_rebuild(**kwargs):
+    """
+    Rebuild the home page snapshot after the transaction, once for all
+    changes saved in the next `HOME_FEED_DELAY` seconds
+    """
+    # set on commit, a rolled back change must not hold back the rebuild
+    # of the changes saved after it
+    transaction.on_commit(queue_home_feed_rebuild)
+
+
+def queue_home_feed_rebuild():
+    if cache.add(HOME_FEED_PENDING_KEY, True, 60):
+        rebuild_home_feed.apply_async(countdown=HOME_FEED_DELAY)
+
+
+for model in (Post, Content, Category, HomePageSectionsSettings):
+    post_save.connect(
+        schedule_home_feed_rebuild, sender=model,
+        dispatch_uid='rebuild_home_feed_on_save_{}'.format(model._meta.label),
+    )
+    post_delete.connect(
+        schedule_home_feed_rebuild, sender=model,
+        dispatch_uid='rebuild_home_feed_on_delete_{}'.format(
+            model._meta.label
+        ),
+    )
+m2m_changed.connect(
+    schedule_home_feed_rebuild, sender=Post.category.through,
+    dispatch_uid='rebuild_home_feed_on_recategorize',
+)
+posts_changed.connect(
+    schedule_home_feed_rebuild,
+    dispatch_uid='rebuild_home_feed_on_bulk_write',
+)
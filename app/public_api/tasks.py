@@ -0,0 +1,15 @@
+from celery import shared_task
+from django.core.cache import cache
+
+from .utils.home import store_home_feed
+
+HOME_FEED_PENDING_KEY = 'home-feed:pending'
+
+
+@shared_task
+def rebuild_home_feed():
+    """ Rebuild the cached home page snapshot """
+
+    # changes saved from now on schedule a new rebuild
+    cache.delete(HOME_FEED_PENDING_KEY)
+    store_home_feed()
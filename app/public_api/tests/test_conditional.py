@@ -0,0 +1,119 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from news.counters import flush_views
+from news.models import Category, Comment, Post
+
+USER = get_user_model()
+
+POSTS_URL = reverse('public_api:public-post-list')
+CATEGORIES_URL = reverse('public_api:category-list')
+
+
+# counted in the memory of the test process, without queries
+@override_settings(VIEW_BUFFER='local')
+class ConditionalGetTests(APITestCase):
+    """ Read endpoints answer revalidation requests with 304 """
+
+    def setUp(self):
+        cache.clear()
+        self.author = USER.objects.create_user(email='author@user.com')
+        self.post = Post.objects.create(
+            title='Post', author=self.author, is_approved=True
+        )
+        self.detail_url = reverse(
+            'public_api:public-post-detail', kwargs={'pk': self.post.id}
+        )
+
+    @override_settings(RESPONSE_CACHE_TIMEOUT=0)
+    def test_post_detail_is_revalidated_with_one_query(self):
+        response = self.client.get(self.detail_url)
+        etag = response['ETag']
+        # related rows have no timestamp
+        self.assertFalse(response.has_header('Last-Modified'))
+
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                self.detail_url, HTTP_IF_NONE_MATCH=etag
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(response.content, b'')
+
+    def test_cached_response_is_revalidated_without_queries(self):
+        etag = self.client.get(POSTS_URL)['ETag']
+
+        with self.assertNumQueries(0):
+            response = self.client.get(POSTS_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_changes_change_the_etag(self):
+        etag = self.client.get(self.detail_url)['ETag']
+
+        Comment.objects.create(
+            post=self.post, commented_by=self.author, comment='Comment',
+        )
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+        etag = response['ETag']
+        self.post.title = 'Changed'
+        self.post.save()
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_categories_are_revalidated_with_last_modified(self):
+        Category.objects.create(title='Sport')
+        last_modified = self.client.get(CATEGORIES_URL)['Last-Modified']
+
+        response = self.client.get(
+            CATEGORIES_URL, HTTP_IF_MODIFIED_SINCE=last_modified
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_missing_post_has_no_validators(self):
+        url = reverse('public_api:public-post-detail', kwargs={'pk': 0})
+
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertFalse(response.has_header('ETag'))
+
+    def test_etag_depends_on_the_authenticated_user(self):
+        anonymous = self.client.get(self.detail_url)
+        self.assertIn('Authorization', anonymous['Vary'])
+        reader = USER.objects.create_user(email='reader@user.com')
+        self.client.force_authenticate(user=reader)
+
+        response = self.client.get(
+            self.detail_url, HTTP_IF_NONE_MATCH=anonymous['ETag']
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], anonymous['ETag'])
+        self.assertIn('Authorization', response['Vary'])
+
+        etag = response['ETag']
+        reader.saved_news.add(self.post)
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data['is_saved_by_auth_user'])
+
+    @override_settings(RESPONSE_CACHE_TIMEOUT=0)
+    def test_not_modified_post_is_viewed(self):
+        flush_views('news.post')
+        views = self.post.views
+        etag = self.client.get(self.detail_url)['ETag']
+
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        flush_views('news.post')
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.views, views + 2)
@@ -0,0 +1,97 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from news import feeds
+from news.models import Category, Post
+
+USER = get_user_model()
+
+FEED_URL = reverse('public_api:user-feed')
+
+
+class UserFeedTests(APITestCase):
+    """ Personalized feed merged from per-category recency lists """
+
+    def setUp(self):
+        cache.clear()
+        self.user = USER.objects.create_user(email='user@user.com')
+        self.sport = Category.objects.create(title='Sport')
+        self.football = Category.objects.create(
+            title='Football', parent_category=self.sport,
+        )
+        self.politics = Category.objects.create(title='Politics')
+        self.culture = Category.objects.create(title='Culture')
+        self.user.preferred_categories.add(self.sport)
+        self.user.favorite_category.add(self.politics)
+
+        now = timezone.now()
+        self.posts = []
+        for i, category in enumerate([
+            self.sport, self.football, self.politics, self.culture,
+            self.football, self.sport,
+        ]):
+            post = Post.objects.create(
+                title='Post {}'.format(i), author=self.user,
+                is_approved=True,
+                publish_date=now - timezone.timedelta(hours=i),
+            )
+            post.category.add(category)
+            self.posts.append(post)
+        # a post of two categories is listed once
+        self.posts[0].category.add(self.football)
+        self.client.force_authenticate(user=self.user)
+
+    def feed_ids(self, **params):
+        ids, url = [], FEED_URL
+        while url:
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            ids.extend(post['id'] for post in response.data['data'])
+            url, params = response.data['next'], None
+        return ids
+
+    def expected(self, *indexes):
+        return [self.posts[i].id for i in indexes]
+
+    def test_feed_of_the_categories(self):
+        self.assertEqual(
+            self.feed_ids(page_size=2), self.expected(0, 1, 2, 4, 5)
+        )
+
+    def test_saved_posts_are_excluded(self):
+        self.user.saved_news.add(self.posts[1])
+
+        self.assertEqual(self.feed_ids(), self.expected(0, 2, 4, 5))
+
+    def test_first_page_is_cached_until_the_user_changes(self):
+        self.feed_ids()
+        with self.assertNumQueries(0):
+            self.feed_ids()
+
+        self.user.preferred_categories.remove(self.sport)
+        self.assertEqual(self.feed_ids(), self.expected(2))
+
+    def test_deep_pages_are_read_from_the_database(self):
+        with mock.patch.object(feeds, 'CATEGORY_FEED_SIZE', 2):
+            self.assertEqual(
+                self.feed_ids(page_size=2), self.expected(0, 1, 2, 4, 5)
+            )
+
+    def test_no_categories(self):
+        self.user.preferred_categories.clear()
+        self.user.favorite_category.clear()
+
+        self.assertEqual(self.feed_ids(), [])
+
+    def test_anonymous(self):
+        self.client.force_authenticate(user=None)
+
+        response = self.client.get(FEED_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
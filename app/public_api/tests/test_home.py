@@ -0,0 +1,112 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from news.models import Category, HomePageSectionsSettings, Post
+from public_api.tasks import HOME_FEED_PENDING_KEY, rebuild_home_feed
+
+USER = get_user_model()
+
+HOME_URL = reverse('public_api:home-feed')
+
+
+class HomeFeedApiTests(APITestCase):
+    """ Home page sections served from a snapshot """
+
+    def setUp(self):
+        cache.clear()
+        self.author = USER.objects.create_user(email='author@user.com')
+        self.sport = Category.objects.create(title='Sport')
+        self.football = Category.objects.create(
+            title='Football', parent_category=self.sport,
+        )
+        self.politics = Category.objects.create(title='Politics')
+        HomePageSectionsSettings.objects.create(**{
+            section: self.politics
+            for section in (
+                'second_section', 'third_section', 'fourth_section',
+                'fifth_section', 'sixth_section',
+            )
+        }, first_section=self.sport)
+
+    def create_post(self, title, categories=(), **payload):
+        payload.setdefault('is_approved', True)
+        post = Post.objects.create(title=title, author=self.author, **payload)
+        post.category.add(*categories)
+        return post
+
+    def test_sections(self):
+        self.create_post('Top left', top_news=1)
+        self.create_post('Top left new', top_news=1)
+        self.create_post('Top right', top_news=2)
+        self.create_post('Choice', is_editors_choice=True)
+        self.create_post('Home', show_in_home_page=True)
+        self.create_post('Football', categories=(self.football,))
+        self.create_post(
+            'Hidden', categories=(self.football,), is_approved=False
+        )
+        rebuild_home_feed()
+
+        response = self.client.get(HOME_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        titles = {
+            name: [post['title'] for post in response.data[name]]
+            for name in ('top_news', 'editors_choice', 'home_page')
+        }
+        self.assertEqual(titles, {
+            'top_news': ['Top left new', 'Top right'],
+            'editors_choice': ['Choice'],
+            'home_page': ['Home'],
+        })
+        first_section = response.data['sections'][0]
+        self.assertEqual(first_section['section'], 'first_section')
+        self.assertEqual(first_section['category']['id'], self.sport.id)
+        self.assertEqual(
+            [post['title'] for post in first_section['posts']], ['Football']
+        )
+
+    def test_served_from_one_cache_read(self):
+        self.create_post('Home', show_in_home_page=True)
+        rebuild_home_feed()
+
+        with self.assertNumQueries(0):
+            response = self.client.get(HOME_URL)
+
+        self.assertEqual(response.data['home_page'][0]['title'], 'Home')
+
+    def test_rebuild_replaces_the_snapshot(self):
+        self.client.get(HOME_URL)
+
+        self.create_post('Home', show_in_home_page=True)
+        rebuild_home_feed()
+
+        response = self.client.get(HOME_URL)
+        self.assertEqual(len(response.data['home_page']), 1)
+
+    @override_settings(SITE_URL='https://news.example.com')
+    def test_file_urls_are_absolute(self):
+        self.create_post('Home', show_in_home_page=True)
+        USER.objects.filter(pk=self.author.pk).update(avatar='avatar.jpg')
+        rebuild_home_feed()
+
+        response = self.client.get(HOME_URL)
+
+        self.assertEqual(
+            response.data['home_page'][0]['author']['avatar'],
+            'https://news.example.com/media/avatar.jpg',
+        )
+
+    def test_rolled_back_change_schedules_no_rebuild(self):
+        try:
+            with transaction.atomic():
+                self.create_post('Home', show_in_home_page=True)
+                raise ValueError
+        except ValueError:
+            pass
+
+        self.assertIsNone(cache.get(HOME_FEED_PENDING_KEY))
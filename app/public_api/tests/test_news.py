@@ -1,14 +1,23 @@
+from datetime import timedelta
+
 from rest_framework import status
 from rest_framework.test import APITestCase
 from django.urls import reverse
 from django.contrib.auth import get_user_model
+from django.db import connection
+from django.utils import timezone
+from django.test.utils import CaptureQueriesContext
 from ..serializers.news import (
     PublicPostListModelSerializer,
     PublicPostDetailModelSerializer,
     PublicCommentCreateSerializer,
     PublicCategoryListModelSerializer,
 )
+from ..utils.comments import with_comment_count, get_comment_count
+from ..utils.viewer import ViewerState
 from news.models import Post, Category, PostIdentifier, Comment
+from news.options.tools import LIKE, DISLIKE
+from news.reactions import set_reaction
 
 
 POST_LIST_URL = reverse('public_api:public-post-list')
@@ -65,13 +74,16 @@ class PostListAndDetailApiTests(APITestCase):
         """
 
         serializer = PublicPostListModelSerializer(
-            Post.objects.filter(is_approved=True, status='Open'),
+            Post.objects.filter(
+                is_approved=True, status='Open'
+            ).order_by('-publish_date', '-id'),
             many=True
         )
         response = self.client.get(POST_LIST_URL)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data, serializer.data)
+        self.assertEqual(response.data['data'], serializer.data)
+        self.assertIsNone(response.data['next'])
 
     def test_api_returns_only_approved_post(self):
         """
@@ -89,6 +101,63 @@ class PostListAndDetailApiTests(APITestCase):
         self.assertEqual(response.data.get('id'), serializer.data.get('id'))
 
 
+class PostFeedPaginationTests(APITestCase):
+    """ Keyset pagination of the public post feed """
+
+    def setUp(self):
+        self.author = create_user(email='author@user.com')
+        same_time = timezone.now() - timedelta(hours=1)
+        self.posts = [
+            create_post(
+                title='Post {}'.format(i),
+                author=self.author,
+                is_approved=True,
+                publish_date=same_time if i < 3 else timezone.now(),
+            )
+            for i in range(5)
+        ]
+        create_post(title='Not approved', author=self.author)
+
+    def get_page(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data, queries
+
+    def test_pages_cover_the_feed_once_in_order(self):
+        expected = list(Post.objects.filter(is_approved=True).order_by(
+            '-publish_date', '-id'
+        ).values_list('id', flat=True))
+
+        url = POST_LIST_URL + '?page_size=2'
+        seen = []
+        while url:
+            data, _ = self.get_page(url)
+            self.assertLessEqual(len(data['data']), 2)
+            seen.extend(post['id'] for post in data['data'])
+            url = data['next']
+
+        # posts with the same publish date are ordered by id
+        self.assertEqual(seen, expected)
+
+    def test_deep_page_costs_the_same_as_first_page(self):
+        first_page, first_queries = self.get_page(
+            POST_LIST_URL + '?page_size=1'
+        )
+        url = first_page['next']
+        for _ in range(3):
+            page, queries = self.get_page(url)
+            url = page['next']
+
+        self.assertEqual(len(first_queries), len(queries))
+        for query in queries:
+            self.assertNotIn('COUNT(', query['sql'])
+
+    def test_invalid_cursor(self):
+        response = self.client.get(POST_LIST_URL + '?cursor=invalid')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
 class PostAndCommentApiTests(APITestCase):
     """
     Testing Post `like request` and `dislike request`
@@ -143,9 +212,12 @@ class PostAndCommentApiTests(APITestCase):
         self.user = create_user(**payload)
 
         # add user to dislike list
-        self.test_post.post_dislike.user.add(self.user)
+        set_reaction(self.test_post, self.user, DISLIKE)
+        self.test_post.refresh_from_db()
         self.assertEqual(self.test_post.dislike_count, 1)
-        self.assertIn(self.user, self.test_post.post_dislike.user.all())
+        self.assertTrue(self.test_post.reactions.filter(
+            user=self.user, value=DISLIKE
+        ).exists())
 
         # `post-like-request` url
         self.post_like_request_url = reverse(
@@ -215,10 +287,13 @@ class PostAndCommentApiTests(APITestCase):
             path=self.post_like_request_url
         )
 
+        self.test_post.refresh_from_db()
         self.assertEqual(self.test_post.dislike_count, 0)
         self.assertEqual(self.test_post.like_count, 1)
         self.assertEqual(like_response.status_code, status.HTTP_200_OK)
-        self.assertIn(self.user, self.test_post.post_like.user.all())
+        self.assertTrue(self.test_post.reactions.filter(
+            user=self.user, value=LIKE
+        ).exists())
 
     def test_post_dislike_request_successful(self):
         """
@@ -235,10 +310,13 @@ class PostAndCommentApiTests(APITestCase):
             path=self.post_dislike_request_url
         )
 
+        self.test_post.refresh_from_db()
         self.assertEqual(self.test_post.like_count, 0)
         self.assertEqual(self.test_post.dislike_count, 1)
         self.assertEqual(dislike_request.status_code, status.HTTP_200_OK)
-        self.assertIn(self.user, self.test_post.post_dislike.user.all())
+        self.assertTrue(self.test_post.reactions.filter(
+            user=self.user, value=DISLIKE
+        ).exists())
 
     def test_comment_create_request_authenticated_user_only(self):
         """
@@ -525,12 +603,12 @@ class CommentLikeDislikeRequestApiTests(APITestCase):
             'public_api:public-dislike_request',
             kwargs={'pk': self.test_comment.id}
         )
-        self.test_comment.comment_dislike.user.add(self.test_user)
+        set_reaction(self.test_comment, self.test_user, DISLIKE)
+        self.test_comment.refresh_from_db()
         self.assertEqual(self.test_comment.dislike_count, 1)
-        self.assertIn(
-            self.test_user,
-            self.test_comment.comment_dislike.user.all()
-        )
+        self.assertTrue(self.test_comment.reactions.filter(
+            user=self.test_user, value=DISLIKE
+        ).exists())
 
     def test_comment_like_request_authenticated_user_only(self):
         """
@@ -556,13 +634,13 @@ class CommentLikeDislikeRequestApiTests(APITestCase):
             path=self.comment_like_request_url,
             content_type='application/json',
         )
+        self.test_comment.refresh_from_db()
         self.assertEqual(self.test_comment.dislike_count, 0)
         self.assertEqual(self.test_comment.like_count, 1)
         self.assertEqual(like_response.status_code, status.HTTP_200_OK)
-        self.assertIn(
-            self.test_user,
-            self.test_comment.comment_like.user.all()
-        )
+        self.assertTrue(self.test_comment.reactions.filter(
+            user=self.test_user, value=LIKE
+        ).exists())
 
     def test_comment_dislike_request_authenticated_user_only(self):
         """
@@ -591,12 +669,213 @@ class CommentLikeDislikeRequestApiTests(APITestCase):
         dislike_request = self.client.patch(
             self.comment_dislike_request_url
         )
+        self.test_comment.refresh_from_db()
         self.assertEqual(self.test_comment.like_count, 0)
         self.assertEqual(self.test_comment.dislike_count, 1)
         self.assertEqual(dislike_request.status_code, status.HTTP_200_OK)
-        self.assertIn(
-            self.test_user,
-            self.test_comment.comment_dislike.user.all()
+        self.assertTrue(self.test_comment.reactions.filter(
+            user=self.test_user, value=DISLIKE
+        ).exists())
+
+
+class PostViewerStateApiTests(APITestCase):
+    """
+    `is_liked_by_auth_user`, `is_disliked_by_auth_user` and
+    `is_saved_by_auth_user` flags are computed per request user
+    """
+
+    def setUp(self):
+        author = create_user(email='author@user.com')
+        self.post = create_post(
+            title='Viewer state', author=author, is_approved=True
+        )
+        self.comment = create_comment(
+            post=self.post,
+            commented_by=author,
+            comment='first comment',
+            is_approved=True,
+        )
+        self.reply = create_comment(
+            post=self.post,
+            replied_comment=self.comment,
+            commented_by=author,
+            comment='reply',
+            is_approved=True,
+        )
+        self.first_user = create_user(email='first@user.com')
+        self.second_user = create_user(email='second@user.com')
+
+        set_reaction(self.post, self.first_user, LIKE)
+        set_reaction(self.post, self.second_user, DISLIKE)
+        self.first_user.saved_news.add(self.post)
+        set_reaction(self.reply, self.first_user, LIKE)
+        set_reaction(self.comment, self.second_user, DISLIKE)
+
+        self.url = reverse(
+            'public_api:public-post-detail', kwargs={'pk': self.post.id}
+        )
+
+    def test_flags_belong_to_the_request_user(self):
+        self.client.force_authenticate(user=self.first_user)
+        data = self.client.get(self.url).data
+        comment = data['comment'][0]
+        self.assertTrue(data['is_liked_by_auth_user'])
+        self.assertFalse(data['is_disliked_by_auth_user'])
+        self.assertTrue(data['is_saved_by_auth_user'])
+        self.assertFalse(comment['is_disliked_by_auth_user'])
+        self.assertTrue(comment['reply'][0]['is_liked_by_auth_user'])
+
+        self.client.force_authenticate(user=self.second_user)
+        data = self.client.get(self.url).data
+        comment = data['comment'][0]
+        self.assertFalse(data['is_liked_by_auth_user'])
+        self.assertTrue(data['is_disliked_by_auth_user'])
+        self.assertFalse(data['is_saved_by_auth_user'])
+        self.assertTrue(comment['is_disliked_by_auth_user'])
+        self.assertFalse(comment['reply'][0]['is_liked_by_auth_user'])
+
+    def test_anonymous_user_flags_are_false(self):
+        data = self.client.get(self.url).data
+
+        self.assertFalse(data['is_liked_by_auth_user'])
+        self.assertFalse(data['is_saved_by_auth_user'])
+        self.assertFalse(data['comment'][0]['is_disliked_by_auth_user'])
+
+    def test_retrieve_does_not_update_posts_and_comments(self):
+        self.client.force_authenticate(user=self.first_user)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.url)
+
+        writes = [query['sql'] for query in queries
+                  if query['sql'].startswith('UPDATE')]
+        self.assertEqual(writes, [])
+
+
+class CommentTreeLoaderTests(APITestCase):
+    """
+    Comments of a post are loaded and serialized with a fixed number of
+    queries, no matter how many comments and reactions the post has
+    """
+
+    def setUp(self):
+        self.author = create_user(email='author@user.com')
+        self.reader = create_user(email='reader@user.com')
+        self.post = create_post(
+            title='Comment tree', author=self.author, is_approved=True
+        )
+
+    def add_comments(self, count):
+        for i in range(count):
+            comment = create_comment(
+                post=self.post,
+                commented_by=self.author,
+                comment='comment {}'.format(i),
+                is_approved=True,
+            )
+            reply = create_comment(
+                post=self.post,
+                replied_comment=comment,
+                commented_by=self.reader,
+                comment='reply {}'.format(i),
+                is_approved=True,
+            )
+            set_reaction(comment, self.reader, LIKE)
+            set_reaction(reply, self.author, DISLIKE)
+
+    def serialize_comments(self):
+        viewer = ViewerState(self.reader)
+        serializer = PublicPostDetailModelSerializer(
+            self.post, context={'viewer': viewer}
+        )
+        return serializer.fields['comment'].to_representation(self.post)
+
+    def count_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.serialize_comments()
+        return len(queries)
+
+    def test_query_count_does_not_grow_with_comments(self):
+        self.add_comments(2)
+        few_comments = self.count_queries()
+
+        self.add_comments(20)
+        many_comments = self.count_queries()
+
+        self.assertEqual(few_comments, many_comments)
+
+    def test_comment_tree(self):
+        self.add_comments(2)
+        create_comment(
+            post=self.post,
+            commented_by=self.author,
+            comment='not approved',
+        )
+        data = self.serialize_comments()
+
+        self.assertEqual(len(data), 2)
+        self.assertEqual(data[0]['comment'], 'comment 0')
+        self.assertEqual(data[0]['like_count'], 1)
+        self.assertTrue(data[0]['is_liked_by_auth_user'])
+        self.assertEqual(len(data[0]['reply']), 1)
+        self.assertEqual(data[0]['reply'][0]['comment'], 'reply 0')
+        self.assertEqual(data[0]['reply'][0]['dislike_count'], 1)
+        self.assertFalse(data[0]['reply'][0]['is_disliked_by_auth_user'])
+
+
+class CommentCountTests(APITestCase):
+    """
+    Comment counts of posts are computed by the database, not by looping
+    over comments and replies
+    """
+
+    def setUp(self):
+        self.staff = create_user(email='staff@user.com', is_staff=True)
+        self.posts = [
+            create_post(title='Post {}'.format(i), author=self.staff)
+            for i in range(3)
+        ]
+        self.list_url = reverse('private_api:post-list')
+
+    def add_comments(self, post, count):
+        for i in range(count):
+            comment = create_comment(
+                post=post, commented_by=self.staff, comment='comment'
+            )
+            # replies are counted whether they point to the post or not
+            create_comment(
+                post=post if i % 2 else None,
+                replied_comment=comment,
+                commented_by=self.staff,
+                comment='reply',
+            )
+
+    def test_annotated_count_matches_post_comments(self):
+        self.add_comments(self.posts[0], 3)
+        self.add_comments(self.posts[1], 1)
+
+        posts = with_comment_count(
+            Post.objects.filter(id__in=[post.id for post in self.posts])
+        ).order_by('id')
+        self.assertEqual([post.comment_count for post in posts], [6, 2, 0])
+        self.assertEqual(get_comment_count(self.posts[0]), 6)
+
+    def test_post_list_query_count_does_not_grow_with_comments(self):
+        self.client.force_authenticate(user=self.staff)
+
+        with CaptureQueriesContext(connection) as few_comments:
+            self.client.get(self.list_url)
+
+        for post in self.posts:
+            self.add_comments(post, 5)
+
+        with CaptureQueriesContext(connection) as many_comments:
+            response = self.client.get(self.list_url)
+
+        self.assertEqual(len(few_comments), len(many_comments))
+        self.assertEqual(
+            [post['comment_count'] for post in response.data['results']],
+            [10, 10, 10],
         )
 
 
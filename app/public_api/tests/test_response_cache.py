@@ -0,0 +1,136 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from core.models import Settings
+from news.counters import get_buffer
+from news.models import Comment, Post
+from news.options.tools import LIKE
+from news.reactions import set_reaction
+
+USER = get_user_model()
+
+POSTS_URL = reverse('public_api:public-post-list')
+SETTINGS_URL = reverse('public_api:settings')
+
+
+# counted in the memory of the test process, without queries
+@override_settings(VIEW_BUFFER='local')
+class ResponseCacheTests(APITestCase):
+    """ Anonymous public responses are cached until their data changes """
+
+    def setUp(self):
+        cache.clear()
+        self.author = USER.objects.create_user(email='author@user.com')
+        self.post = Post.objects.create(
+            title='Post', author=self.author, is_approved=True
+        )
+        self.detail_url = reverse(
+            'public_api:public-post-detail', kwargs={'pk': self.post.id}
+        )
+
+    def test_cached_response_runs_no_queries(self):
+        response = self.client.get(POSTS_URL)
+
+        with self.assertNumQueries(0):
+            cached = self.client.get(POSTS_URL)
+
+        self.assertEqual(cached.status_code, 200)
+        self.assertEqual(cached.data, response.data)
+
+    def test_query_string_is_normalized(self):
+        self.client.get(POSTS_URL + '?page_size=5&cursor=')
+
+        with self.assertNumQueries(0):
+            self.client.get(POSTS_URL + '?cursor=&page_size=5')
+
+    def test_saving_a_post_invalidates_the_list(self):
+        self.client.get(POSTS_URL)
+
+        self.post.title = 'Changed'
+        self.post.save()
+        response = self.client.get(POSTS_URL)
+
+        self.assertEqual(response.data['data'][0]['title'], 'Changed')
+
+    def test_comments_and_reactions_invalidate_the_detail(self):
+        self.client.get(self.detail_url)
+        self.client.get(POSTS_URL)
+
+        Comment.objects.create(
+            post=self.post, commented_by=self.author, comment='Comment',
+            is_approved=True,
+        )
+        response = self.client.get(self.detail_url)
+        self.assertEqual(response.data['comment_count'], 1)
+
+        set_reaction(self.post, self.author, LIKE)
+        response = self.client.get(self.detail_url)
+        self.assertEqual(response.data['like_count'], 1)
+
+        # the list does not show them and stays cached
+        with self.assertNumQueries(0):
+            self.client.get(POSTS_URL)
+
+    def test_users_invalidate_the_posts_showing_them(self):
+        reader = USER.objects.create_user(email='reader@user.com')
+        Comment.objects.create(
+            post=self.post, commented_by=reader, comment='Comment',
+            is_approved=True,
+        )
+        self.client.get(POSTS_URL)
+        self.client.get(self.detail_url)
+
+        # a commenter changes the detail of the commented post only
+        reader.first_name = 'Reader'
+        reader.save()
+        with self.assertNumQueries(0):
+            self.client.get(POSTS_URL)
+        response = self.client.get(self.detail_url)
+        self.assertEqual(
+            response.data['comment'][0]['commented_by']['full_name'],
+            'Reader ',
+        )
+
+        # a new user or a password change shows nowhere
+        USER.objects.create_user(email='new@user.com')
+        reader.set_password('secret')
+        reader.save(update_fields=['password'])
+        with self.assertNumQueries(0):
+            self.client.get(self.detail_url)
+
+        self.author.first_name = 'Author'
+        self.author.save()
+        response = self.client.get(POSTS_URL)
+        self.assertEqual(
+            response.data['data'][0]['author']['first_name'], 'Author'
+        )
+
+    def test_cache_hit_records_a_view(self):
+        self.client.get(self.detail_url)
+        self.client.get(self.detail_url)
+
+        hits = get_buffer()._hits['news.post']
+        self.assertEqual(hits[self.post.id], 2)
+
+    def test_authenticated_requests_are_not_cached(self):
+        self.client.get(self.detail_url)
+
+        self.client.force_authenticate(user=self.author)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.detail_url)
+
+        self.assertGreater(len(queries), 0)
+        self.assertFalse(response.data['is_liked_by_auth_user'])
+
+    def test_settings_are_invalidated_on_save(self):
+        self.client.get(SETTINGS_URL)
+
+        Settings.objects.create(copyright='Copyright')
+        response = self.client.get(SETTINGS_URL)
+
+        self.assertEqual(len(response.data), 1)
@@ -484,6 +484,47 @@ class AuthorProfileApiTests(APITestCase):
         response = self.client.get(self.url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
+    def test_author_profile_stats_and_first_page_of_posts(self):
+        """
+        Profiles show the stats of the published posts of the author,
+        the retrieved profile also their first page
+        """
+        self.user.is_staff = True
+        self.user.save()
+        posts = [
+            create_post(title='Post {}'.format(i), author=self.user,
+                        is_approved=True, views=10)
+            for i in range(12)
+        ]
+        create_post(title='Not approved', author=self.user, views=100)
+        create_post(title='Closed', author=self.user, is_approved=True,
+                    status='Closed', views=100)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(
+            response.data['stats'], {'post_count': 12, 'total_views': 120}
+        )
+        page = response.data['post']
+        self.assertEqual(
+            [post['id'] for post in page['data']],
+            [post.id for post in reversed(posts[2:])],
+        )
+        self.assertIn(
+            reverse('public_api:author-posts', kwargs={'pk': self.user.id}),
+            page['next'],
+        )
+        response = self.client.get(page['next'])
+        self.assertEqual(
+            [post['id'] for post in response.data['data']],
+            [posts[1].id, posts[0].id],
+        )
+
+        response = self.client.get(reverse('public_api:author-profile'))
+        author, = response.data
+        self.assertEqual(author['stats']['post_count'], 12)
+        self.assertNotIn('post', author)
+
 
 class PublicAuthorPostsApiTests(APITestCase):
 
@@ -564,3 +605,39 @@ class PublicAuthorPostsApiTests(APITestCase):
             len(response.data.get('data')),
             self.get_valid_posts_count(self.post_data_list)
         )
+
+
+class PublicUserSavedPostsApiTests(APITestCase):
+    """ Saved posts of the authenticated user """
+
+    def setUp(self):
+        self.user = create_user(email='user@example.com')
+        self.sport = Category.objects.create(title='Sport')
+        self.posts = []
+        for i in range(3):
+            post = create_post(title='Post {}'.format(i), author=self.user)
+            self.posts.append(post)
+            self.user.saved_news.add(post)
+        self.posts[0].category.add(self.sport)
+        self.url = reverse('public_api:saved-posts')
+
+    def test_saved_posts_are_paginated(self):
+        self.client.force_authenticate(user=self.user)
+
+        response = self.client.get(self.url, {'page_size': 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['data']), 2)
+
+        response = self.client.get(response.data['next'])
+        self.assertEqual(len(response.data['data']), 1)
+        self.assertIsNone(response.data['next'])
+
+    def test_saved_posts_filtered_by_category(self):
+        self.client.force_authenticate(user=self.user)
+
+        response = self.client.get(self.url, {'category': self.sport.id})
+
+        self.assertEqual(
+            [post['id'] for post in response.data['data']],
+            [self.posts[0].id],
+        )
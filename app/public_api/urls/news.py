@@ -2,14 +2,23 @@ from django.urls import path
 
 from ..views.news import (
     PublicPostViewSet,
+    PublicPostSearchAPIView,
+    TrendingPostsApiView,
     CommentViewSet,
     CategoryListApiView,
+    HomeFeedApiView,
 )
 
 POST_URL_PATTERNS = [
     path('posts/',
          PublicPostViewSet.as_view(actions={"get": "list"}),
          name='public-post-list'),
+    path('posts/search/',
+         PublicPostSearchAPIView.as_view(),
+         name='public-post-search'),
+    path('posts/trending/',
+         TrendingPostsApiView.as_view(),
+         name='public-post-trending'),
     path('posts/<int:pk>/',
          PublicPostViewSet.as_view(actions={'get': 'retrieve'}),
          name='public-post-detail'),
@@ -43,5 +52,9 @@ CATEGORY_URL_PATTERNS = [
     path('categories/', CategoryListApiView.as_view(), name='category-list'),
 ]
 
+HOME_URL_PATTERNS = [
+    path('home/', HomeFeedApiView.as_view(), name='home-feed'),
+]
+
 urlpatterns = [] + POST_URL_PATTERNS + COMMENT_URL_PATTERNS +\
-              CATEGORY_URL_PATTERNS
+              CATEGORY_URL_PATTERNS + HOME_URL_PATTERNS
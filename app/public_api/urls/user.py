@@ -24,4 +24,5 @@ urlpatterns = [
          name='author-posts'),
     path('saved-posts/', views.PublicUserSavedPostsAPIView.as_view(),
          name='saved-posts'),
+    path('feed/', views.PublicUserFeedAPIView.as_view(), name='user-feed'),
 ]
@@ -0,0 +1,18 @@
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import Coalesce
+
+# posts shown to the public
+PUBLISHED = Q(post_author__is_live=True)
+
+
+def with_author_stats(queryset):
+    """
+    Annotate users with the `post_count` and the `total_views` of their
+    published posts, computed with the users by one grouped query
+
+    :param queryset: User queryset
+    """
+    return queryset.annotate(
+        post_count=Count('post_author', filter=PUBLISHED),
+        total_views=Coalesce(Sum('post_author__views', filter=PUBLISHED), 0),
+    )
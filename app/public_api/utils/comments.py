@@ -0,0 +1,79 @@
+from django.db.models import F, Func, IntegerField, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+
+from news.models import Comment
+
+
+def load_comment_tree(post, approved_only=True):
+    """
+    Load comments of a post and their replies with a single query.
+
+    Every comment comes with its author (`commented_by`).
+    Replies are attached to their parent comment as a `replies` list.
+
+    :param post: Post object or id
+    :param approved_only: skip comments which are not approved
+    :return: list of top level comments, ordered by post date
+    """
+    queryset = Comment.objects.filter(
+        Q(post=post) | Q(replied_comment__post=post)
+    )
+    if approved_only:
+        queryset = queryset.filter(is_approved=True)
+    queryset = queryset.select_related('commented_by').order_by(
+        'post_date', 'id'
+    )
+
+    comments = {comment.id: comment for comment in queryset}
+    tree = []
+    for comment in comments.values():
+        comment.replies = []
+    for comment in comments.values():
+        if comment.replied_comment_id is None:
+            tree.append(comment)
+        elif comment.replied_comment_id in comments:
+            comments[comment.replied_comment_id].replies.append(comment)
+    return tree
+
+
+def iter_comment_tree(tree):
+    """ Iterate over all comments of a tree returned by `load_comment_tree` """
+
+    for comment in tree:
+        yield comment
+        yield from iter_comment_tree(comment.replies)
+
+
+def comment_count():
+    """
+    Subquery counting comments of the outer Post and their replies
+    """
+    return Coalesce(Subquery(
+        Comment.objects.filter(
+            Q(post=OuterRef('pk')) | Q(replied_comment__post=OuterRef('pk'))
+        ).order_by().annotate(
+            total=Func(F('id'), function='COUNT')
+        ).values('total'),
+        output_field=IntegerField(),
+    ), 0)
+
+
+def with_comment_count(queryset):
+    """
+    Annotate every Post of the queryset with `comment_count`,
+    computed by the database in the same query
+    """
+    return queryset.annotate(comment_count=comment_count())
+
+
+def get_comment_count(post):
+    """
+    Count of comments on a post and their replies.
+    The `comment_count` annotation is used when the post comes from
+    `with_comment_count`, otherwise it is counted with one query.
+    """
+    if hasattr(post, 'comment_count'):
+        return post.comment_count
+    return Comment.objects.filter(
+        Q(post=post) | Q(replied_comment__post=post)
+    ).count()
@@ -0,0 +1,147 @@
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+
+from core.utils.cache import get_cache_versions
+
+
+class NotModified(Exception):
+    """ Raised by `initial` to answer with the given 304 response """
+
+    def __init__(self, response):
+        self.response = response
+
+
+class ConditionalGetMixin:
+    """
+    `ETag` / `Last-Modified` validators for list and retrieve requests.
+
+    Validators are computed from the rows the response is built from,
+    with one aggregate query: the latest `last_modified_field` and the
+    number of rows (which changes when a row is deleted). Views using
+    `CachedResponseMixin` use their cache versions instead of the count,
+    they are bumped by deletions and by changes of related rows
+    (comments, contents, ...) as well.
+
+    Responses to authenticated users show their reactions and saved posts,
+    their `ETag` also depends on the user and the `user:<id>` cache
+    version, and responses vary by `Authorization`.
+
+    A matching `If-None-Match` / `If-Modified-Since` is answered with
+    `304 Not Modified` before the view runs, nothing is serialized. The
+    side effects of the view (`cache_hit`, e.g. counting the view) are
+    run anyway.
+
+    `Last-Modified` is only sent when `conditional_last_modified` is set,
+    i.e. when the response shows nothing but the rows of the queryset,
+    otherwise a change of a related row would not be seen by a client
+    revalidating with `If-Modified-Since`.
+    """
+
+    last_modified_field = 'updated_at'
+    conditional_last_modified = True
+
+    def initial(self, request, *args, **kwargs):
+        super(ConditionalGetMixin, self).initial(request, *args, **kwargs)
+        self.validators = None
+        if request.method not in ('GET', 'HEAD'):
+            return
+        if self.get_conditional_action() is None:
+            return
+
+        self.validators = self.get_validators()
+        if self.validators is None:
+            return
+        etag, last_modified = self.validators
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified,
+        )
+        if response is not None:
+            self.cache_hit(request, *args, **kwargs)
+            raise NotModified(response)
+
+    def handle_exception(self, exc):
+        if isinstance(exc, NotModified):
+            return exc.response
+        return super(ConditionalGetMixin, self).handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super(ConditionalGetMixin, self).finalize_response(
+            request, response, *args, **kwargs
+        )
+        if (request.method in ('GET', 'HEAD')
+                and self.get_conditional_action() is not None):
+            patch_vary_headers(response, ('Authorization',))
+        validators = getattr(self, 'validators', None)
+        if validators is not None and response.status_code in (200, 304):
+            etag, last_modified = validators
+            response['ETag'] = etag
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(last_modified)
+        return response
+
+    def cache_hit(self, request, *args, **kwargs):
+        """ Hook for side effects of the view, e.g. counting views """
+
+    def get_conditional_action(self):
+        """ `list`, `retrieve` or None if the request has no validators """
+
+        # generic list views have no `action`
+        action = getattr(self, 'action', 'list')
+        if action in ('list', 'retrieve'):
+            return action
+        return None
+
+    def get_validator_queryset(self):
+        """ Rows of the response, the detail request filters one object """
+
+        queryset = self.filter_queryset(self.get_queryset())
+        if self.get_conditional_action() == 'retrieve':
+            lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+            queryset = queryset.filter(
+                **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+            )
+        return queryset
+
+    def get_validators(self):
+        """
+        :return: (etag, last modified timestamp or None),
+            None if there are no validators (e.g. the object does not exist)
+        """
+        versioned = hasattr(self, 'cache_versions')
+        aggregates = {'last_modified': Max(self.last_modified_field)}
+        if not versioned:
+            aggregates['count'] = Count('pk')
+        try:
+            state = self.get_validator_queryset().order_by().aggregate(
+                **aggregates
+            )
+        except (TypeError, ValueError):
+            # a malformed lookup, the view answers it
+            return None
+
+        last_modified = state['last_modified']
+        if self.get_conditional_action() == 'retrieve' and not last_modified:
+            # not found
+            return None
+
+        names = self.cache_versions(**self.kwargs) if versioned else []
+        user = self.request.user
+        if user.is_authenticated:
+            state['user'] = user.pk
+            names.append('user:{}'.format(user.pk))
+        if names:
+            versions = get_cache_versions(names)
+            state['versions'] = '.'.join(str(version) for version in versions)
+        tag = ':'.join(
+            value.isoformat() if hasattr(value, 'isoformat') else str(value)
+            for _, value in sorted(state.items())
+        )
+        etag = quote_etag(hashlib.md5(tag.encode()).hexdigest())
+
+        if not self.conditional_last_modified or last_modified is None:
+            return etag, None
+        # HTTP dates have a precision of one second
+        return etag, int(last_modified.timestamp())
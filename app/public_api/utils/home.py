@@ -0,0 +1,140 @@
+"""
+Home page snapshot.
+
+Every section of the home page (top news, editor's choice, posts shown
+in the home page and the category sections of `HomePageSectionsSettings`)
+is built in the background by `public_api.tasks.rebuild_home_feed` and stored
+serialized in the cache, so the home page is served with one cache read.
+
+Snapshot:
+    {
+        "top_news": [<posts by top news position>],
+        "editors_choice": [<posts>],
+        "home_page": [<posts>],
+        "sections": [
+            {
+                "section": "first_section",
+                "category": {"id": 1, "title": "Sport"},
+                "posts": [<posts>]
+            },
+            ...
+        ],
+        "built_at": "2020-01-01T00:00:00Z"
+    }
+
+The snapshot is built without a request, the URLs of the files it shows
+are made absolute with `settings.SITE_URL`.
+"""
+from urllib.parse import urljoin
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from core.utils.optimizer import optimize_queryset
+from news.categories import filter_by_category
+from news.models import HomePageSectionsSettings, Post
+from news.related import published_posts
+from ..serializers.news import PublicPostListModelSerializer
+
+HOME_FEED_KEY = 'home-feed'
+
+# posts of every list of the home page
+SECTION_SIZE = 6
+
+HOME_SECTIONS = (
+    'right_corner_section',
+    'first_section',
+    'second_section',
+    'third_section',
+    'fourth_section',
+    'fifth_section',
+    'sixth_section',
+    'seventh_section',
+)
+
+
+class SiteRequest:
+    """ Stands for the request in the serializer context of the snapshot """
+
+    def build_absolute_uri(self, location):
+        return urljoin(settings.SITE_URL, location)
+
+
+def _latest(queryset, count=SECTION_SIZE):
+    return list(queryset.order_by(
+        '-publish_date', '-id'
+    ).values_list('id', flat=True)[:count])
+
+
+def build_home_feed():
+    """
+    Build the snapshot from the database. The ids of every list are
+    selected first, then all posts are loaded and serialized once.
+    """
+    posts = published_posts()
+    lists = {
+        # the latest post of every top news position
+        'top_news': list(posts.filter(top_news__isnull=False).order_by(
+            'top_news', '-publish_date', '-id'
+        ).distinct('top_news').values_list('id', flat=True)),
+        'editors_choice': _latest(posts.filter(is_editors_choice=True)),
+        'home_page': _latest(posts.filter(show_in_home_page=True)),
+    }
+
+    section_settings = HomePageSectionsSettings.objects.select_related(
+        *HOME_SECTIONS
+    ).first()
+    sections = []
+    for section in HOME_SECTIONS:
+        category = getattr(section_settings, section, None)
+        if category is None:
+            continue
+        sections.append((
+            section, category, _latest(filter_by_category(posts, category.id))
+        ))
+
+    ids = {pk for post_ids in lists.values() for pk in post_ids}
+    for _, _, post_ids in sections:
+        ids.update(post_ids)
+    queryset = optimize_queryset(
+        Post.objects.filter(id__in=ids), PublicPostListModelSerializer
+    )
+    serialized = {
+        post['id']: post
+        for post in PublicPostListModelSerializer(
+            queryset, many=True, context={'request': SiteRequest()},
+        ).data
+    }
+
+    def serialize(post_ids):
+        return [serialized[pk] for pk in post_ids if pk in serialized]
+
+    feed = {name: serialize(post_ids) for name, post_ids in lists.items()}
+    feed['sections'] = [
+        {
+            'section': section,
+            'category': {'id': category.id, 'title': category.title},
+            'posts': serialize(post_ids),
+        }
+        for section, category, post_ids in sections
+    ]
+    feed['built_at'] = timezone.now().isoformat()
+    return feed
+
+
+def store_home_feed():
+    """ Build the snapshot and replace the cached one """
+
+    feed = build_home_feed()
+    cache.set(HOME_FEED_KEY, feed, None)
+    return feed
+
+
+def get_home_feed():
+    """ The cached snapshot, built in the request if there is none yet """
+
+    feed = cache.get(HOME_FEED_KEY)
+    if feed is None:
+        feed = store_home_feed()
+    return feed
@@ -0,0 +1,131 @@
+import hashlib
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date_safe
+from rest_framework.response import Response
+
+from core.utils.cache import get_cache_versions
+
+RESPONSE_KEY = 'response:{path}:{query}:{versions}'
+# response headers cached with the data
+CACHED_HEADERS = ('ETag', 'Last-Modified')
+
+
+class CachedResponseMixin:
+    """
+    Cache the data of successful anonymous `GET` responses.
+
+    Responses are keyed by path, normalized query string and the cache
+    versions of the data they show (`cache_versions`). The signals in
+    `core.signals` bump the versions when the data changes, so a cached
+    response is served until something it shows is saved or deleted.
+
+    Requests of authenticated users are never cached, their responses may
+    depend on the user. The validators set by `ConditionalGetMixin` are
+    cached with the data, so a cached response is revalidated without
+    a query.
+
+    Usage:
+        class PostViewSet(CachedResponseMixin, viewsets.ModelViewSet):
+            cache_groups = ('posts',)
+            cache_object_prefix = 'post'
+    """
+
+    # versions of the data shown by every response of the view
+    cache_groups = ()
+    # detail responses also depend on the version of their own object,
+    # e.g. `post:<pk>`
+    cache_object_prefix = None
+
+    def dispatch(self, request, *args, **kwargs):
+        if not self.is_cacheable(request, *args, **kwargs):
+            return super(CachedResponseMixin, self).dispatch(
+                request, *args, **kwargs
+            )
+
+        key = self.get_response_cache_key(request, **kwargs)
+        cached = cache.get(key)
+        if cached is not None:
+            return self.cached_response(request, *cached, *args, **kwargs)
+
+        response = super(CachedResponseMixin, self).dispatch(
+            request, *args, **kwargs
+        )
+        if response.status_code == 200 and hasattr(response, 'data'):
+            headers = {
+                header: response[header]
+                for header in CACHED_HEADERS if response.has_header(header)
+            }
+            cache.set(
+                key, (response.data, headers), settings.RESPONSE_CACHE_TIMEOUT
+            )
+        return response
+
+    def is_cacheable(self, request, *args, **kwargs):
+        if not settings.RESPONSE_CACHE_TIMEOUT or request.method != 'GET':
+            return False
+        # token authentication runs a query, a request with credentials is
+        # never anonymous anyway
+        if 'HTTP_AUTHORIZATION' in request.META:
+            return False
+        self.args = args
+        self.kwargs = kwargs
+        return not self.initialize_request(
+            request, *args, **kwargs
+        ).user.is_authenticated
+
+    def cache_versions(self, **kwargs):
+        names = list(self.cache_groups)
+        if self.cache_object_prefix and 'pk' in kwargs:
+            names.append(
+                '{}:{}'.format(self.cache_object_prefix, kwargs['pk'])
+            )
+        return names
+
+    def get_response_cache_key(self, request, **kwargs):
+        query = urlencode(sorted(
+            (name, value)
+            for name, values in request.GET.lists()
+            for value in values
+        ))
+        versions = get_cache_versions(self.cache_versions(**kwargs))
+        return RESPONSE_KEY.format(
+            path=request.path,
+            query=hashlib.md5(query.encode()).hexdigest(),
+            versions='.'.join(str(version) for version in versions),
+        )
+
+    def cached_response(self, request, data, headers, *args, **kwargs):
+        """
+        Render cached data like a response of the view, without
+        authenticating the request or running the view
+        """
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+        self.format_kwarg = self.get_format_suffix(**kwargs)
+
+        self.cache_hit(request, *args, **kwargs)
+        response = None
+        if headers:
+            response = get_conditional_response(
+                request,
+                etag=headers.get('ETag'),
+                last_modified=parse_http_date_safe(
+                    headers.get('Last-Modified', '')
+                ),
+            )
+        if response is None:
+            response = Response(data)
+        for header, value in headers.items():
+            response[header] = value
+        self.response = self.finalize_response(
+            request, response, *args, **kwargs
+        )
+        return self.response
+
+    def cache_hit(self, request, *args, **kwargs):
+        """ Hook for side effects of the view, e.g. counting views """
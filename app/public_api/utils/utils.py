@@ -1,18 +1,6 @@
 from rest_framework.exceptions import ValidationError
 
 
-def get_comment_count_tool(post):
-    """
-    Get count of direct comments on a post and their replies
-    """
-    direct_comment_count = post.post_commented.count()
-    replied_comments_count = 0
-    for count in post.post_commented.all():
-        for _ in count.reply.all():
-            replied_comments_count += 1
-    return direct_comment_count + replied_comments_count
-
-
 def name_validation(value, error_message_1, error_message_2):
     """
     Validation function for Contact Form
@@ -0,0 +1,93 @@
+from rest_framework import serializers
+
+from news.models import Reaction
+from news.options.tools import LIKE
+
+
+class ViewerState:
+    """
+    Reactions and saved posts of the request user.
+
+    The state is loaded for a whole batch of posts or comments with one
+    query per relation, and read by `ViewerFlagField` while serializing.
+    Nothing is written to the Post or Comment rows.
+
+    Usage:
+        >> viewer = ViewerState(request.user)
+        >> viewer.load_posts([post.id])
+        >> viewer.load_comments(Comment.objects.filter(post=post))
+        >> serializer = Serializer(post, context={'viewer': viewer, ...})
+    """
+
+    def __init__(self, user):
+        self.user = user
+        self.liked_posts = set()
+        self.disliked_posts = set()
+        self.saved_posts = set()
+        self.liked_comments = set()
+        self.disliked_comments = set()
+
+    @property
+    def is_authenticated(self):
+        return self.user is not None and self.user.is_authenticated
+
+    def load_posts(self, posts):
+        """
+        :param posts: list of Post ids or a Post queryset
+        """
+        if not self.is_authenticated:
+            return self
+
+        self._load_reactions(
+            'post', posts, self.liked_posts, self.disliked_posts
+        )
+        self.saved_posts.update(self.user.saved_news.filter(
+            id__in=posts,
+        ).values_list('id', flat=True))
+        return self
+
+    def load_comments(self, comments):
+        """
+        :param comments: list of Comment ids or a Comment queryset
+        """
+        if not self.is_authenticated:
+            return self
+
+        self._load_reactions(
+            'comment', comments, self.liked_comments, self.disliked_comments
+        )
+        return self
+
+    def _load_reactions(self, target_field, targets, liked, disliked):
+        reactions = Reaction.objects.filter(**{
+            'user': self.user,
+            '{}__in'.format(target_field): targets,
+        }).values_list('{}_id'.format(target_field), 'value')
+
+        for target_id, value in reactions:
+            if value == LIKE:
+                liked.add(target_id)
+            else:
+                disliked.add(target_id)
+
+
+class ViewerFlagField(serializers.BooleanField):
+    """
+    Read only field, returns True if the object's id is in the given set
+    of the `viewer` (ViewerState) found in the serializer context.
+
+    Example:
+        is_liked_by_auth_user = ViewerFlagField('liked_posts')
+    """
+
+    def __init__(self, flag, **kwargs):
+        self.flag = flag
+        kwargs['source'] = 'pk'
+        kwargs['read_only'] = True
+        super(ViewerFlagField, self).__init__(**kwargs)
+
+    def to_representation(self, value):
+        viewer = self.context.get('viewer')
+        if viewer is None:
+            return False
+        return value in getattr(viewer, self.flag)
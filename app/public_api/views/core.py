@@ -1,5 +1,7 @@
 from rest_framework import generics
 from rest_framework import permissions
+from core.utils.optimizer import OptimizedQuerysetMixin
+from ..utils.response_cache import CachedResponseMixin
 from ..serializers.core import (
     PublicSettingsSerializer,
     PublicSocialMediaSerializer,
@@ -9,16 +11,19 @@ from ..serializers.core import (
 from core.models import Settings, SocialMedia
 
 
-class SettingsAPIView(generics.ListAPIView):
+class SettingsAPIView(CachedResponseMixin, OptimizedQuerysetMixin,
+                      generics.ListAPIView):
     """ Public API endpoint for getting list of Settings data """
 
     serializer_class = PublicSettingsSerializer
     authentication_classes = []
     permission_classes = [permissions.AllowAny]
     queryset = Settings.objects.all()
+    cache_groups = ('settings',)
 
 
-class SocialMediaListAPIView(generics.ListAPIView):
+class SocialMediaListAPIView(CachedResponseMixin, OptimizedQuerysetMixin,
+                             generics.ListAPIView):
     """
     Public API endpoints for getting list of Social Media accounts
     """
@@ -27,6 +32,7 @@ class SocialMediaListAPIView(generics.ListAPIView):
     authentication_classes = []
     permission_classes = [permissions.AllowAny]
     queryset = SocialMedia.objects.all()
+    cache_groups = ('settings',)
 
 
 class ContactFormCreateAPIView(generics.CreateAPIView):
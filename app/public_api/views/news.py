@@ -1,4 +1,5 @@
 from django.contrib.auth import get_user_model
+from django.db.models import FloatField, Value
 
 from rest_framework import generics, status
 from rest_framework import viewsets
@@ -13,13 +14,22 @@ from news.models import (
     Post,
     Category,
     Comment,
-    CommentLike,
-    CommentDislike,
-    PostLike,
-    PostDislike,
 )
-
+from news.categories import filter_by_category, get_category_tree
+from news.counters import record_view, record_view_of
+from news.options.tools import LIKE, DISLIKE
+from news.reactions import set_reaction
+from news.search import search_posts
+from news.trending import get_trending_ids
+
+from core.utils.optimizer import OptimizedQuerysetMixin
+from ..pagination import PostKeysetPagination, SearchKeysetPagination
 from ..permissions import CommentOwner, CommentOwnerOrIsAdmin
+from ..utils.comments import with_comment_count
+from ..utils.conditional import ConditionalGetMixin
+from ..utils.home import get_home_feed
+from ..utils.response_cache import CachedResponseMixin
+from ..utils.viewer import ViewerState
 from ..serializers.news import (
     PublicPostListModelSerializer,
     PublicPostDetailModelSerializer,
@@ -34,57 +44,59 @@ User = get_user_model()
 # =========================== Post API Views ==================================
 
 
-class PublicPostViewSet(viewsets.ModelViewSet):
+class PublicPostViewSet(CachedResponseMixin, ConditionalGetMixin,
+                        OptimizedQuerysetMixin, viewsets.ModelViewSet):
     """
     Public API endpoint for `retrieving` a Post, getting `list` of Posts,
      and for making `Post Like` and `Post Dislike` request.
-    Retrieve only those which have status 'OPEN', and Approved by Editor
+    Retrieve only the live ones: 'OPEN', approved by Editor and inside
+     their publishing window (see `news.publishing`)
+    The list is filtered by `?category=<id>`, including the subcategories.
 
     Allowed Requests:
         `GET` => All users
     """
-    queryset = Post.objects.filter(
-        status='Open', is_approved=True
-    )
+    queryset = Post.objects.filter(is_live=True)
     authentication_classes = (TokenAuthentication,)
+    pagination_class = PostKeysetPagination
+    cache_groups = ('posts',)
+    cache_object_prefix = 'post'
+    # posts show their comments, contents, author, ...
+    conditional_last_modified = False
+
+    def get_queryset(self):
+        queryset = super(PublicPostViewSet, self).get_queryset()
+        if self.action == 'retrieve':
+            queryset = with_comment_count(
+                queryset.select_related('related_index')
+            )
+        elif self.action == 'list':
+            category = self.request.query_params.get('category')
+            if category and category.isdigit():
+                queryset = filter_by_category(queryset, int(category))
+        return queryset
+
+    def get_validator_queryset(self):
+        # validators need neither the comment count nor the related posts
+        queryset = self.filter_queryset(self.queryset.all())
+        if self.action == 'retrieve':
+            queryset = queryset.filter(pk=self.kwargs['pk'])
+        return queryset
 
     def retrieve(self, request, pk):
         post = self.get_object()
-        post.views = post.views + 1
-
-        if request.user.is_authenticated:
-            auth_user = self.request.user
-            liked_posts = PostLike.objects.filter(user=auth_user, post=post)
-            disliked_posts = PostDislike.objects.filter(user=auth_user,
-                                                        post=post)
-            saved_posts = self.request.user.saved_news.filter(id=post.id)
-
-            if liked_posts.count() > 0:
-                post.is_liked_by_auth_user = True
-            else:
-                post.is_liked_by_auth_user = False
-
-            if disliked_posts.count() > 0:
-                post.is_disliked_by_auth_user = True
-            else:
-                post.is_disliked_by_auth_user = False
-
-            if saved_posts.count() > 0:
-                post.is_saved_by_auth_user = True
-            else:
-                post.is_saved_by_auth_user = False
-        else:
-            post.is_liked_by_auth_user = False
-            post.is_disliked_by_auth_user = False
-            post.is_saved_by_auth_user = False
-
-        post.save()
+        record_view(post)
 
+        viewer = ViewerState(request.user).load_posts([post.id])
         serializer = PublicPostDetailModelSerializer(
-            post, context={"request": self.request}
+            post, context={"request": self.request, "viewer": viewer}
         )
         return Response(serializer.data)
 
+    def cache_hit(self, request, *args, **kwargs):
+        if 'pk' in kwargs:
+            record_view_of(Post._meta.label_lower, kwargs['pk'])
+
     def get_serializer_class(self):
         if self.action == 'list':
             return PublicPostListModelSerializer
@@ -107,24 +119,13 @@ class PublicPostViewSet(viewsets.ModelViewSet):
             url_path='posts/pk/like/', url_name='public-post-like-request')
     def like_request(self, request, *args, **kwargs):
         """
-        Get authenticated user, add to users field in PostLike model, and
-        remove from PostDislike model, if it exists.
+        Like the post by the authenticated user, replacing the user's
+        dislike, if it exists.
         """
 
         if request.user.is_authenticated:
-            post = self.get_object()
-
-            # get Post Dislike models
-            obj_dislike = PostDislike.objects.all()
-
-            # if request user is among the ones who disliked the same post,
-            # remove from disliked users list
-            if obj_dislike.filter(post=post.id, user=request.user.id):
-                post.post_dislike.user.remove(request.user)
-
-            # add request user and save
-            post.post_like.user.add(request.user)
-            post.post_like.save()
+            # upsert the reaction and update the counts in one statement
+            set_reaction(self.get_object(), request.user, LIKE)
 
             return Response(
                 {'message': 'Like request was successful'},
@@ -148,24 +149,13 @@ class PublicPostViewSet(viewsets.ModelViewSet):
             url_name='public-post-dislike-request')
     def dislike_request(self, request, *args, **kwargs):
         """
-        Get authenticated user, add to users field in PostDislike model, and
-        remove from PostLike model if it exists
+        Dislike the post by the authenticated user, replacing the user's
+        like, if it exists.
         """
 
         if request.user.is_authenticated:
-            post = self.get_object()
-
-            # get Post Like models
-            obj_like = PostLike.objects.all()
-
-            # if request user is among the ones who liked the same post,
-            # remove from liked users list
-            if obj_like.filter(post=post.id, user=request.user.id):
-                post.post_like.user.remove(request.user)
-
-            # add request user and save
-            post.post_dislike.user.add(request.user)
-            post.post_dislike.save()
+            # upsert the reaction and update the counts in one statement
+            set_reaction(self.get_object(), request.user, DISLIKE)
 
             return Response(
                 {'message': 'Dislike request was successful'},
@@ -180,10 +170,78 @@ class PublicPostViewSet(viewsets.ModelViewSet):
         )
 
 
+class PublicPostSearchAPIView(CachedResponseMixin, OptimizedQuerysetMixin,
+                              generics.ListAPIView):
+    """
+    Public API endpoint for the full-text search of Posts, `?q=<query>`.
+    Posts matching all words of the query are listed by relevance.
+
+    Allowed Requests:
+        `GET` => All users
+    """
+    queryset = Post.objects.filter(is_live=True)
+    serializer_class = PublicPostListModelSerializer
+    authentication_classes = []
+    permission_classes = (AllowAny,)
+    pagination_class = SearchKeysetPagination
+    cache_groups = ('posts',)
+
+    def get_queryset(self):
+        queryset = super(PublicPostSearchAPIView, self).get_queryset()
+        query = self.request.query_params.get('q', '').strip()
+        if not query:
+            return queryset.annotate(
+                rank=Value(0.0, output_field=FloatField())
+            ).none()
+        return search_posts(queryset, query)
+
+
+class TrendingPostsApiView(CachedResponseMixin, OptimizedQuerysetMixin,
+                           generics.ListAPIView):
+    """
+    Public API endpoint for the trending posts, read from the precomputed
+    rankings of `news.trending`. `?category=<id>` lists the posts of the
+    category and its subcategories, `?count=` posts are listed
+    (10 by default, 50 at most).
+
+    Allowed Requests:
+        `GET` => All users
+    """
+    queryset = Post.objects.filter(is_live=True)
+    serializer_class = PublicPostListModelSerializer
+    authentication_classes = []
+    permission_classes = (AllowAny,)
+    pagination_class = None
+    cache_groups = ('posts', 'trending')
+    default_count = 10
+    max_count = 50
+
+    def get_count(self):
+        try:
+            count = int(self.request.query_params['count'])
+        except (KeyError, ValueError):
+            return self.default_count
+        if count <= 0:
+            return self.default_count
+        return min(count, self.max_count)
+
+    def list(self, request, *args, **kwargs):
+        category = request.query_params.get('category')
+        ids = get_trending_ids(
+            int(category) if category and category.isdigit() else None,
+            self.get_count(),
+        )
+        posts = self.get_queryset().in_bulk(ids)
+        serializer = self.get_serializer(
+            [posts[pk] for pk in ids if pk in posts], many=True
+        )
+        return Response(serializer.data)
+
+
 # ========================== Comment API Views ================================
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(OptimizedQuerysetMixin, viewsets.ModelViewSet):
     """
     Public API endpoint for commenting on a post, making like / dislike request
     on a comment.
@@ -279,24 +337,13 @@ class CommentViewSet(viewsets.ModelViewSet):
             url_name='like-request')
     def like_request(self, request, *args, **kwargs):
         """
-        Get authenticated user, add to users field in CommentLike model,
-        and remove from CommentDislike model, if it exists
+        Like the comment by the authenticated user, replacing the user's
+        dislike, if it exists.
         """
 
         if request.user.is_authenticated:
-            comment = self.get_object()
-
-            # get Comment Dislike models
-            obj_dislike = CommentDislike.objects.all()
-
-            # if request user is among the ones who liked the same comment,
-            # remove from disliked users list
-            if obj_dislike.filter(comment=comment.id, user=request.user.id):
-                comment.comment_dislike.user.remove(request.user)
-
-            # add request user and save
-            comment.comment_like.user.add(request.user)
-            comment.comment_like.save()
+            # upsert the reaction and update the counts in one statement
+            set_reaction(self.get_object(), request.user, LIKE)
 
             return Response(
                 {'message': 'Like request was successful'},
@@ -320,24 +367,13 @@ class CommentViewSet(viewsets.ModelViewSet):
             url_name='dislike-request')
     def dislike_request(self, request, *args, **kwargs):
         """
-        Get authenticated user, add to users field in CommentDislike model,
-        and remove from CommentLike model, if it exists.
+        Dislike the comment by the authenticated user, replacing the user's
+        like, if it exists.
         """
 
         if request.user.is_authenticated:
-            comment = self.get_object()
-
-            # get Comment Dislike models
-            obj_like = CommentLike.objects.all()
-
-            # if request user is among the ones who disliked the same comment,
-            # remove from liked users list
-            if obj_like.filter(comment=comment.id, user=request.user.id):
-                comment.comment_like.user.remove(request.user)
-
-            # add request user and save
-            comment.comment_dislike.user.add(request.user)
-            comment.comment_dislike.save()
+            # upsert the reaction and update the counts in one statement
+            set_reaction(self.get_object(), request.user, DISLIKE)
 
             return Response(
                 {'message': 'Dislike request was successful'},
@@ -354,9 +390,11 @@ class CommentViewSet(viewsets.ModelViewSet):
 
 # -----------------------------------------------------------------------------
 
-class CategoryListApiView(generics.ListAPIView):
+class CategoryListApiView(CachedResponseMixin, ConditionalGetMixin,
+                          OptimizedQuerysetMixin, generics.ListAPIView):
     """
-    Public API endpoint for getting a list of News Categories
+    Public API endpoint for getting the tree of News Categories,
+    root categories with their `child_category` at any depth
 
     Allowed requests:
         `GET` => Any user
@@ -365,4 +403,27 @@ class CategoryListApiView(generics.ListAPIView):
     serializer_class = PublicCategoryListModelSerializer
     authentication_classes = []
     permission_classes = (AllowAny,)
-    queryset = Category.objects.filter(parent_category=None)
+    # validators cover the categories of every level
+    queryset = Category.objects.all()
+    cache_groups = ('categories',)
+
+    def list(self, request, *args, **kwargs):
+        return Response(get_category_tree())
+
+
+# -----------------------------------------------------------------------------
+
+class HomeFeedApiView(generics.GenericAPIView):
+    """
+    Public API endpoint for getting every section of the home page,
+    served from a snapshot rebuilt in the background
+
+    Allowed requests:
+        `GET` => Any user
+    """
+
+    authentication_classes = []
+    permission_classes = (AllowAny,)
+
+    def get(self, request, *args, **kwargs):
+        return Response(get_home_feed())
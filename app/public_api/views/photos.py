@@ -1,9 +1,14 @@
 from rest_framework import viewsets, permissions
+from core.utils.optimizer import OptimizedQuerysetMixin
+from ..utils.conditional import ConditionalGetMixin
+from ..utils.response_cache import CachedResponseMixin
 from ..serializers.photos import PublicPhotoSerializer
 from photos.models import Photo
 
 
-class PublicPhotoViewSet(viewsets.ReadOnlyModelViewSet):
+class PublicPhotoViewSet(CachedResponseMixin, ConditionalGetMixin,
+                         OptimizedQuerysetMixin,
+                         viewsets.ReadOnlyModelViewSet):
     """
     Readonly Public API endpoint for Photos
 
@@ -11,3 +16,4 @@ class PublicPhotoViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = Photo.objects.all()
     serializer_class = PublicPhotoSerializer
     permission_classes = (permissions.AllowAny,)
+    cache_groups = ('photos',)
@@ -1,12 +1,19 @@
 from rest_framework import viewsets, permissions
+from rest_framework.response import Response
+from news.counters import record_view, record_view_of
 from stories.models import Story, StoryContent
+from core.utils.optimizer import OptimizedQuerysetMixin
+from ..utils.conditional import ConditionalGetMixin
+from ..utils.response_cache import CachedResponseMixin
 from ..serializers.stories import (
     PublicStorySerializer,
     PublicStoryContentSerializer,
 )
 
 
-class PublicStoryViewSet(viewsets.ReadOnlyModelViewSet):
+class PublicStoryViewSet(CachedResponseMixin, ConditionalGetMixin,
+                         OptimizedQuerysetMixin,
+                         viewsets.ReadOnlyModelViewSet):
     """
     Readonly Public API endpoint for a Story
 
@@ -15,9 +22,21 @@ class PublicStoryViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = Story.objects.filter(status='ACTIVE')
     serializer_class = PublicStorySerializer
     permission_classes = (permissions.AllowAny,)
+    cache_groups = ('stories',)
 
+    def retrieve(self, request, *args, **kwargs):
+        story = self.get_object()
+        record_view(story)
+        serializer = self.get_serializer(story)
+        return Response(serializer.data)
 
-class StoryContentRetrieveAPIView(viewsets.ReadOnlyModelViewSet):
+    def cache_hit(self, request, *args, **kwargs):
+        if 'pk' in kwargs:
+            record_view_of(Story._meta.label_lower, kwargs['pk'])
+
+
+class StoryContentRetrieveAPIView(OptimizedQuerysetMixin,
+                                  viewsets.ReadOnlyModelViewSet):
     """
     Readonly Public API endpoint for Story Contents
 
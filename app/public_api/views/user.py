@@ -1,17 +1,28 @@
 from django.utils.translation import gettext_lazy as _
-from django.core.paginator import Paginator
 from django.contrib.auth import get_user_model
 
+from collections import OrderedDict
+
+from django.core.cache import cache
+from django.urls import reverse
 from rest_framework import viewsets
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework_jwt.settings import api_settings
 from rest_framework import generics, status
 from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 
 from knox.models import AuthToken
 from knox.auth import TokenAuthentication
 
+from news.categories import filter_by_category
+from news.feeds import feed_page
 from news.models import Post
+from news.related import published_posts
+from core.utils.cache import get_cache_versions
+from core.utils.optimizer import OptimizedQuerysetMixin, optimize_queryset
+from ..utils.authors import with_author_stats
+from ..pagination import PostKeysetPagination
 from ..serializers.news import PublicPostListModelSerializer
 
 from ..serializers.user import (
@@ -29,7 +40,7 @@ jwt_encode_handler = api_settings.JWT_ENCODE_HANDLER
 User = get_user_model()
 
 
-class PublicUserListAPIView(generics.ListAPIView):
+class PublicUserListAPIView(OptimizedQuerysetMixin, generics.ListAPIView):
     """
     Public API endpoint for getting a list of `Public` Users
     """
@@ -164,67 +175,152 @@ class PublicUserProfileAPIView(viewsets.ModelViewSet):
         )
 
 
-class AuthorProfileViewSet(viewsets.ReadOnlyModelViewSet):
+class AuthorProfileViewSet(OptimizedQuerysetMixin,
+                           viewsets.ReadOnlyModelViewSet):
     """
     Readonly Public API endpoint for getting Author's data.
     `Author Profile View`
+
+    Profiles come with the stats of the published posts of the author, the
+    retrieved profile also with the first page of these posts under `post`
+    (`{"next": <url of the author posts endpoint>, "data": [<posts>]}`).
     """
     serializer_class = PublicAuthorProfileSerializer
     queryset = get_user_model().objects.filter(is_active=True, is_staff=True)
     permission_classes = (AllowAny,)
 
+    def get_queryset(self):
+        return with_author_stats(
+            super(AuthorProfileViewSet, self).get_queryset()
+        )
 
-def paginated_response(request, queryset, serializer):
-    paginator = Paginator(queryset, 4)
-    page = request.GET.get('page') if request.GET.get('page') else 1
-    data = paginator.get_page(page)
+    def retrieve(self, request, *args, **kwargs):
+        author = self.get_object()
+        data = self.get_serializer(author).data
 
-    serializers = serializer(
-        data, context={"request": request}, many=True
-    )
+        paginator = PostKeysetPagination()
+        paginator.url = reverse(
+            'public_api:author-posts', kwargs={'pk': author.id}
+        )
+        queryset = optimize_queryset(
+            published_posts().filter(author=author),
+            PublicPostListModelSerializer,
+        )
+        page = paginator.paginate_queryset(queryset, request, view=self)
+        data['post'] = paginator.get_paginated_response(
+            PublicPostListModelSerializer(
+                page, many=True, context=self.get_serializer_context()
+            ).data
+        ).data
+        return Response(data)
 
-    return Response(
-        {
-            "data": serializers.data,
-            "pages": paginator.num_pages,
-            "current_page": data.number,
-        },
-        status=status.HTTP_200_OK,
-    )
+
+def paginated_response(view, queryset):
+    """ Page of posts serialized by the view, with a link to the next page """
+
+    page = view.paginate_queryset(queryset)
+    serializer = view.get_serializer(page, many=True)
+    return view.get_paginated_response(serializer.data)
 
 
 class PublicAuthorPostsAPIView(generics.ListAPIView):
     permission_classes = (AllowAny,)
     serializer_class = PublicPostListModelSerializer
+    pagination_class = PostKeysetPagination
 
     def get(self, *args, **kwargs):
-        author = User.objects.get(id=self.kwargs["pk"])
         queryset = Post.objects.filter(
-            status='Open',
-            is_approved=True,
-            author=author
+            is_live=True,
+            author_id=self.kwargs["pk"]
         )
+        queryset = optimize_queryset(queryset, self.serializer_class)
 
-        return paginated_response(
-            self.request, queryset, self.serializer_class
-        )
+        return paginated_response(self, queryset)
 
 
 class PublicUserSavedPostsAPIView(generics.ListAPIView):
     authentication_classes = (TokenAuthentication,)
     permission_classes = (IsAuthenticated,)
     serializer_class = PublicPostListModelSerializer
+    pagination_class = PostKeysetPagination
 
     def get(self, *args, **kwargs):
 
         queryset = self.request.user.saved_news.all()
-        try:
-            queryset = queryset.filter(
-                category__in=[self.request.query_params.get('category')]
-            )
-        except AttributeError:
-            pass
+        category = self.request.query_params.get('category')
+        if category and category.isdigit():
+            # including the subcategories
+            queryset = filter_by_category(queryset, int(category))
+        queryset = optimize_queryset(queryset, self.serializer_class)
+
+        return paginated_response(self, queryset)
+
 
-        return paginated_response(
-            self.request, queryset, self.serializer_class
+class PublicUserFeedAPIView(generics.GenericAPIView):
+    """
+    Latest posts of the preferred and favorite categories of the user
+    (and their subcategories), except the saved ones, merged from the
+    per-category recency lists of `news.feeds`. Paged like the post list,
+    the first page is cached per user.
+
+    Allowed requests:
+        `GET` => Any authenticated user
+    """
+    authentication_classes = (TokenAuthentication,)
+    permission_classes = (IsAuthenticated,)
+    serializer_class = PublicPostListModelSerializer
+    pagination_class = PostKeysetPagination
+    first_page_key = 'user-feed:{user}:{size}:{versions}'
+    first_page_timeout = 60 * 60
+
+    def get(self, request, *args, **kwargs):
+        cursor = self.paginator.decode_cursor(request)
+        size = self.paginator.get_page_size(request)
+        if cursor is not None:
+            return Response(self.get_page(size, cursor))
+
+        user = request.user
+        versions = get_cache_versions(
+            ['posts', 'categories', 'user:{}'.format(user.id)]
+        )
+        key = self.first_page_key.format(
+            user=user.id, size=size, versions='.'.join(map(str, versions)),
+        )
+        page = cache.get(key)
+        if page is None:
+            page = self.get_page(size)
+            cache.set(key, page, self.first_page_timeout)
+        return Response(page)
+
+    def get_page(self, size, cursor=None):
+        user = self.request.user
+        category_ids = set(
+            user.preferred_categories.values_list('id', flat=True)
+        ) | set(user.favorite_category.values_list('id', flat=True))
+        saved = set(user.saved_news.values_list('id', flat=True))
+
+        # one more entry tells whether there is a next page
+        entries = feed_page(category_ids, size + 1, cursor, saved)
+        has_next = len(entries) > size
+        entries = entries[:size]
+
+        queryset = optimize_queryset(
+            Post.objects.filter(id__in=[pk for _, pk in entries]),
+            self.serializer_class,
         )
+        posts = queryset.in_bulk()
+        serializer = self.get_serializer(
+            [posts[pk] for _, pk in entries if pk in posts], many=True
+        )
+
+        next_link = None
+        if has_next:
+            next_link = replace_query_param(
+                self.request.build_absolute_uri(),
+                self.paginator.cursor_query_param,
+                self.paginator.encode_cursor(*entries[-1]),
+            )
+        return OrderedDict([
+            ('next', next_link),
+            ('data', serializer.data),
+        ])
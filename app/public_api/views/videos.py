@@ -1,9 +1,12 @@
 from rest_framework import viewsets, permissions
+from core.utils.optimizer import OptimizedQuerysetMixin
+from ..utils.response_cache import CachedResponseMixin
 from ..serializers.videos import PublicVideoSerializer
 from videos.models import Video
 
 
-class PublicVideosViewSet(viewsets.ReadOnlyModelViewSet):
+class PublicVideosViewSet(CachedResponseMixin, OptimizedQuerysetMixin,
+                          viewsets.ReadOnlyModelViewSet):
     """
     Readonly Public API endpoint for Videos
 
@@ -11,3 +14,4 @@ class PublicVideosViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = Video.objects.all()
     serializer_class = PublicVideoSerializer
     permission_classes = (permissions.AllowAny,)
+    cache_groups = ('videos',)
@@ -1,14 +1,13 @@
 from django.db import models
 from django.utils import timezone
-from django.template.defaultfilters import slugify
 from django.utils.translation import ugettext_lazy as _
 
 from news.models import Post
 from .options.tools import STATUS_CHOICES, PENDING
-from news.options.tools import generate_unique_slug
+from news.options.tools import UniqueSlugMixin
 
 
-class Story(models.Model):
+class Story(UniqueSlugMixin, models.Model):
     status = models.CharField(
         _('Status'),
         max_length=100,
@@ -79,17 +78,12 @@ class Story(models.Model):
         get the related Post's `short description`, and save it
 
         If `Custom_slug` is True, slug can be customized, else get `Title` and
-        save to `Slug` field.
+        save to `Slug` field (see `UniqueSlugMixin`).
         """
         if not self.description and self.storycontent_set.all():
             obj = self.storycontent_set.get(story=self.pk)
             self.description = obj.post.short_description
 
-        if self.slug:  # edit
-            if slugify(self.title) != self.slug and not self.custom_slug:
-                self.slug = generate_unique_slug(Story, self.title)
-        elif not self.custom_slug:  # create
-            self.slug = generate_unique_slug(Story, self.title)
         super(Story, self).save(*args, **kwargs)
 
     class Meta:
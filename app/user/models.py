@@ -59,6 +59,12 @@ class MyUser(AbstractBaseUser, PermissionsMixin):
         blank=True,
         upload_to=user_directory_path,
     )
+    avatar_variants = models.JSONField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text=_('Resized copies, see `photos.derivatives`'),
+    )
     phone_number = models.CharField(
         _('Phone Number'),
         max_length=255,